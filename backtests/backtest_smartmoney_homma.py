@@ -12,90 +12,85 @@ from typing import List
 
 
 def run_backtest(signals: List[MTFSignal], df_ltf: pd.DataFrame, max_hold_bars: int = 120):
-    trades = []
-    
-    for sig in signals:
-        sig_idx = df_ltf[df_ltf['timestamp'] == sig.timestamp].index
-        if len(sig_idx) == 0:
-            continue
-        
-        sig_idx = sig_idx[0]
-        
-        future = df_ltf.iloc[sig_idx:sig_idx + max_hold_bars]
-        
-        if len(future) < 2:
-            continue
-        
-        entry = sig.entry_price
-        stop = sig.stop_loss
-        target = sig.target
-        
-        hit_target = False
-        hit_stop = False
-        exit_price = entry
-        exit_bar = len(future) - 1
-        
-        for i, row in enumerate(future.iterrows()):
-            idx, bar = row
-            
-            if sig.direction == 'long':
-                if bar['high'] >= target:
-                    hit_target = True
-                    exit_price = target
-                    exit_bar = i
-                    break
-                
-                if bar['low'] <= stop:
-                    hit_stop = True
-                    exit_price = stop
-                    exit_bar = i
-                    break
-            
-            else:
-                if bar['low'] <= target:
-                    hit_target = True
-                    exit_price = target
-                    exit_bar = i
-                    break
-                
-                if bar['high'] >= stop:
-                    hit_stop = True
-                    exit_price = stop
-                    exit_bar = i
-                    break
-        
-        if not hit_target and not hit_stop:
-            exit_price = future.iloc[-1]['close']
-        
-        if sig.direction == 'long':
-            pnl = exit_price - entry
-            risk = entry - stop
-        else:
-            pnl = entry - exit_price
-            risk = stop - entry
-        
-        r_multiple = pnl / risk if risk > 0 else 0
-        
-        trades.append({
-            'entry_time': sig.timestamp,
-            'direction': sig.direction,
-            'entry': entry,
-            'exit': exit_price,
-            'target': target,
-            'stop': stop,
-            'pnl': pnl,
-            'r': r_multiple,
-            'hit_target': hit_target,
-            'hit_stop': hit_stop,
-            'exit_bar': exit_bar,
-            'zone_pattern': sig.zone_pattern,
-            'homma_pattern': sig.homma_pattern,
-            'htf': sig.htf,
-            'ltf': sig.ltf,
-            'rr': sig.reward_risk
-        })
-    
-    return pd.DataFrame(trades)
+    """
+    Classify every signal's outcome over its forward window in one NumPy pass.
+    
+    Target is checked before stop within a bar; if neither is hit the trade
+    exits at the close of the last bar in the window.
+    """
+    if not signals or len(df_ltf) == 0:
+        return pd.DataFrame()
+    
+    n = len(df_ltf)
+    high = df_ltf['high'].to_numpy(dtype=float)
+    low = df_ltf['low'].to_numpy(dtype=float)
+    close = df_ltf['close'].to_numpy(dtype=float)
+    bar_times = df_ltf['timestamp'].to_numpy(dtype='datetime64[ns]')
+    
+    # Locate signal bars by timestamp (bars are sorted)
+    sig_times = pd.DatetimeIndex([sig.timestamp for sig in signals]).to_numpy(dtype='datetime64[ns]')
+    pos = np.searchsorted(bar_times, sig_times)
+    found = pos < n
+    found[found] = bar_times[pos[found]] == sig_times[found]
+    
+    window_len = np.minimum(max_hold_bars, n - pos)
+    keep = np.flatnonzero(found & (window_len >= 2))
+    if len(keep) == 0:
+        return pd.DataFrame()
+    
+    kept = [signals[i] for i in keep]
+    pos = pos[keep]
+    window_len = window_len[keep]
+    is_long = np.array([sig.direction == 'long' for sig in kept])
+    entry = np.array([sig.entry_price for sig in kept], dtype=float)
+    stop = np.array([sig.stop_loss for sig in kept], dtype=float)
+    target = np.array([sig.target for sig in kept], dtype=float)
+    
+    # (signals, max_hold_bars) forward windows; NaN padding past the last bar never hits
+    pad = np.full(max_hold_bars - 1, np.nan)
+    high_win = np.lib.stride_tricks.sliding_window_view(np.concatenate([high, pad]), max_hold_bars)[pos]
+    low_win = np.lib.stride_tricks.sliding_window_view(np.concatenate([low, pad]), max_hold_bars)[pos]
+    
+    target_mask = np.where(is_long[:, None], high_win >= target[:, None], low_win <= target[:, None])
+    stop_mask = np.where(is_long[:, None], low_win <= stop[:, None], high_win >= stop[:, None])
+    
+    # First hit bar per signal (max_hold_bars = never)
+    first_target = np.where(target_mask.any(axis=1), target_mask.argmax(axis=1), max_hold_bars)
+    first_stop = np.where(stop_mask.any(axis=1), stop_mask.argmax(axis=1), max_hold_bars)
+    
+    hit_target = (first_target < max_hold_bars) & (first_target <= first_stop)
+    hit_stop = (first_stop < max_hold_bars) & ~hit_target
+    
+    exit_bar = np.where(hit_target, first_target, np.where(hit_stop, first_stop, window_len - 1))
+    exit_price = np.where(
+        hit_target, target,
+        np.where(hit_stop, stop, close[pos + window_len - 1])
+    )
+    
+    direction_sign = np.where(is_long, 1.0, -1.0)
+    pnl = (exit_price - entry) * direction_sign
+    risk = (entry - stop) * direction_sign
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_multiple = np.where(risk > 0, pnl / risk, 0.0)
+    
+    return pd.DataFrame({
+        'entry_time': [sig.timestamp for sig in kept],
+        'direction': [sig.direction for sig in kept],
+        'entry': entry,
+        'exit': exit_price,
+        'target': target,
+        'stop': stop,
+        'pnl': pnl,
+        'r': r_multiple,
+        'hit_target': hit_target,
+        'hit_stop': hit_stop,
+        'exit_bar': exit_bar,
+        'zone_pattern': [sig.zone_pattern for sig in kept],
+        'homma_pattern': [sig.homma_pattern for sig in kept],
+        'htf': [sig.htf for sig in kept],
+        'ltf': [sig.ltf for sig in kept],
+        'rr': [sig.reward_risk for sig in kept]
+    })
 
 
 def calculate_metrics(df_trades: pd.DataFrame):
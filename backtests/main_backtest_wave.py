@@ -9,16 +9,18 @@ Implements successful backtest config:
 - Quality filters (no artificial cooldowns)
 """
 
+import numpy as np
 import pandas as pd
 from engine.data_provider import CSVDataProvider
 from engine.sessions_liquidity import label_sessions, add_session_highs_lows
 from engine.renko import build_renko, get_renko_direction_series
-from engine.regimes import detect_regime
+from engine.regimes import detect_regime, align_regime_to_bars
 from engine.strategy_wave_renko import generate_wave_signals, WaveSignal
 from engine.strategy import Signal  # For backtest compatibility
 from engine.backtest import Backtest
 from engine.timeframes import resample_to_timeframe
 from engine.ict_structures import detect_all_structures
+from engine.frame_cache import cached
 
 print("="*70)
 print("MaxTrader Wave System: Renko + Multi-TF Confluence + 0DTE")
@@ -26,33 +28,42 @@ print("="*70)
 
 # Step 1: Load 1-minute data
 print("\nStep 1: Loading QQQ 1-minute data...")
-provider = CSVDataProvider('data/QQQ_1m_real.csv')
+DATA_PATH = 'data/QQQ_1m_real.csv'
+provider = CSVDataProvider(DATA_PATH, cache_dir='cache')
 df_1min = provider.load_bars()
 print(f"  ✓ Loaded {len(df_1min)} bars")
 print(f"  ✓ Date range: {df_1min['timestamp'].min()} to {df_1min['timestamp'].max()}")
 
 # Step 2: Resample to 4H and Daily
 print("\nStep 2: Creating multi-timeframe data...")
-df_4h = resample_to_timeframe(df_1min, '4h')
-df_daily = resample_to_timeframe(df_1min, '1D')
+# Intermediates are cached on disk keyed by the CSV's mtime, step params and
+# the source of every module in the pipeline, so editing any of them rebuilds
+PIPELINE_CODE = (CSVDataProvider, resample_to_timeframe, label_sessions,
+                 detect_all_structures, build_renko, detect_regime)
+df_4h = cached('df_4h', ('4h',), lambda: resample_to_timeframe(df_1min, '4h'), DATA_PATH, code=PIPELINE_CODE)
+df_daily = cached('df_daily', ('1D',), lambda: resample_to_timeframe(df_1min, '1D'), DATA_PATH, code=PIPELINE_CODE)
 print(f"  ✓ 4H bars: {len(df_4h)}")
 print(f"  ✓ Daily bars: {len(df_daily)}")
 
 # Step 3: Label sessions and add session high/low levels
 print("\nStep 3: Labeling sessions and computing session levels...")
-df_1min = label_sessions(df_1min)
-df_1min = add_session_highs_lows(df_1min)
+df_raw = df_1min
+df_1min = cached('df_1min_sessions', ('sessions',),
+                 lambda: add_session_highs_lows(label_sessions(df_raw)), DATA_PATH, code=PIPELINE_CODE)
 print(f"  ✓ Sessions labeled and high/low levels computed")
 
 # Step 3.5: Detect ICT structures
 print("\nStep 3.5: Detecting ICT structures...")
-df_1min = detect_all_structures(df_1min, displacement_threshold=1.0)
+df_sessions = df_1min
+df_1min = cached('df_1min_structures', ('sessions', 'structures', 1.0),
+                 lambda: detect_all_structures(df_sessions, displacement_threshold=1.0), DATA_PATH, code=PIPELINE_CODE)
 print(f"  ✓ ICT structures detected (sweeps, displacement, FVG, MSS, OB)")
 
 # Step 4: Build Renko chart (k=4.0 per tuning)
 print("\nStep 4: Building Renko chart...")
 k_value = 4.0  # ATR multiplier
-renko_df = build_renko(df_1min, mode="atr", k=k_value, atr_period=14)
+renko_df = cached('renko_df', ('atr', k_value, 14),
+                  lambda: build_renko(df_1min, mode="atr", k=k_value, atr_period=14), DATA_PATH, code=PIPELINE_CODE)
 brick_size = renko_df['brick_size'].iloc[0]
 print(f"  ✓ Built {len(renko_df)} Renko bricks")
 print(f"  ✓ Brick size: ${brick_size:.2f} (k={k_value})")
@@ -60,20 +71,15 @@ print(f"  ✓ Compression: {len(df_1min)/len(renko_df):.1f}x")
 
 # Step 5: Detect regime (30-min for context)
 print("\nStep 5: Detecting 30-min regime...")
-df_30min = resample_to_timeframe(df_1min, '30min')
-renko_30min = build_renko(df_30min, mode="atr", k=1.0)
+df_30min = cached('df_30min', ('30min',), lambda: resample_to_timeframe(df_1min, '30min'), DATA_PATH, code=PIPELINE_CODE)
+renko_30min = cached('renko_30min', ('30min', 'atr', 1.0),
+                     lambda: build_renko(df_30min, mode="atr", k=1.0), DATA_PATH, code=PIPELINE_CODE)
 renko_direction_30min = get_renko_direction_series(df_30min, renko_30min)
-regime_30min = detect_regime(df_30min, renko_direction_30min, lookback=20)
+regime_30min = cached('regime_30min', ('30min', 'atr', 1.0, 20),
+                      lambda: detect_regime(df_30min, renko_direction_30min, lookback=20), DATA_PATH, code=PIPELINE_CODE)
 
 # Align regime to 1-min data
-df_1min['regime'] = 'sideways'
-for idx in range(len(df_1min)):
-    ts = df_1min['timestamp'].iloc[idx]
-    mask = df_30min['timestamp'] <= ts
-    if mask.any():
-        regime_idx = mask.sum() - 1
-        if regime_idx < len(regime_30min):
-            df_1min.loc[df_1min.index[idx], 'regime'] = regime_30min.iloc[regime_idx]
+df_1min['regime'] = align_regime_to_bars(df_1min, df_30min, regime_30min)
 
 regime_counts = df_1min['regime'].value_counts()
 print(f"  ✓ Regime distribution:")
@@ -159,14 +165,14 @@ for rtype, count in retrace_breakdown.items():
     print(f"    - {rtype}: {count}")
 
 # Confidence stats
-wave_confidences = [ws.meta.get('wave_confidence', 0) for ws in wave_signals]
-ict_scores = [ws.meta.get('ict_confluence_score', 0) for ws in wave_signals]
-final_confidences = [ws.meta['confidence'] for ws in wave_signals]
+wave_confidences = np.array([ws.meta.get('wave_confidence', 0) for ws in wave_signals], dtype=float)
+ict_scores = np.array([ws.meta.get('ict_confluence_score', 0) for ws in wave_signals], dtype=float)
+final_confidences = np.array([ws.meta['confidence'] for ws in wave_signals], dtype=float)
 
-if final_confidences:
-    print(f"  Wave confidence: {min(wave_confidences):.2f} - {max(wave_confidences):.2f} (mean: {sum(wave_confidences)/len(wave_confidences):.2f})")
-    print(f"  ICT confluence: {min(ict_scores):.2f} - {max(ict_scores):.2f} (mean: {sum(ict_scores)/len(ict_scores):.2f})")
-    print(f"  Final confidence: {min(final_confidences):.2f} - {max(final_confidences):.2f} (mean: {sum(final_confidences)/len(final_confidences):.2f})")
+if final_confidences.size:
+    print(f"  Wave confidence: {wave_confidences.min():.2f} - {wave_confidences.max():.2f} (mean: {wave_confidences.mean():.2f})")
+    print(f"  ICT confluence: {ict_scores.min():.2f} - {ict_scores.max():.2f} (mean: {ict_scores.mean():.2f})")
+    print(f"  Final confidence: {final_confidences.min():.2f} - {final_confidences.max():.2f} (mean: {final_confidences.mean():.2f})")
 
 # ICT structure breakdown
 if wave_signals:
@@ -204,11 +210,12 @@ if results['total_trades'] > 0:
     print(f"  (Let by market quality, not artificial limits)")
     
     # Calculate profit factor
-    wins = [t.pnl for t in results['trades'] if t.pnl > 0]
-    losses = [abs(t.pnl) for t in results['trades'] if t.pnl < 0]
+    trade_pnls = np.array([t.pnl for t in results['trades']], dtype=float)
+    gross_win = trade_pnls[trade_pnls > 0].sum()
+    gross_loss = -trade_pnls[trade_pnls < 0].sum()
     
-    if losses:
-        profit_factor = sum(wins) / sum(losses) if sum(losses) > 0 else float('inf')
+    if (trade_pnls < 0).any():
+        profit_factor = gross_win / gross_loss if gross_loss > 0 else float('inf')
         print(f"Profit Factor:       {profit_factor:.2f}")
     
     print("\nSample Trades:")
@@ -234,8 +241,9 @@ import matplotlib
 matplotlib.use('Agg')
 
 if results['total_trades'] > 0:
-    pnls = [t.pnl for t in results['trades']]
-    cumulative = [sum(pnls[:i+1]) for i in range(len(pnls))]
+    trades = results['trades']
+    pnls = np.fromiter((t.pnl for t in trades), dtype=float, count=len(trades))
+    cumulative = np.cumsum(pnls)
     
     plt.figure(figsize=(12, 6))
     plt.plot(cumulative, marker='o', linewidth=2, markersize=4)
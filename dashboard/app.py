@@ -1,38 +1,195 @@
 import os
+
+# Optional cooperative server: DASHBOARD_ASYNC_MODE=eventlet|gevent
+# (must patch the stdlib before anything else is imported)
+ASYNC_MODE = os.getenv('DASHBOARD_ASYNC_MODE') or None
+if ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+elif ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
 import sys
-from flask import Flask, render_template, jsonify
+import atexit
+from flask import Flask, Response, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_socketio import SocketIO, emit
 from datetime import datetime
+from collections import deque
+from itertools import islice
 import threading
 import time
 import json
-import random
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dashboard.notifier import notifier
 
+logger = logging.getLogger('dashboard')
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SESSION_SECRET', 'dev-secret-key-change-in-production')
-socketio = SocketIO(app, cors_allowed_origins="*")
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def start_log_listener(level: int = logging.INFO) -> QueueListener:
+    """
+    Route dashboard logging through a queue drained by a background thread.
+    
+    Callers (the update loop, socket handlers, the notifier) only enqueue
+    records; the listener thread does the blocking write to stderr.
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson."""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+
+class SocketJSON:
+    """
+    JSON module for Socket.IO packets.
+    
+    Broadcast packets are encoded once for all clients; this makes that single
+    encode go through orjson too (the background loop has no app context, so
+    Flask's provider is not used there).
+    """
+    
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return _dumps(obj).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return _loads(s)
+
+
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, json=SocketJSON)
+
+
+TRADER_STATE_FILE = '/tmp/trader_state.json'
+UPDATE_INTERVAL_SECONDS = 5.0
+DRAWDOWN_WINDOW = int(60 // UPDATE_INTERVAL_SECONDS) + 1  # Cycles between drawdown checks (> 60 s apart)
+KILL_SWITCH_LOCK_FILE = '/tmp/maxtrader_kill_switch.lock'
+
+# Set by the file watcher when the trader state file is written
+trader_state_changed = threading.Event()
+trader_state_changed.set()
+_trader_state_watched = False
+
+
+class TraderStateFileHandler(FileSystemEventHandler):
+    """Flags writes to the trader state file (incl. atomic rename-over)."""
+    
+    def on_any_event(self, event):
+        paths = (event.src_path, getattr(event, 'dest_path', ''))
+        if TRADER_STATE_FILE in paths:
+            trader_state_changed.set()
+
+
+def start_trader_state_watcher() -> bool:
+    """
+    Watch the trader state file so the update loop only re-reads it on change.
+    
+    Returns:
+        True if the watcher is running (watchdog installed), False otherwise
+    """
+    global _trader_state_watched
+    if Observer is None:
+        return False
+    
+    observer = Observer()
+    observer.schedule(TraderStateFileHandler(), os.path.dirname(TRADER_STATE_FILE), recursive=False)
+    observer.daemon = True
+    observer.start()
+    _trader_state_watched = True
+    return True
+
+
+_trader_state_cache = (None, None)  # (file signature, parsed state)
 
 
 def load_trader_state():
-    """Load current trader state from file."""
+    """Load current trader state from file (re-parsed only when it changes)."""
+    global _trader_state_cache
+    try:
+        st = os.stat(TRADER_STATE_FILE)
+    except OSError:
+        return None
+    
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    if _trader_state_cache[0] == signature:
+        return _trader_state_cache[1]
+    
     try:
-        import json
-        state_file = '/tmp/trader_state.json'
-        if os.path.exists(state_file):
-            with open(state_file, 'r') as f:
-                return json.load(f)
+        with open(TRADER_STATE_FILE, 'rb') as f:
+            trader_state = _loads(f.read())
     except:
-        pass
-    return None
+        return None
+    _trader_state_cache = (signature, trader_state)
+    return trader_state
 
 
 class DashboardState:
     """Centralized state management for the dashboard."""
     
+    # Fixed attribute set: no per-instance __dict__, faster attribute access
+    __slots__ = (
+        'account_balance', 'daily_pnl', 'total_pnl',
+        'conservative', 'aggressive',
+        'open_positions', 'trade_history',
+        'current_regime', 'vix_level', 'market_open',
+        'circuit_breakers', 'safety_status', 'system_health', 'performance_metrics',
+        '_last_emitted', '_version', '_api_cache', '_initial_cache'
+    )
+    
     def __init__(self):
         self.account_balance = 25000.00  # Paper trading starting balance
         self.daily_pnl = 0.0
@@ -59,7 +216,7 @@ class DashboardState:
         }
         
         self.open_positions = []
-        self.trade_history = []
+        self.trade_history = deque(maxlen=1000)  # Bounded history; last 20 are shown
         self.current_regime = "NORMAL_VOL"
         self.vix_level = 18.5
         self.market_open = False
@@ -94,9 +251,30 @@ class DashboardState:
             "max_drawdown": 0.0
         }
         
+        # Serialized fields of each tick section as last broadcast
+        self._last_emitted = {}
+        
+        # Bumped whenever state changes; keys the serialized /api/state body
+        self._version = 0
+        self._api_cache = (None, b'')
+        self._initial_cache = (None, b'')
+            
+    def recent_trades(self, n: int = 20) -> list:
+        """Return the last n trades without copying the whole history."""
+        # Walk from the right end so the cost is O(n), not O(len(history))
+        return list(islice(reversed(self.trade_history), n))[::-1]
+    
+    def cache_key(self) -> tuple:
+        """Key for serialized snapshots: state version, trader file, health."""
+        return (self._version, _trader_state_cache[0], self.system_health['status'])
+
 
 state = DashboardState()
 
+# Open Socket.IO connections; ticks skip building payloads while it is zero
+_connected_clients = 0
+_clients_lock = threading.Lock()
+
 
 @app.route('/')
 def index():
@@ -126,7 +304,6 @@ def get_state():
         # Check if auto-trader is actually running
         last_updated = trader_state.get('last_updated')
         if last_updated:
-            from datetime import datetime
             last_time = datetime.fromisoformat(last_updated)
             seconds_since = (datetime.now() - last_time).total_seconds()
             
@@ -143,7 +320,12 @@ def get_state():
     # Determine if we're showing real or simulated data
     data_mode = 'LIVE' if trader_state else 'NO_DATA'
     
-    return jsonify({
+    # Reuse the serialized body until the state, trader file or health changes
+    cache_key = state.cache_key()
+    if state._api_cache[0] == cache_key:
+        return Response(state._api_cache[1], mimetype='application/json')
+    
+    body = _dumps({
         'account_balance': state.account_balance,
         'daily_pnl': state.daily_pnl,
         'total_pnl': state.total_pnl,
@@ -151,7 +333,7 @@ def get_state():
         'conservative': state.conservative,
         'aggressive': state.aggressive,
         'open_positions': state.open_positions,
-        'trade_history': state.trade_history[-20:],
+        'trade_history': state.recent_trades(),
         'current_regime': state.current_regime,
         'vix_level': state.vix_level,
         'circuit_breakers': state.circuit_breakers,
@@ -160,13 +342,25 @@ def get_state():
         'system_health': state.system_health,
         'performance_metrics': state.performance_metrics
     })
+    state._api_cache = (cache_key, body)
+    return Response(body, mimetype='application/json')
 
 
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection."""
-    print(f"Client connected: {datetime.now()}")
-    emit('initial_state', {
+    global _connected_clients
+    with _clients_lock:
+        _connected_clients += 1
+    logger.info("Client connected")
+    
+    # Serialize once per state change; sent as a binary frame the client decodes
+    cache_key = state.cache_key()
+    if state._initial_cache[0] == cache_key:
+        emit('initial_state', state._initial_cache[1])
+        return
+    
+    body = _dumps({
         'account_balance': state.account_balance,
         'daily_pnl': state.daily_pnl,
         'total_pnl': state.total_pnl,
@@ -175,16 +369,21 @@ def handle_connect():
         'safety_status': state.safety_status,
         'circuit_breakers': state.circuit_breakers,
         'performance_metrics': state.performance_metrics,
-        'trade_history': state.trade_history[-20:],
+        'trade_history': state.recent_trades(),
         'open_positions': state.open_positions,
         'system_health': state.system_health
     })
+    state._initial_cache = (cache_key, body)
+    emit('initial_state', body)
 
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection."""
-    print(f"Client disconnected: {datetime.now()}")
+    global _connected_clients
+    with _clients_lock:
+        _connected_clients = max(0, _connected_clients - 1)
+    logger.info("Client disconnected")
 
 
 @socketio.on('test_notification')
@@ -194,19 +393,33 @@ def handle_test_notification(data):
     success = notifier.send_notification(
         message=message,
         title="🧪 Test Notification",
-        priority=0
+        priority=0,
+        wait=True  # Report the actual delivery result to the UI
     )
     emit('notification_result', {'success': success})
 
 
+def write_kill_switch_lock(content: str):
+    """Write the kill switch lock atomically: one unbuffered write, then rename."""
+    tmp_path = KILL_SWITCH_LOCK_FILE + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, KILL_SWITCH_LOCK_FILE)
+
+
 @socketio.on('kill_switch')
 def handle_kill_switch():
     """Handle kill switch activation - PERMANENT until manual reset."""
     state.safety_status['kill_switch'] = True
-    print(f"🛑 KILL SWITCH ACTIVATED at {datetime.now()}")
+    state._version += 1
+    now = datetime.now()
+    now_iso = now.isoformat()
+    logger.warning("🛑 KILL SWITCH ACTIVATED at %s", now)
     
-    with open('/tmp/maxtrader_kill_switch.lock', 'w') as f:
-        f.write(f"ACTIVATED at {datetime.now().isoformat()}")
+    write_kill_switch_lock(f"ACTIVATED at {now_iso}")
     
     notifier.send_notification(
         message="Kill switch activated! All trading has been halted immediately. Manual reset required.",
@@ -216,7 +429,7 @@ def handle_kill_switch():
     )
     
     broadcast_update('kill_switch_activated', {
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso
     })
     
     emit('kill_switch_result', {'success': True})
@@ -235,14 +448,15 @@ def handle_reset_kill_switch(data):
         return
     
     state.safety_status['kill_switch'] = False
+    state._version += 1
     
-    import os
     try:
-        os.remove('/tmp/maxtrader_kill_switch.lock')
+        os.remove(KILL_SWITCH_LOCK_FILE)
     except FileNotFoundError:
         pass
     
-    print(f"✅ Kill switch RESET at {datetime.now()}")
+    now = datetime.now()
+    logger.info("✅ Kill switch RESET at %s", now)
     
     notifier.send_notification(
         message="Kill switch has been manually reset. Trading can resume.",
@@ -251,7 +465,7 @@ def handle_reset_kill_switch(data):
     )
     
     broadcast_update('kill_switch_reset', {
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now.isoformat()
     })
     
     emit('reset_result', {
@@ -262,24 +476,88 @@ def handle_reset_kill_switch(data):
 
 def broadcast_update(event_type: str, data: dict):
     """Broadcast real-time updates to all connected clients."""
+    if not _connected_clients:
+        return
     socketio.emit(event_type, data)
 
 
+def build_tick_payload() -> dict:
+    """Collect every dashboard section sent on a periodic tick."""
+    payload = {
+        # Rounded to cents so float jitter doesn't defeat change detection
+        'pnl': {
+            'daily_pnl': round(state.daily_pnl, 2),
+            'total_pnl': round(state.total_pnl, 2),
+            'account_balance': round(state.account_balance, 2)
+        },
+        'regime': {
+            'current_regime': state.current_regime,
+            'vix_level': state.vix_level
+        },
+        'safety': state.safety_status,
+        'breakers': state.circuit_breakers,
+        'performance': state.performance_metrics,
+        'system_health': state.system_health,
+        'positions': {'positions': state.open_positions}
+    }
+    if len(state.trade_history) > 0:
+        payload['trade_history'] = {'trades': state.recent_trades()}
+    return payload
+
+
+def diff_tick_payload(payload: dict, last_emitted: dict) -> dict:
+    """Reduce each section to the fields changed since the last broadcast tick."""
+    changed = {}
+    for section, data in payload.items():
+        last = last_emitted.setdefault(section, {})
+        delta = {}
+        for field, value in data.items():
+            # Compare serialized values: nested dicts are mutated in place
+            encoded = _dumps(value)
+            if last.get(field) != encoded:
+                last[field] = encoded
+                delta[field] = value
+        if delta:
+            changed[section] = delta
+    return changed
+
+
 def simulate_market_updates():
     """
     Background thread to update dashboard from live trader state.
     """
     cycle_count = 0
     peak_balance = 25000.00
-    last_loss_notification = 0
-    last_circuit_check = time.time()
+    balance_window = deque(maxlen=DRAWDOWN_WINDOW)  # Balances since the last drawdown check
+    # Monotonic clock: interval guards must not jump with wall-clock changes
+    last_loss_notification = float('-inf')
+    last_circuit_check = time.monotonic()
+    started = time.monotonic()
+    next_tick = started + UPDATE_INTERVAL_SECONDS
+    last_trader_state = None  # Last state object the derived stats were built from
     
     while True:
-        time.sleep(5)
+        # Deadline scheduling keeps ticks on a fixed grid regardless of loop work
+        delay = next_tick - time.monotonic()
+        if delay > 0:
+            socketio.sleep(delay)  # Yields to the event loop under eventlet/gevent
+        now = time.monotonic()
+        next_tick += UPDATE_INTERVAL_SECONDS
+        if next_tick <= now:
+            # Fell behind: skip the missed ticks instead of running a burst
+            next_tick += ((now - next_tick) // UPDATE_INTERVAL_SECONDS + 1) * UPDATE_INTERVAL_SECONDS
+        now_iso = datetime.now().isoformat()  # One timestamp per cycle
         
-        # Load live trader state
-        trader_state = load_trader_state()
-        if trader_state:
+        # Load live trader state (only on change when the file watcher is running)
+        if not _trader_state_watched or trader_state_changed.is_set():
+            trader_state_changed.clear()
+            trader_state = load_trader_state()
+        else:
+            trader_state = None  # Unchanged: stats from the last read still apply
+        # load_trader_state returns the same cached object while the file is
+        # unchanged, so identity means the derived stats are still current
+        if trader_state and trader_state is not last_trader_state:
+            last_trader_state = trader_state
             stats = trader_state.get('stats', {})
             
             # Update conservative stats
@@ -303,17 +581,21 @@ def simulate_market_updates():
             
             # Count active positions
             positions = trader_state.get('positions', {})
-            state.conservative['active_positions'] = len([p for p in positions.get('conservative', []) if p.get('status') == 'open'])
-            state.aggressive['active_positions'] = len([p for p in positions.get('aggressive', []) if p.get('status') == 'open'])
+            state.open_positions = positions.get('conservative', []) + positions.get('aggressive', [])
+            state.conservative['active_positions'] = sum(1 for p in positions.get('conservative', ()) if p.get('status') == 'open')
+            state.aggressive['active_positions'] = sum(1 for p in positions.get('aggressive', ()) if p.get('status') == 'open')
         
         if state.safety_status['kill_switch']:
-            print(f"⚠️  Kill switch active - trading halted")
-            broadcast_update('system_health_update', {
-                'status': 'KILL_SWITCH',
-                'last_heartbeat': datetime.now().isoformat(),
-                'uptime_seconds': state.system_health['uptime_seconds'],
-                'error_count': 0
-            })
+            logger.warning("⚠️  Kill switch active - trading halted")
+            state._version += 1
+            if _connected_clients:
+                broadcast_update('state_tick', {'system_health': {
+                    'status': 'KILL_SWITCH',
+                    'last_heartbeat': now_iso,
+                    'uptime_seconds': state.system_health['uptime_seconds'],
+                    'error_count': 0
+                }})
+            state._last_emitted.pop('system_health', None)
             continue
         
         cycle_count += 1
@@ -322,14 +604,14 @@ def simulate_market_updates():
         state.account_balance = 25000 + state.total_pnl  # Paper trading starts at $25k
         state.daily_pnl = state.total_pnl  # For now, treat all P&L as daily
         
-        peak_balance = max(peak_balance, state.account_balance)
+        balance_window.append(state.account_balance)
         
         # VIX would come from real data in production
         state.vix_level = 15.0  # Default placeholder
         state.current_regime = "NORMAL_VOL"
         
-        state.system_health['uptime_seconds'] += 5
-        state.system_health['last_heartbeat'] = datetime.now().isoformat()
+        state.system_health['uptime_seconds'] = int(now - started)
+        state.system_health['last_heartbeat'] = now_iso
         
         # Update safety status based on REAL P&L
         if state.total_pnl < 0:
@@ -344,15 +626,16 @@ def simulate_market_updates():
         )
         
         loss_percent = (state.safety_status['current_loss'] / state.safety_status['daily_loss_limit']) * 100
-        if loss_percent >= 100 and (time.time() - last_loss_notification) > 300:
+        if loss_percent >= 100 and (now - last_loss_notification) > 300:
             notifier.send_loss_limit_alert(
                 current_loss=state.safety_status['current_loss'],
                 limit=state.safety_status['daily_loss_limit']
             )
-            last_loss_notification = time.time()
+            last_loss_notification = now
             state.safety_status['kill_switch'] = True
         
-        if time.time() - last_circuit_check > 60:
+        if now - last_circuit_check > 60:
+            peak_balance = max(peak_balance, max(balance_window))
             drawdown_pct = ((peak_balance - state.account_balance) / peak_balance) * 100
             if drawdown_pct >= 5:
                 if not state.circuit_breakers['drawdown']['triggered']:
@@ -361,51 +644,46 @@ def simulate_market_updates():
                         breaker_name="Drawdown Circuit Breaker",
                         reason=f"Drawdown reached {drawdown_pct:.1f}% from peak"
                     )
-            last_circuit_check = time.time()
+            last_circuit_check = now
         
         # SIMULATION DISABLED - Only show real trades from auto-trader
         # Fake trade generation has been removed to prevent confusion
         # Dashboard now only displays actual trades from /tmp/trader_state.json
         
-        broadcast_update('pnl_update', {
-            'daily_pnl': state.daily_pnl,
-            'total_pnl': state.total_pnl,
-            'account_balance': state.account_balance
-        })
-        
-        broadcast_update('regime_update', {
-            'current_regime': state.current_regime,
-            'vix_level': state.vix_level
-        })
-        
-        broadcast_update('safety_update', state.safety_status)
-        
-        broadcast_update('breaker_update', state.circuit_breakers)
+        # Bumped only once the cycle's changes are in, so a snapshot serialized
+        # mid-cycle is never cached under this version
+        state._version += 1
         
-        broadcast_update('performance_update', state.performance_metrics)
-        
-        broadcast_update('system_health_update', state.system_health)
-        
-        if len(state.trade_history) > 0:
-            broadcast_update('trade_history_update', {
-                'trades': state.trade_history[-20:]
-            })
+        # One coalesced emit per cycle carrying only the fields that changed;
+        # nobody watching means nothing to build (new clients get initial_state)
+        if not _connected_clients:
+            continue
+        changed = diff_tick_payload(build_tick_payload(), state._last_emitted)
+        if changed:
+            broadcast_update('state_tick', changed)
 
 
 if __name__ == '__main__':
-    import os
-    if os.path.exists('/tmp/maxtrader_kill_switch.lock'):
+    log_listener = start_log_listener()
+    atexit.register(log_listener.stop)
+    
+    if os.path.exists(KILL_SWITCH_LOCK_FILE):
         state.safety_status['kill_switch'] = True
         print("\n⚠️  KILL SWITCH LOCK FILE DETECTED")
         print("⚠️  Trading will remain HALTED until manual reset")
         print("⚠️  Use reset code: RESET2025\n")
     
-    threading.Thread(target=simulate_market_updates, daemon=True).start()
+    state_watcher = start_trader_state_watcher()
+    
+    # Runs as a greenlet under eventlet/gevent, a daemon thread otherwise
+    socketio.start_background_task(simulate_market_updates)
     
     print("\n" + "="*60)
     print("🚀 MaxTrader Professional Dashboard Starting...")
     print("="*60)
     print(f"📊 Dashboard URL: http://0.0.0.0:5000")
+    print(f"⚙️  Async mode: {socketio.async_mode}")
+    print(f"👀 State File Watcher: {'ENABLED' if state_watcher else 'DISABLED (polling)'}")
     print(f"🔔 Pushover Notifications: {'ENABLED' if notifier.enabled else 'DISABLED'}")
     print(f"🛑 Kill Switch: {'ACTIVE (TRADING HALTED)' if state.safety_status['kill_switch'] else 'Ready'}")
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
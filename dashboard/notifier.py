@@ -1,8 +1,59 @@
 import os
+import atexit
+import queue
+import threading
+import time
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Optional, Tuple
 from datetime import datetime
 
+COALESCE_WINDOW_S = 0.2   # Alerts queued this close together go out as one push
+MAX_MESSAGE_LEN = 1024    # Pushover message size limit
+
+
+def _coalesce(batch: List[Tuple[str, str, int, Optional[str]]]) -> List[Tuple[str, str, int, Optional[str]]]:
+    """
+    Merge queued notifications into as few pushes as fit Pushover's size limit.
+    
+    High-priority alerts (priority >= 1) always go out on their own so their
+    title and sound reach the lock screen; only priority <= 0 alerts are merged.
+    
+    Args:
+        batch: (message, title, priority, sound) tuples in queue order
+        
+    Returns:
+        Merged tuples in queue order; a group of one is passed through unchanged
+    """
+    groups, current, size = [], [], 0
+    for item in batch:
+        if item[2] >= 1:
+            if current:
+                groups.append(current)
+                current, size = [], 0
+            groups.append([item])
+            continue
+        part = f"{item[1]}\n{item[0]}"
+        added = len(part) + (5 if current else 0)  # '\n---\n' separator
+        if current and size + added > MAX_MESSAGE_LEN:
+            groups.append(current)
+            current, size = [], 0
+            added = len(part)
+        current.append(item)
+        size += added
+    if current:
+        groups.append(current)
+    
+    merged = []
+    for group in groups:
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        urgent = max(group, key=lambda item: item[2])
+        message = "\n---\n".join(f"{title}\n{message}" for message, title, _, _ in group)
+        merged.append((message, f"{len(group)} MaxTrader alerts", urgent[2], urgent[3]))
+    return merged
+
 
 class PushoverNotifier:
     """
@@ -14,30 +65,125 @@ class PushoverNotifier:
         self.api_token = os.getenv('PUSHOVER_API_TOKEN')
         self.enabled = bool(self.user_key and self.api_token)
         self.api_url = "https://api.pushover.net/1/messages.json"
+        # Alerts below this Pushover priority are dropped (default: keep everything)
+        self.min_priority = int(os.getenv('PUSHOVER_MIN_PRIORITY', '-2'))
+        
+        # Pooled keep-alive connection: TLS handshake once, not per alert
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
+        # Sends happen on a background worker so callers never wait on HTTP
+        self._queue = queue.Queue(maxsize=256)
+        self._worker = None
+        self._worker_lock = threading.Lock()
         
     def send_notification(
         self,
         message: str,
         title: str = "MaxTrader Alert",
         priority: int = 0,
-        sound: Optional[str] = None
+        sound: Optional[str] = None,
+        wait: bool = False
     ) -> bool:
         """
         Send a push notification via Pushover.
         
+        Notifications are queued for a background worker unless wait=True.
+        
         Args:
             message: Notification message body
             title: Notification title
             priority: -2 (silent), -1 (quiet), 0 (normal), 1 (high), 2 (emergency)
             sound: Optional sound name (pushover, bike, bugle, etc.)
+            wait: Send on the calling thread and report the delivery result
             
         Returns:
-            True if notification sent successfully, False otherwise
+            True if notification was queued (or sent, with wait=True), False otherwise
         """
+        if not self.would_send(priority):
+            return False
+        
         if not self.enabled:
             print(f"[PUSHOVER DISABLED] {title}: {message}")
             return False
+        
+        if wait:
+            return self._post(message, title, priority, sound)
+        
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((message, title, priority, sound))
+        except queue.Full:
+            print(f"[PUSHOVER DROPPED] Queue full - {title}: {message}")
+            return False
+        return True
+    
+    def would_send(self, priority: int) -> bool:
+        """
+        Whether an alert at this priority would be kept, so callers can skip building it.
+        
+        Args:
+            priority: Pushover priority of the alert
+            
+        Returns:
+            True unless the priority is below PUSHOVER_MIN_PRIORITY
+        """
+        return priority >= self.min_priority
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait for queued notifications to be sent.
+        
+        Args:
+            timeout: Maximum seconds to wait
             
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+    
+    def _ensure_worker(self):
+        """Start the background sender on first use."""
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_worker, name="pushover-notifier", daemon=True)
+                self._worker.start()
+                # Deliver alerts queued just before shutdown (e.g., crash alerts)
+                atexit.register(self.flush)
+    
+    def _run_worker(self):
+        """Send queued notifications, coalescing bursts into combined pushes."""
+        while True:
+            batch = [self._queue.get()]
+            # Entries and exits for both strategies land within a tick; gather them
+            deadline = time.monotonic() + COALESCE_WINDOW_S
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                for message, title, priority, sound in _coalesce(batch):
+                    self._post(message, title, priority, sound)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    def _post(self, message: str, title: str, priority: int, sound: Optional[str]) -> bool:
+        """POST one notification to the Pushover API."""
+        if not self.enabled:
+            return False
+        
         try:
             payload = {
                 "token": self.api_token,
@@ -50,7 +196,7 @@ class PushoverNotifier:
             if sound:
                 payload["sound"] = sound
                 
-            response = requests.post(self.api_url, data=payload, timeout=10)
+            response = self.session.post(self.api_url, data=payload, timeout=10)
             
             if response.status_code == 200:
                 print(f"[PUSHOVER SENT] {title}: {message}")
@@ -191,8 +191,13 @@ socket.on('disconnect', () => {
     document.getElementById('connectionStatus').classList.add('disconnected');
 });
 
-socket.on('initial_state', (data) => {
+socket.on('initial_state', (payload) => {
+    // Server sends the cached snapshot as pre-serialized JSON bytes
+    const data = payload instanceof ArrayBuffer
+        ? JSON.parse(new TextDecoder().decode(payload))
+        : payload;
     console.log('Initial state received:', data);
+    seedTickState(data);
     updateRegime(data.current_regime, data.vix_level);
     updatePnl(data.daily_pnl, data.total_pnl, data.account_balance);
     
@@ -212,41 +217,53 @@ socket.on('initial_state', (data) => {
         updateTradeHistory(data.trade_history);
     }
     
+    if (data.open_positions) {
+        updateOpenPositions(data.open_positions);
+    }
+    
     if (data.system_health) {
         updateSystemHealth(data.system_health);
     }
 });
 
-socket.on('pnl_update', (data) => {
-    updatePnl(data.daily_pnl, data.total_pnl, data.account_balance);
-});
-
-socket.on('regime_update', (data) => {
-    updateRegime(data.current_regime, data.vix_level);
-});
-
-socket.on('safety_update', (data) => {
-    updateSafetyStatus(data);
-});
-
-socket.on('breaker_update', (data) => {
-    updateCircuitBreakers(data);
-});
-
-socket.on('performance_update', (data) => {
-    updatePerformance(data);
-});
-
-socket.on('trade_history_update', (data) => {
-    updateTradeHistory(data.trades);
-});
+// Periodic ticks carry only the fields that changed since the last tick;
+// they are merged into the last full view of each section before rendering
+const tickState = {};
+
+function seedTickState(data) {
+    tickState.pnl = {
+        daily_pnl: data.daily_pnl,
+        total_pnl: data.total_pnl,
+        account_balance: data.account_balance
+    };
+    tickState.regime = {current_regime: data.current_regime, vix_level: data.vix_level};
+    tickState.safety = {...data.safety_status};
+    tickState.breakers = {...data.circuit_breakers};
+    tickState.performance = {...data.performance_metrics};
+    tickState.system_health = {...data.system_health};
+    tickState.trade_history = {trades: data.trade_history || []};
+    tickState.positions = {positions: data.open_positions || []};
+}
 
-socket.on('positions_update', (data) => {
-    updateOpenPositions(data.positions);
-});
+const tickHandlers = {
+    pnl: (data) => updatePnl(data.daily_pnl, data.total_pnl, data.account_balance),
+    regime: (data) => updateRegime(data.current_regime, data.vix_level),
+    safety: updateSafetyStatus,
+    breakers: updateCircuitBreakers,
+    performance: updatePerformance,
+    system_health: updateSystemHealth,
+    trade_history: (data) => updateTradeHistory(data.trades),
+    positions: (data) => updateOpenPositions(data.positions)
+};
 
-socket.on('system_health_update', (data) => {
-    updateSystemHealth(data);
+socket.on('state_tick', (payload) => {
+    for (const [section, delta] of Object.entries(payload)) {
+        const handler = tickHandlers[section];
+        if (handler) {
+            tickState[section] = Object.assign(tickState[section] || {}, delta);
+            handler(tickState[section]);
+        }
+    }
 });
 
 socket.on('kill_switch_activated', (data) => {
@@ -0,0 +1,27 @@
+"""
+Optional numba JIT for sequential numeric kernels.
+
+numba is not a hard dependency: without it, ``njit`` returns the function
+unchanged so kernels run as plain Python over NumPy arrays.
+"""
+
+try:
+    from numba import njit as _numba_njit
+    HAS_NUMBA = True
+except ImportError:
+    _numba_njit = None
+    HAS_NUMBA = False
+
+
+def njit(*args, **kwargs):
+    """
+    numba.njit when numba is installed, otherwise a no-op decorator.
+    
+    Supports both ``@njit`` and ``@njit(cache=True, ...)`` forms.
+    """
+    if HAS_NUMBA:
+        return _numba_njit(*args, **kwargs)
+    
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
@@ -5,8 +5,10 @@ Handles options order placement, position management, and P&L tracking.
 """
 
 import os
+import time
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
+import numpy as np
 import pytz
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import OrderRequest, LimitOrderRequest
@@ -15,15 +17,22 @@ from alpaca.data.historical import OptionHistoricalDataClient
 from alpaca.data.requests import OptionChainRequest
 
 
+POSITION_NUMERIC_FIELDS = (
+    'qty', 'avg_entry_price', 'current_price', 'market_value',
+    'unrealized_pl', 'unrealized_plpc'
+)
+
+
 class AlpacaOptionsExecutor:
     """Handles options execution via Alpaca paper trading API."""
     
-    def __init__(self, paper: bool = True):
+    def __init__(self, paper: bool = True, chain_ttl_s: float = 30.0):
         """
         Initialize Alpaca trading client.
         
         Args:
             paper: Use paper trading (default: True)
+            chain_ttl_s: Seconds an options chain is reused before refetching (default: 30)
         """
         api_key = os.getenv('ALPACA_API_KEY')
         secret_key = os.getenv('ALPACA_API_SECRET')
@@ -34,6 +43,9 @@ class AlpacaOptionsExecutor:
         self.client = TradingClient(api_key, secret_key, paper=paper)
         self.data_client = OptionHistoricalDataClient(api_key, secret_key)
         self.paper = paper
+        self.chain_ttl_s = chain_ttl_s
+        self._chain_cache: Dict[tuple, tuple] = {}  # (underlying, dte) -> (fetched_at, chain)
+        self._strike_arrays: tuple = (None, {})  # (chain, index from _get_chain_index)
         
         print(f"Alpaca {'Paper' if paper else 'Live'} Trading initialized")
         
@@ -56,8 +68,13 @@ class AlpacaOptionsExecutor:
             days_to_expiry: Days until expiration (default: 7 for weekly)
             
         Returns:
-            List of available option contracts
+            List of available option contracts (cached for chain_ttl_s)
         """
+        key = (underlying, days_to_expiry)
+        cached = self._chain_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.chain_ttl_s:
+            return cached[1]
+        
         today = datetime.now(pytz.timezone('America/New_York'))
         expiry_start = today + timedelta(days=days_to_expiry-1)
         expiry_end = today + timedelta(days=days_to_expiry+1)
@@ -69,6 +86,9 @@ class AlpacaOptionsExecutor:
         )
         
         chain = self.data_client.get_option_chain(request)
+        self._chain_cache[key] = (time.monotonic(), chain)
+        if chain:
+            self._get_chain_index(chain)  # Strike lookup arrays built once per fetch
         return chain
     
     def find_nearest_strike(self, spot: float, direction: str, chain: List, delta: float = 0.3) -> Optional[str]:
@@ -87,19 +107,53 @@ class AlpacaOptionsExecutor:
         if not chain:
             return None
         
-        option_type = 'C' if direction == 'long' else 'P'
-        
-        candidates = [c for c in chain if option_type in c.symbol]
+        strikes, symbols, positions = self._get_chain_index(chain)['C' if direction == 'long' else 'P']
         
-        if not candidates:
+        if len(strikes) == 0:
             return None
         
-        candidates.sort(key=lambda x: abs(x.strike_price - spot))
+        # Nearest strike is at i (first >= spot) or the run just below it; ties
+        # go to the contract listed first in the chain, as with a stable sort
+        i = int(np.searchsorted(strikes, spot))
+        candidates = []
+        if i < len(strikes):
+            candidates.append(i)
+        if i > 0:
+            candidates.append(int(np.searchsorted(strikes, strikes[i - 1])))
+        best = min(candidates, key=lambda j: (abs(strikes[j] - spot), positions[j]))
+        return symbols[best]
+    
+    def _get_chain_index(self, chain: List) -> Dict:
+        """
+        Strike-sorted calls and puts for a chain, built once per chain.
+        
+        The option type is read from the OCC symbol's type character
+        (ROOT + YYMMDD + C/P + 8-digit strike), so roots containing 'C' or
+        'P' (e.g. SPY) are classified correctly.
+        
+        Args:
+            chain: Options chain data
+            
+        Returns:
+            Dict mapping 'C'/'P' to (sorted strikes, symbols, chain positions)
+        """
+        cached_chain, index = self._strike_arrays
+        if cached_chain is chain:
+            return index
+        
+        symbols = [c.symbol for c in chain]
+        types = np.array([s[-9:-8] for s in symbols])
+        strikes = np.fromiter((c.strike_price for c in chain), dtype=np.float64, count=len(symbols))
         
-        if candidates:
-            return candidates[0].symbol
+        index = {}
+        for option_type in ('C', 'P'):
+            positions = np.flatnonzero(types == option_type)
+            # Stable sort keeps chain order among equal strikes
+            positions = positions[np.argsort(strikes[positions], kind='stable')]
+            index[option_type] = (strikes[positions], [symbols[j] for j in positions], positions)
         
-        return None
+        self._strike_arrays = (chain, index)
+        return index
     
     def place_long_option(
         self, 
@@ -164,17 +218,18 @@ class AlpacaOptionsExecutor:
         """Get current options positions."""
         try:
             positions = self.client.get_all_positions()
+            if not positions:
+                return []
+            
+            # Column-wise: one NumPy string->float conversion per field
+            columns = {'symbol': [p.symbol for p in positions]}
+            for field in POSITION_NUMERIC_FIELDS:
+                raw = np.asarray([getattr(p, field) for p in positions], dtype=str)
+                columns[field] = raw.astype(np.float64).tolist()
+            
             return [
-                {
-                    'symbol': p.symbol,
-                    'qty': float(p.qty),
-                    'avg_entry_price': float(p.avg_entry_price),
-                    'current_price': float(p.current_price),
-                    'market_value': float(p.market_value),
-                    'unrealized_pl': float(p.unrealized_pl),
-                    'unrealized_plpc': float(p.unrealized_plpc)
-                }
-                for p in positions
+                dict(zip(columns, row))
+                for row in zip(*columns.values())
             ]
         except Exception as e:
             print(f"Error fetching positions: {e}")
@@ -6,6 +6,7 @@ Executes both conservative (5% risk) and aggressive (5% risk) strategies
 QQQ-ONLY: 80.5% win rate vs 53% dual-symbol (SPY removed for performance)
 """
 
+import atexit
 import os
 import sys
 sys.path.insert(0, '.')
@@ -13,20 +14,140 @@ sys.path.insert(0, '.')
 import time
 import json
 import hashlib
+import heapq
+import logging
+import queue
 import threading
 import shutil
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 from engine.sessions_liquidity import label_sessions, add_session_highs_lows
 from engine.ict_structures import detect_all_structures
+from engine.strategy_shared import wilder_atr_array, wilder_atr_last
+from engine._njit import njit
 from engine.polygon_options_fetcher import PolygonOptionsFetcher
 from engine.polygon_data_fetcher import PolygonDataFetcher
 from engine.market_calendar import MarketCalendar
 from dashboard.notifier import notifier
 
+logger = logging.getLogger('auto_trader')
+
+TRADE_RING_SIZE = 1024
+TRADE_DTYPE = np.dtype([('t', 'f8'), ('px', 'f8')])
+DIRECTION_SIGN = {'LONG': 1, 'SHORT': -1}  # Target side of entry, as used by the exit-check arrays
+EXIT_RETRY_BASE_S = 5.0  # First wait after a failed exit quote, doubled per failure
+EXIT_RETRY_MAX_S = 60.0
+RECENT_TRADES = 20  # Closed trades kept in the snapshot; the full record is the closed log
+ENTRY_ALERT = ("%s %s Entry (%s)\n%s %d contracts\nStrike: $%.2f\n"
+               "Premium: $%.2f ($%.2f total)\nTarget: $%.2f\nDelta: %.2f")
+EXIT_ALERT = ("%s %s Exit %s\nP&L: $%+.2f\nEntry Premium: $%.2f\n"
+              "Exit Value: $%.2f ($%.2f bid)\nContracts: %s\n%s")
+
+
+def _dump_state(state: Dict) -> bytes:
+    """Serialize a state snapshot (orjson when installed, stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.dumps(state, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(state, default=str, indent=2).encode()
+
+
+def _read_state(path: str) -> Dict:
+    """Parse a state snapshot file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            pass  # Older stdlib snapshots may contain NaN literals
+    return json.loads(raw)
+
+
+def _dump_line(record: Dict) -> str:
+    """Serialize one NDJSON log record (no trailing newline)."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(record, default=str)
+
+
+def _load_line(raw: bytes) -> Dict:
+    """Parse one NDJSON log record; raises ValueError on a torn line."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _state_checksum_matches(state: Dict, stored_checksum: str) -> bool:
+    """Check a snapshot checksum written by either serializer."""
+    candidates = [json.dumps(state, default=str, indent=2).encode()]
+    if orjson is not None:
+        candidates.insert(0, _dump_state(state))
+    return any(hashlib.sha256(body).hexdigest() == stored_checksum for body in candidates)
+
+
+def start_log_listener(level: int = logging.INFO) -> QueueListener:
+    """
+    Send all process logging through a queue so the trading loop never blocks on stdout.
+    
+    Installs a QueueHandler on the root logger (so fetcher and notifier
+    logs share the queue) and starts a listener thread writing to stdout.
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    listener.start()
+    return listener
+
+
+@njit(cache=True, boundscheck=False, error_model='numpy')
+def _scan_ict_signals(sweep_bull, sweep_bear, disp_bull, disp_bear, mss_bull, mss_bear,
+                      start, stop, lookahead):
+    """
+    Find sweep bars confirmed by displacement and MSS within the lookahead.
+    
+    Returns:
+        (bar indices, directions) with direction +1 for LONG, -1 for SHORT,
+        bullish before bearish on the same bar
+    """
+    n = len(sweep_bull)
+    hits = np.empty(2 * max(stop - start, 0), dtype=np.int64)
+    directions = np.empty(2 * max(stop - start, 0), dtype=np.int64)
+    count = 0
+    for i in range(start, stop):
+        end = min(i + lookahead + 1, n)
+        if sweep_bull[i]:
+            disp = False
+            mss = False
+            for j in range(i, end):
+                disp = disp or disp_bull[j]
+                mss = mss or mss_bull[j]
+            if disp and mss:
+                hits[count] = i
+                directions[count] = 1
+                count += 1
+        if sweep_bear[i]:
+            disp = False
+            mss = False
+            for j in range(i, end):
+                disp = disp or disp_bear[j]
+                mss = mss or mss_bear[j]
+            if disp and mss:
+                hits[count] = i
+                directions[count] = -1
+                count += 1
+    return hits[:count], directions[:count]
+
 
 class AutomatedDualTrader:
     """
@@ -53,9 +174,15 @@ class AutomatedDualTrader:
         self.aggressive_risk_pct = 5.0    # Match backtest exactly (dual strategy = 2 positions)
         self.atr_multiple = 5.0
         self.max_hold_minutes = 60
+        self.max_hold_seconds = self.max_hold_minutes * 60
         
         # State tracking
         self.state_file = state_file
+        # Append-only position events between snapshots, folded into the next save_state
+        self.events_file = f"{os.path.splitext(state_file)[0]}_events.ndjson"
+        # Append-only closed positions and trades; snapshots carry only what is still open
+        self.closed_file = f"{os.path.splitext(state_file)[0]}_closed.ndjson"
+        self.state_lock = threading.Lock()
         self.account_balance = starting_balance
         self.positions = {
             'conservative': [],
@@ -71,21 +198,38 @@ class AutomatedDualTrader:
         
         # Market data buffer (per symbol)
         self.bars_buffer = {symbol: pd.DataFrame() for symbol in self.symbols}
-        self.last_signal_check = {symbol: None for symbol in self.symbols}
+        self.last_signal_ns = {symbol: None for symbol in self.symbols}  # Newest signal bar (UTC epoch ns)
+        self.last_scan_key = {symbol: None for symbol in self.symbols}  # Bars last run through detect_signals
         
         # Reliability & monitoring
         self.heartbeat_timestamp = datetime.now()
         self.main_loop_timestamp = datetime.now()
         self.heartbeat_thread = None
         self.watchdog_thread = None
+        self.trade_stream_thread = None
+        # Recent streamed trades per symbol: ring of (exchange time, price), written by the stream thread
+        self.trade_ring = {symbol: np.zeros(TRADE_RING_SIZE, dtype=TRADE_DTYPE) for symbol in self.symbols}
+        self.trade_count = {symbol: 0 for symbol in self.symbols}
+        self.exit_lock = threading.Lock()  # Serializes exit checks between the main loop and the exit worker
+        self.exit_worker_thread = None
+        # Latest streamed price per symbol, handed from the stream callback to the exit worker
+        self._stream_prices = {}
+        self._stream_lock = threading.Lock()
+        self._stream_event = threading.Event()
+        self._exit_retry = {}  # Position key -> (next attempt epoch, backoff seconds) after a failed exit quote
         self.running = False
         
-        # Load previous state if exists
+        # Load previous state if exists, then replay events logged after it
+        self._closed_fh = open(self.closed_file, 'a', buffering=1)
         self.load_state()
+        self._events_fh = open(self.events_file, 'a', buffering=1)
         
         # Check for position recovery on restart
         self.recover_positions_after_restart()
         
+        # Exit-check arrays for whatever is still open after recovery
+        self._reset_open_book()
+        
         # Save initial state to create the file
         self.save_state()
     
@@ -114,33 +258,33 @@ class AutomatedDualTrader:
         return df
     
     def calculate_atr(self, df: pd.DataFrame, period=14) -> float:
-        """Calculate ATR."""
+        """Calculate ATR (Wilder smoothing)."""
         if len(df) < period + 1:
             return 0.5
         
-        df = df.copy()
-        df['h-l'] = df['high'] - df['low']
-        df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-        df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        atr_series = df['tr'].rolling(window=period).mean()
-        atr = atr_series.iloc[-1] if hasattr(atr_series, 'iloc') else 0.5
-        return atr if not pd.isna(atr) else 0.5
+        atr = wilder_atr_last(df, period)
+        return float(atr) if not np.isnan(atr) else 0.5
     
     def detect_signals(self, symbol: str, df: pd.DataFrame) -> List[Dict]:
         """Detect ICT confluence signals for a specific symbol."""
-        # Only analyze last 100 bars to prevent hanging
-        if len(df) > 100:
-            df = df.tail(100).copy()
-        else:
-            df = df.copy()
-            
-        df['h-l'] = df['high'] - df['low']
-        df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-        df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        df['atr'] = df['tr'].rolling(window=14).mean()
+        bars = df
+        # Only analyze last 100 bars to prevent hanging (label_sessions copies)
+        df = df.tail(100)
         
+        # Same bars as the last scan: every signal in them was already returned
+        # (and is filtered by last_signal_ns), so skip the structure rebuild
+        if len(df) == 0:
+            return []
+        first, last = df.iloc[0], df.iloc[-1]
+        scan_key = (
+            len(df), first['timestamp'], last['timestamp'],
+            last['open'], last['high'], last['low'], last['close'], last['volume']
+        )
+        if scan_key == self.last_scan_key.get(symbol):
+            return []
+        self.last_scan_key[symbol] = scan_key
+        
+        # detect_displacement adds the 14-bar SMA 'atr' used for displacement sizing
         df = label_sessions(df)
         df = add_session_highs_lows(df)
         df = detect_all_structures(df, displacement_threshold=0.75)
@@ -148,151 +292,107 @@ class AutomatedDualTrader:
         signals = []
         
         # Check last 10 bars for new signals (need 5 bars lookahead for confluence)
-        for i in range(max(0, len(df) - 10), len(df) - 5):
-            timestamp = df.iloc[i]['timestamp']
-            
-            # Skip if we already checked this period for this symbol
-            if self.last_signal_check[symbol] and timestamp <= self.last_signal_check[symbol]:
-                continue
-            
-            # Bullish signal
-            if df.iloc[i]['sweep_bullish']:
-                window = df.iloc[i:i+6]
-                if window['displacement_bullish'].any() and window['mss_bullish'].any():
-                    atr = df.iloc[i].get('atr', 0.5)
-                    price = df.iloc[i]['close']
-                    
-                    signals.append({
-                        'symbol': symbol,
-                        'timestamp': timestamp,
-                        'direction': 'LONG',
-                        'price': price,
-                        'atr': atr,
-                        'target': price + (self.atr_multiple * atr)
-                    })
-            
-            # Bearish signal
-            if df.iloc[i]['sweep_bearish']:
-                window = df.iloc[i:i+6]
-                if window['displacement_bearish'].any() and window['mss_bearish'].any():
-                    atr = df.iloc[i].get('atr', 0.5)
-                    price = df.iloc[i]['close']
-                    
-                    signals.append({
-                        'symbol': symbol,
-                        'timestamp': timestamp,
-                        'direction': 'SHORT',
-                        'price': price,
-                        'atr': atr,
-                        'target': price - (self.atr_multiple * atr)
-                    })
-        
-        if signals:
-            self.last_signal_check[symbol] = max(s['timestamp'] for s in signals)
+        start, stop = max(0, len(df) - 10), len(df) - 5
+        sweep_bull = df['sweep_bullish'].to_numpy(dtype=bool)
+        sweep_bear = df['sweep_bearish'].to_numpy(dtype=bool)
         
-        return signals
-    
-    def execute_conservative(self, signal: Dict, balance: float):
-        """Execute conservative strategy using REAL Polygon 0DTE options pricing (5% risk to match backtest)."""
-        risk_budget = balance * (self.conservative_risk_pct / 100)
-        symbol = signal['symbol']
+        # Most ticks have no sweep in the window; skip the confluence kernel
+        if stop <= start or not (sweep_bull[start:stop].any() or sweep_bear[start:stop].any()):
+            return signals
         
-        # Fetch REAL 0DTE option price from Polygon
-        option_data = self.options_fetcher.get_0dte_option_price(
-            underlying_ticker=symbol,
-            current_price=signal['price'],
-            direction=signal['direction'],
-            strike_offset=-1  # 1 strike ITM (BACKTEST VALIDATED: +2000% vs +135% ATM)
+        hits, directions = _scan_ict_signals(
+            sweep_bull,
+            sweep_bear,
+            df['displacement_bullish'].to_numpy(dtype=bool),
+            df['displacement_bearish'].to_numpy(dtype=bool),
+            df['mss_bullish'].to_numpy(dtype=bool),
+            df['mss_bearish'].to_numpy(dtype=bool),
+            start,
+            stop,
+            5
         )
         
-        if not option_data:
-            print(f"⚠️  Conservative: No 0DTE options available")
-            return
-        
-        # Calculate number of contracts based on premium
-        premium_per_contract = option_data['premium']
-        if premium_per_contract == 0:
-            print(f"⚠️  Conservative: Invalid premium ($0.00)")
-            return
-        
-        # Check if we can afford at least 1 contract
-        if risk_budget < premium_per_contract or balance < premium_per_contract:
-            print(f"⚠️  Conservative: Insufficient balance (${balance:.2f}) for premium (${premium_per_contract:.2f})")
-            return
-        
-        num_contracts = int(risk_budget / premium_per_contract)
-        num_contracts = max(1, min(num_contracts, 10))  # 1-10 contracts
+        timestamps = df['timestamp']
+        close = df['close'].to_numpy()
+        # Targets use the Wilder ATR over all fetched bars (0.5 while warming up)
+        atr_values = np.nan_to_num(wilder_atr_array(bars)[-len(df):], nan=0.5)
+        last_ns = self.last_signal_ns[symbol]
         
-        total_cost = num_contracts * premium_per_contract
+        # Drop periods already checked for this symbol (int64 compare), then price only the survivors
+        hit_ns = timestamps.to_numpy(dtype='datetime64[ns]')[hits].view(np.int64)
+        if last_ns is not None and len(hits):
+            fresh = hit_ns > last_ns
+            hits, directions, hit_ns = hits[fresh], directions[fresh], hit_ns[fresh]
         
-        # Deduct cost from account balance
-        self.account_balance -= total_cost
+        prices = close[hits]
+        atrs = atr_values[hits]
+        targets = prices + directions * (self.atr_multiple * atrs)
         
-        # Track position with REAL option data
-        position = {
-            'strategy': 'conservative',
-            'symbol': symbol,
-            'entry_time': datetime.now(),
-            'entry_price': signal['price'],
-            'direction': signal['direction'],
-            'target_price': signal['target'],
-            'num_contracts': num_contracts,
-            'premium_paid': total_cost,
-            'option_contract': option_data['contract'],
-            'strike': option_data['strike'],
-            'entry_bid': option_data['bid'],
-            'entry_ask': option_data['ask'],
-            'delta': option_data['delta'],
-            'iv': option_data['iv'],
-            'atr': signal['atr'],
-            'status': 'open'
-        }
+        for k, i in enumerate(hits.tolist()):
+            signals.append({
+                'symbol': symbol,
+                'timestamp': timestamps.iloc[i],
+                'direction': 'LONG' if directions[k] > 0 else 'SHORT',
+                'price': prices[k],
+                'atr': atrs[k],
+                'target': targets[k]
+            })
         
-        self.positions['conservative'].append(position)
-        
-        # Notification
-        notifier.send_notification(
-            f"💼 CONSERVATIVE Entry ({symbol})\n"
-            f"{signal['direction']} {num_contracts} contracts\n"
-            f"Strike: ${option_data['strike']:.2f}\n"
-            f"Premium: ${option_data['ask']:.2f} (${total_cost:.2f} total)\n"
-            f"Target: ${signal['target']:.2f}\n"
-            f"Delta: {option_data['delta']:.2f}",
-            title=f"Conservative {symbol}",
-            priority=0
-        )
-        
-        print(f"✅ Conservative {symbol} {signal['direction']}: {num_contracts}x {option_data['contract']}")
-        print(f"   Premium: ${option_data['ask']:.2f} × {num_contracts} = ${total_cost:.2f}")
+        if signals:
+            self.last_signal_ns[symbol] = int(hit_ns.max())
         
-        self.save_state()
+        return signals
     
-    def execute_aggressive(self, signal: Dict, balance: float):
-        """Execute aggressive strategy using REAL Polygon 0DTE options pricing (5% risk to match backtest)."""
-        risk_budget = balance * (self.aggressive_risk_pct / 100)
-        symbol = signal['symbol']
-        
-        # Fetch REAL 0DTE option price from Polygon
-        option_data = self.options_fetcher.get_0dte_option_price(
-            underlying_ticker=symbol,
+    def fetch_entry_option(self, signal: Dict) -> Optional[Dict]:
+        """Fetch REAL 0DTE option price from Polygon for a signal (1 strike ITM)."""
+        return self.options_fetcher.get_0dte_option_price(
+            underlying_ticker=signal['symbol'],
             current_price=signal['price'],
             direction=signal['direction'],
             strike_offset=-1  # 1 strike ITM (BACKTEST VALIDATED: +2000% vs +135% ATM)
         )
+    
+    def execute_conservative(self, signal: Dict, balance: float, option_data: Optional[Dict] = None):
+        """Execute conservative strategy using REAL Polygon 0DTE options pricing (5% risk to match backtest)."""
+        self._execute_strategy('conservative', self.conservative_risk_pct, '💼', signal, balance, option_data)
+    
+    def execute_aggressive(self, signal: Dict, balance: float, option_data: Optional[Dict] = None):
+        """Execute aggressive strategy using REAL Polygon 0DTE options pricing (5% risk to match backtest)."""
+        self._execute_strategy('aggressive', self.aggressive_risk_pct, '🚀', signal, balance, option_data)
+    
+    def _execute_strategy(self, strategy: str, risk_pct: float, emoji: str, signal: Dict,
+                          balance: float, option_data: Optional[Dict]):
+        """
+        Open one strategy's position on a signal.
+        
+        Args:
+            strategy: 'conservative' or 'aggressive'
+            risk_pct: Percent of balance to risk
+            emoji: Notification prefix
+            signal: Signal dict from detect_signals
+            balance: Account balance at signal time
+            option_data: Quote from fetch_entry_option, fetched here if None
+        """
+        label = strategy.title()
+        risk_budget = balance * (risk_pct / 100)
+        symbol = signal['symbol']
+        
+        if option_data is None:
+            option_data = self.fetch_entry_option(signal)
         
         if not option_data:
-            print(f"⚠️  Aggressive: No 0DTE options available")
+            logger.warning("⚠️  %s: No 0DTE options available", label)
             return
         
-        # Calculate number of contracts (4% risk = more contracts than conservative)
+        # Calculate number of contracts based on premium
         premium_per_contract = option_data['premium']
         if premium_per_contract == 0:
-            print(f"⚠️  Aggressive: Invalid premium ($0.00)")
+            logger.warning("⚠️  %s: Invalid premium ($0.00)", label)
             return
         
         # Check if we can afford at least 1 contract
         if risk_budget < premium_per_contract or balance < premium_per_contract:
-            print(f"⚠️  Aggressive: Insufficient balance (${balance:.2f}) for premium (${premium_per_contract:.2f})")
+            logger.warning("⚠️  %s: Insufficient balance ($%.2f) for premium ($%.2f)", label, balance, premium_per_contract)
             return
         
         num_contracts = int(risk_budget / premium_per_contract)
@@ -305,7 +405,7 @@ class AutomatedDualTrader:
         
         # Track position with REAL option data
         position = {
-            'strategy': 'aggressive',
+            'strategy': strategy,
             'symbol': symbol,
             'entry_time': datetime.now(),
             'entry_price': signal['price'],
@@ -323,70 +423,118 @@ class AutomatedDualTrader:
             'status': 'open'
         }
         
-        self.positions['aggressive'].append(position)
-        
-        # Notification
-        notifier.send_notification(
-            f"🚀 AGGRESSIVE Entry ({symbol})\n"
-            f"{signal['direction']} {num_contracts} contracts\n"
-            f"Strike: ${option_data['strike']:.2f}\n"
-            f"Premium: ${option_data['ask']:.2f} (${total_cost:.2f} total)\n"
-            f"Target: ${signal['target']:.2f}\n"
-            f"Delta: {option_data['delta']:.2f}",
-            title=f"Aggressive {symbol}",
-            priority=0
-        )
+        self.positions[strategy].append(position)
+        self._track_open(strategy, position)
         
-        print(f"✅ Aggressive {symbol} {signal['direction']}: {num_contracts}x {option_data['contract']}")
-        print(f"   Premium: ${option_data['ask']:.2f} × {num_contracts} = ${total_cost:.2f}")
+        # Notification (message built only if the notifier will take it)
+        if notifier.would_send(0):
+            notifier.send_notification(
+                ENTRY_ALERT % (emoji, strategy.upper(), symbol,
+                               signal['direction'], num_contracts,
+                               option_data['strike'],
+                               option_data['ask'], total_cost,
+                               signal['target'],
+                               option_data['delta']),
+                title=f"{label} {symbol}",
+                priority=0
+            )
         
-        self.save_state()
+        logger.info("✅ %s %s %s: %dx %s", label, symbol, signal['direction'], num_contracts, option_data['contract'])
+        logger.info("   Premium: $%.2f × %d = $%.2f", option_data['ask'], num_contracts, total_cost)
+        
+        self._log_event('open', position)
+    
+    def _reset_open_book(self):
+        """Rebuild the per-strategy exit-check arrays from open positions."""
+        self._open = {}
+        self._expiry_heap = {}
+        for strategy in ('conservative', 'aggressive'):
+            self._open[strategy] = {
+                'entry_epoch': np.empty(0),
+                'target': np.empty(0),
+                'sign': np.empty(0, dtype=np.int8),
+                'symbol': np.empty(0, dtype=object),
+                'meta': []
+            }
+            self._expiry_heap[strategy] = []
+            for pos in self.positions[strategy]:
+                if pos.get('status') == 'open':
+                    self._track_open(strategy, pos)
+    
+    def _track_open(self, strategy: str, position: Dict):
+        """Append an open position to its strategy's exit-check arrays."""
+        book = self._open[strategy]
+        entry_time = position['entry_time']
+        if isinstance(entry_time, str):
+            entry_time = datetime.fromisoformat(entry_time)
+        entry_epoch = entry_time.timestamp()
+        sign = DIRECTION_SIGN.get(position['direction'], 0)
+        
+        book['entry_epoch'] = np.append(book['entry_epoch'], entry_epoch)
+        book['target'] = np.append(book['target'], position['target_price'])
+        book['sign'] = np.append(book['sign'], np.int8(sign))
+        book['symbol'] = np.append(book['symbol'], np.array([position.get('symbol')], dtype=object))
+        book['meta'].append(position)
+        
+        heapq.heappush(self._expiry_heap[strategy],
+                       (entry_epoch + self.max_hold_seconds, id(position), position))
+    
+    def _next_expiry(self, strategy: str) -> float:
+        """Soonest time-limit exit among open positions (inf if none)."""
+        heap = self._expiry_heap[strategy]
+        while heap and heap[0][2]['status'] != 'open':
+            heapq.heappop(heap)
+        return heap[0][0] if heap else np.inf
     
     def check_exits(self, symbol_prices: Dict[str, float]):
         """Check and execute exits for both strategies using symbol-specific prices."""
-        now = datetime.now()
-        
-        # Conservative exits
-        for pos in self.positions['conservative']:
-            if pos['status'] != 'open':
-                continue
-            
-            # Get current price for this position's symbol
-            current_price = symbol_prices.get(pos['symbol'])
-            if current_price is None:
-                continue
-            
-            time_elapsed = (now - pos['entry_time']).total_seconds() / 60
-            hit_target = False
-            
-            if pos['direction'] == 'LONG' and current_price >= pos['target_price']:
-                hit_target = True
-            elif pos['direction'] == 'SHORT' and current_price <= pos['target_price']:
-                hit_target = True
-            
-            if hit_target or time_elapsed >= self.max_hold_minutes:
-                self.close_position(pos, current_price, hit_target)
+        now_epoch = time.time()  # Same epoch as entry_time.timestamp(), without a datetime per tick
         
-        # Aggressive exits
-        for pos in self.positions['aggressive']:
-            if pos['status'] != 'open':
+        # Conservative first, then aggressive, each in entry order
+        for strategy in ('conservative', 'aggressive'):
+            book = self._open[strategy]
+            if not book['meta']:
                 continue
             
-            # Get current price for this position's symbol
-            current_price = symbol_prices.get(pos['symbol'])
-            if current_price is None:
-                continue
+            # Current price for each position's symbol (NaN where unavailable)
+            prices = np.full(len(book['meta']), np.nan)
+            has_price = np.zeros(len(book['meta']), dtype=bool)
+            for symbol, price in symbol_prices.items():
+                if price is None:
+                    continue
+                mask = book['symbol'] == symbol
+                prices[mask] = price
+                has_price |= mask
             
-            time_elapsed = (now - pos['entry_time']).total_seconds() / 60
-            hit_target = False
+            hit = (book['sign'] * (prices - book['target']) >= 0) & (book['sign'] != 0)
+            if self._next_expiry(strategy) <= now_epoch:
+                expired = (now_epoch - book['entry_epoch']) >= self.max_hold_seconds
+            else:
+                expired = np.zeros(len(book['meta']), dtype=bool)
             
-            if pos['direction'] == 'LONG' and current_price >= pos['target_price']:
-                hit_target = True
-            elif pos['direction'] == 'SHORT' and current_price <= pos['target_price']:
-                hit_target = True
+            to_close = np.flatnonzero(has_price & (hit | expired))
+            if self._exit_retry and len(to_close):
+                # Positions whose last exit quote failed wait out their backoff
+                to_close = [i for i in to_close
+                            if self._exit_retry.get(self._position_key(book['meta'][i]), (0.0, 0.0))[0] <= now_epoch]
+            for i in to_close:
+                position = book['meta'][i]
+                self.close_position(position, float(prices[i]), bool(hit[i]))
+                key = self._position_key(position)
+                if position['status'] == 'open':
+                    delay = min(self._exit_retry[key][1] * 2, EXIT_RETRY_MAX_S) if key in self._exit_retry else EXIT_RETRY_BASE_S
+                    self._exit_retry[key] = (now_epoch + delay, delay)
+                    logger.info("   Retrying %s exit quote in %.0fs", strategy, delay)
+                else:
+                    self._exit_retry.pop(key, None)
             
-            if hit_target or time_elapsed >= self.max_hold_minutes:
-                self.close_position(pos, current_price, hit_target)
+            # Drop positions that actually closed (close_position can defer on API failure)
+            closed = [i for i in to_close if book['meta'][i]['status'] != 'open']
+            if closed:
+                for key in ('entry_epoch', 'target', 'sign', 'symbol'):
+                    book[key] = np.delete(book[key], closed)
+                closed_set = set(closed)
+                book['meta'] = [p for i, p in enumerate(book['meta']) if i not in closed_set]
     
     def close_position(self, position: Dict, exit_price: float, hit_target: bool):
         """Close a position using REAL Polygon exit pricing."""
@@ -401,8 +549,8 @@ class AutomatedDualTrader:
         
         if exit_value_per_contract is None:
             # API FAILURE - cannot get reliable exit price, skip this close attempt
-            print(f"⚠️  Cannot close {strategy} position - Polygon API failed to return exit price")
-            print(f"   Will retry on next cycle")
+            logger.warning("⚠️  Cannot close %s position - Polygon API failed to return exit price", strategy)
+            logger.info("   Will retry on a later exit check")
             return  # Don't close - wait for API to recover
         
         # Calculate total exit value
@@ -414,9 +562,11 @@ class AutomatedDualTrader:
         # Add exit proceeds to account balance
         self.account_balance += total_exit_value
         
-        # Update position
+        # Update position (one wall-clock read for every stamp below)
+        exit_time = datetime.now()
+        exit_iso = exit_time.isoformat()
         position['status'] = 'closed'
-        position['exit_time'] = datetime.now()
+        position['exit_time'] = exit_time
         position['exit_price'] = exit_price
         position['exit_value_per_contract'] = exit_value_per_contract
         position['total_exit_value'] = total_exit_value
@@ -431,7 +581,7 @@ class AutomatedDualTrader:
         
         # Add to trade history
         self.trade_history.append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': exit_iso,
             'strategy': strategy,
             'symbol': position.get('symbol', 'UNKNOWN'),
             'direction': position['direction'],
@@ -444,40 +594,188 @@ class AutomatedDualTrader:
             'pnl': pnl,
             'hit_target': hit_target,
             'entry_time': position['entry_time'].isoformat() if hasattr(position['entry_time'], 'isoformat') else str(position['entry_time']),
-            'exit_time': datetime.now().isoformat()
+            'exit_time': exit_iso
         })
         
-        # Notification
-        emoji = "🎯" if hit_target else "⏱️"
+        # Notification (message built only if the notifier will take it)
         color = "🟢" if pnl > 0 else "🔴"
+        if notifier.would_send(0):
+            notifier.send_notification(
+                EXIT_ALERT % ("🎯" if hit_target else "⏱️", strategy.upper(), color,
+                              pnl,
+                              position['premium_paid'],
+                              total_exit_value, exit_value_per_contract / 100,
+                              position['num_contracts'],
+                              'Target HIT' if hit_target else 'Time limit'),
+                title=f"{strategy.title()} Exit",
+                priority=0
+            )
         
-        exit_bid = exit_value_per_contract / 100
-        
-        notifier.send_notification(
-            f"{emoji} {strategy.upper()} Exit {color}\n"
-            f"P&L: ${pnl:+.2f}\n"
-            f"Entry Premium: ${position['premium_paid']:.2f}\n"
-            f"Exit Value: ${total_exit_value:.2f} (${exit_bid:.2f} bid)\n"
-            f"Contracts: {position['num_contracts']}\n"
-            f"{'Target HIT' if hit_target else 'Time limit'}",
-            title=f"{strategy.title()} Exit",
-            priority=0
-        )
+        logger.info("%s %s closed: $%+.2f", color, strategy.upper(), pnl)
+        logger.info("   %s contracts: $%.2f → $%.2f", position['num_contracts'], position['premium_paid'], total_exit_value)
+        logger.info("   (%s)", 'target' if hit_target else 'time exit')
         
-        print(f"{color} {strategy.upper()} closed: ${pnl:+.2f}")
-        print(f"   {position['num_contracts']} contracts: ${position['premium_paid']:.2f} → ${total_exit_value:.2f}")
-        print(f"   ({'target' if hit_target else 'time exit'})")
+        self._log_event('close', position)
+        self._log_closed(strategy, position, self.trade_history[-1])
+    
+    def _log_event(self, kind: str, position: Dict):
+        """
+        Append a position event to the NDJSON log instead of rewriting the snapshot.
         
-        self.save_state()
+        Args:
+            kind: 'open' or 'close'
+            position: Position dict after the change
+        """
+        strategy = position['strategy']
+        event = {
+            'kind': kind,
+            'strategy': strategy,
+            'position': position,
+            'account_balance': self.account_balance
+        }
+        if kind == 'close':
+            event['stats'] = self.stats[strategy]
+            event['trade'] = self.trade_history[-1]
+        
+        with self.state_lock:
+            # Stamped under the lock so it can't predate a snapshot that truncated the log
+            event['t'] = datetime.now().isoformat()
+            try:
+                self._events_fh.write(_dump_line(event) + '\n')
+            except Exception as e:
+                logger.warning("⚠️ Error logging %s event: %s", kind, e)
+    
+    def _log_closed(self, strategy: str, position: Optional[Dict], trade: Optional[Dict]):
+        """
+        Append a closed position and/or its trade record to the closed log.
+        
+        Args:
+            strategy: Strategy the position belonged to
+            position: Closed position dict (None for a trade-only record)
+            trade: Trade history entry (None for a position-only record)
+        """
+        line = _dump_line({'strategy': strategy, 'position': position, 'trade': trade})
+        with self.state_lock:
+            try:
+                self._closed_fh.write(line + '\n')
+            except Exception as e:
+                logger.warning("⚠️ Error logging closed %s position: %s", strategy, e)
+    
+    def _load_closed(self):
+        """Restore closed positions and the trade history from the closed log."""
+        if not os.path.exists(self.closed_file):
+            return
+        
+        # A position closed after the snapshot still appears there as open
+        index = {}
+        for strategy, positions in self.positions.items():
+            for i, position in enumerate(positions):
+                index[(strategy, self._position_key(position))] = i
+        
+        with open(self.closed_file, 'rb') as f:
+            for raw in f:
+                try:
+                    record = _load_line(raw)
+                except ValueError:
+                    continue  # Torn final line from a crash mid-write
+                
+                position = record.get('position')
+                if position is not None:
+                    strategy = record['strategy']
+                    positions = self.positions.setdefault(strategy, [])
+                    i = index.get((strategy, self._position_key(position)))
+                    if i is not None:
+                        positions[i] = position
+                    else:
+                        positions.append(position)
+                if record.get('trade') is not None:
+                    self.trade_history.append(record['trade'])
+    
+    def _migrate_closed(self):
+        """Move closed positions and trades from a pre-closed-log snapshot into the closed log."""
+        if os.path.exists(self.closed_file) and os.path.getsize(self.closed_file) > 0:
+            return
+        for strategy, positions in self.positions.items():
+            for position in positions:
+                if position.get('status') == 'closed':
+                    self._log_closed(strategy, position, None)
+        for trade in self.trade_history:
+            self._log_closed(trade.get('strategy'), None, trade)
+    
+    @staticmethod
+    def _position_key(position: Dict) -> tuple:
+        """Identify a position across snapshot and event-log serializations."""
+        entry_time = position.get('entry_time')
+        if isinstance(entry_time, str):
+            entry_time = datetime.fromisoformat(entry_time)
+        return (entry_time, position.get('option_contract'))
+    
+    def _replay_events(self, since: Optional[str]):
+        """
+        Apply logged position events newer than the loaded snapshot.
+        
+        Args:
+            since: Snapshot 'last_updated' timestamp (None replays everything)
+        """
+        if not os.path.exists(self.events_file):
+            return
+        since_dt = datetime.fromisoformat(since) if since else None
+        
+        replayed = 0
+        with open(self.events_file, 'rb') as f:
+            for raw in f:
+                try:
+                    event = _load_line(raw)
+                except ValueError:
+                    continue  # Torn final line from a crash mid-write
+                if since_dt is not None and datetime.fromisoformat(event['t']) <= since_dt:
+                    continue
+                
+                strategy = event['strategy']
+                position = event['position']
+                positions = self.positions.setdefault(strategy, [])
+                key = self._position_key(position)
+                was_closed = False
+                for i, existing in enumerate(positions):
+                    if self._position_key(existing) == key:
+                        was_closed = existing.get('status') == 'closed'
+                        # Keep the closed copy from the closed log over its earlier 'open' event
+                        if not (was_closed and event['kind'] == 'open'):
+                            positions[i] = position
+                        break
+                else:
+                    positions.append(position)
+                
+                self.account_balance = event['account_balance']
+                if event['kind'] == 'close':
+                    self.stats[strategy] = event['stats']
+                    # Already restored from the closed log unless the crash came between the two writes
+                    if not was_closed:
+                        self.trade_history.append(event['trade'])
+                        self._log_closed(strategy, position, event['trade'])
+                replayed += 1
+        
+        if replayed:
+            logger.info("✅ Replayed %d position events since last snapshot", replayed)
     
     def save_state(self):
-        """Save current state to file with atomic writes and checksums."""
+        """Save a full state snapshot with atomic writes and checksums, then compact the event log."""
+        # exit_lock keeps a close on the exit worker from landing half-done in the snapshot
+        with self.exit_lock, self.state_lock:
+            self._save_snapshot()
+    
+    def _save_snapshot(self):
+        """Write the snapshot; caller holds exit_lock and state_lock."""
         state = {
             'account_balance': self.account_balance,
             'starting_balance': self.starting_balance,
-            'positions': self.positions,
+            'positions': {
+                strategy: [p for p in positions if p.get('status') != 'closed']
+                for strategy, positions in self.positions.items()
+            },
             'stats': self.stats,
-            'trade_history': self.trade_history,
+            'trade_history': self.trade_history[-RECENT_TRADES:],
+            'closed_file': self.closed_file,
             'last_startup_notification': self.last_startup_notification,
             'last_market_open_notification': self.last_market_open_notification,
             'last_updated': datetime.now().isoformat(),
@@ -488,18 +786,20 @@ class AutomatedDualTrader:
         # Atomic write: write to temp file, then rename
         temp_file = f"{self.state_file}.tmp"
         try:
-            state_json = json.dumps(state, default=str, indent=2)
-            
             # Add checksum
-            checksum = hashlib.sha256(state_json.encode()).hexdigest()
+            checksum = hashlib.sha256(_dump_state(state)).hexdigest()
             state['checksum'] = checksum
             
             # Write to temp file
-            with open(temp_file, 'w') as f:
-                json.dump(state, f, default=str, indent=2)
+            with open(temp_file, 'wb') as f:
+                f.write(_dump_state(state))
             
             # Atomic rename
-            shutil.move(temp_file, self.state_file)
+            os.replace(temp_file, self.state_file)
+            
+            # Snapshot now covers every logged event
+            if getattr(self, '_events_fh', None) is not None:
+                self._events_fh.truncate(0)
             
             # Keep backup of last 3 states
             backup_file = f"{self.state_file}.backup"
@@ -507,7 +807,7 @@ class AutomatedDualTrader:
                 shutil.copy2(self.state_file, backup_file)
                 
         except Exception as e:
-            print(f"⚠️ Error saving state: {e}")
+            logger.warning("⚠️ Error saving state: %s", e)
             if os.path.exists(temp_file):
                 os.remove(temp_file)
     
@@ -515,43 +815,44 @@ class AutomatedDualTrader:
         """Load previous state if exists, with validation and backup recovery."""
         try:
             if os.path.exists(self.state_file):
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    
-                    # Validate checksum if present
-                    stored_checksum = state.pop('checksum', None)
-                    if stored_checksum:
-                        state_json = json.dumps({k: v for k, v in state.items() if k != 'checksum'}, default=str, indent=2)
-                        calculated_checksum = hashlib.sha256(state_json.encode()).hexdigest()
-                        
-                        if stored_checksum != calculated_checksum:
-                            print("⚠️ State file corrupted, attempting backup recovery...")
-                            backup_file = f"{self.state_file}.backup"
-                            if os.path.exists(backup_file):
-                                shutil.copy2(backup_file, self.state_file)
-                                with open(self.state_file, 'r') as f:
-                                    state = json.load(f)
-                                    print("✅ Recovered from backup")
-                            else:
-                                raise Exception("Checksum mismatch and no backup available")
-                    
-                    self.account_balance = state.get('account_balance', self.starting_balance)
-                    self.positions = state.get('positions', {'conservative': [], 'aggressive': []})
-                    self.stats = state.get('stats', self.stats)
-                    self.trade_history = state.get('trade_history', [])
-                    self.last_startup_notification = state.get('last_startup_notification')
-                    self.last_market_open_notification = state.get('last_market_open_notification')
-                    
-                    # Check for open positions
-                    open_positions = len([p for p in self.positions['conservative'] if p.get('status') == 'open']) + \
-                                   len([p for p in self.positions['aggressive'] if p.get('status') == 'open'])
+                state = _read_state(self.state_file)
+                # Validate checksum if present
+                stored_checksum = state.pop('checksum', None)
+                if stored_checksum:
+                    if not _state_checksum_matches(state, stored_checksum):
+                        logger.warning("⚠️ State file corrupted, attempting backup recovery...")
+                        backup_file = f"{self.state_file}.backup"
+                        if os.path.exists(backup_file):
+                            shutil.copy2(backup_file, self.state_file)
+                            state = _read_state(self.state_file)
+                            logger.info("✅ Recovered from backup")
+                        else:
+                            raise Exception("Checksum mismatch and no backup available")
+                
+                self.account_balance = state.get('account_balance', self.starting_balance)
+                self.positions = state.get('positions', {'conservative': [], 'aggressive': []})
+                self.stats = state.get('stats', self.stats)
+                self.trade_history = state.get('trade_history', [])
+                self.last_startup_notification = state.get('last_startup_notification')
+                self.last_market_open_notification = state.get('last_market_open_notification')
+                if 'closed_file' in state:
+                    # Snapshot holds open positions and recent trades only
+                    self.trade_history = []
+                    self._load_closed()
+                else:
+                    self._migrate_closed()
+                self._replay_events(state.get('last_updated'))
+                
+                # Check for open positions
+                open_positions = len([p for p in self.positions['conservative'] if p.get('status') == 'open']) + \
+                               len([p for p in self.positions['aggressive'] if p.get('status') == 'open'])
+                
+                logger.info("✅ State loaded - Balance: $%.2f, Trades: %d", self.account_balance, len(self.trade_history))
+                if open_positions > 0:
+                    logger.warning("⚠️  Found %d open positions - will check for recovery", open_positions)
                     
-                    print(f"✅ State loaded - Balance: ${self.account_balance:.2f}, Trades: {len(self.trade_history)}")
-                    if open_positions > 0:
-                        print(f"⚠️  Found {open_positions} open positions - will check for recovery")
-                        
         except Exception as e:
-            print(f"⚠️ Could not load state: {e}")
+            logger.warning("⚠️ Could not load state: %s", e)
     
     def recover_positions_after_restart(self):
         """
@@ -564,9 +865,9 @@ class AutomatedDualTrader:
             if not positions_to_recover:
                 continue
             
-            print(f"\n{'='*70}")
-            print(f"🔄 POSITION RECOVERY: {len(positions_to_recover)} {strategy} positions found")
-            print(f"{'='*70}")
+            logger.info("=" * 70)
+            logger.info("🔄 POSITION RECOVERY: %d %s positions found", len(positions_to_recover), strategy)
+            logger.info("=" * 70)
             
             for position in positions_to_recover:
                 try:
@@ -574,19 +875,19 @@ class AutomatedDualTrader:
                     entry_time = datetime.fromisoformat(position['entry_time']) if isinstance(position['entry_time'], str) else position['entry_time']
                     time_held = (datetime.now() - entry_time).seconds / 60
                     
-                    print(f"\nEvaluating {symbol} {position['direction']} position:")
-                    print(f"  Entry: {entry_time.strftime('%I:%M %p')}")
-                    print(f"  Time held: {time_held:.0f} minutes")
-                    print(f"  Target: ${position['target_price']:.2f}")
+                    logger.info("Evaluating %s %s position:", symbol, position['direction'])
+                    logger.info("  Entry: %s", entry_time.strftime('%I:%M %p'))
+                    logger.info("  Time held: %.0f minutes", time_held)
+                    logger.info("  Target: $%.2f", position['target_price'])
                     
                     # Get current price
                     df = self.get_recent_bars(symbol)
                     if len(df) == 0:
-                        print(f"  ⚠️  Cannot fetch current price - will monitor on next loop")
+                        logger.warning("  ⚠️  Cannot fetch current price - will monitor on next loop")
                         continue
                     
                     current_price = df.iloc[-1]['close']
-                    print(f"  Current: ${current_price:.2f}")
+                    logger.info("  Current: $%.2f", current_price)
                     
                     # Check exit conditions
                     should_exit = False
@@ -611,7 +912,7 @@ class AutomatedDualTrader:
                         exit_reason = "Position too old (likely expired)"
                     
                     if should_exit:
-                        print(f"  ✅ EXITING: {exit_reason}")
+                        logger.info("  ✅ EXITING: %s", exit_reason)
                         
                         # Fetch current option value
                         option_data = self.options_fetcher.get_0dte_option_price(
@@ -670,6 +971,7 @@ class AutomatedDualTrader:
                             'exit_time': datetime.now().isoformat(),
                             'recovery_exit': True
                         })
+                        self._log_closed(strategy, position, self.trade_history[-1])
                         
                         # Send notification
                         notifier.send_notification(
@@ -682,13 +984,13 @@ class AutomatedDualTrader:
                             priority=1
                         )
                         
-                        print(f"  💰 P&L: ${pnl:+.2f}")
+                        logger.info("  💰 P&L: $%+.2f", pnl)
                         
                     else:
-                        print(f"  ✅ Position still valid - resuming normal monitoring")
+                        logger.info("  ✅ Position still valid - resuming normal monitoring")
                 
                 except Exception as e:
-                    print(f"  ⚠️  Error recovering position: {e}")
+                    logger.warning("  ⚠️  Error recovering position: %s", e)
                     # Send alert
                     notifier.send_notification(
                         f"⚠️ Position recovery ERROR\n"
@@ -700,7 +1002,7 @@ class AutomatedDualTrader:
                         priority=2
                     )
             
-            print(f"{'='*70}\n")
+            logger.info("=" * 70)
         
         # Save state after recovery
         self.save_state()
@@ -714,7 +1016,7 @@ class AutomatedDualTrader:
         
         self.heartbeat_thread = threading.Thread(target=heartbeat_loop, daemon=True)
         self.heartbeat_thread.start()
-        print("✅ Heartbeat monitoring started (5-second intervals)")
+        logger.info("✅ Heartbeat monitoring started (5-second intervals)")
     
     def start_watchdog(self):
         """Start watchdog thread that terminates if main loop stalls >60 seconds."""
@@ -722,21 +1024,135 @@ class AutomatedDualTrader:
             while self.running:
                 time_since_loop = (datetime.now() - self.main_loop_timestamp).seconds
                 if time_since_loop > 60:
-                    print(f"\n🚨 WATCHDOG: Main loop stalled for {time_since_loop}s - terminating!")
+                    logger.error("🚨 WATCHDOG: Main loop stalled for %ss - terminating!", time_since_loop)
+                    # Send inline: os._exit skips atexit, so a queued alert would never go out
                     notifier.send_notification(
                         f"🚨 WATCHDOG ALERT\n"
                         f"Main loop stalled for {time_since_loop} seconds\n"
                         f"System terminating for restart\n"
                         f"Supervisor should auto-restart",
                         title="Watchdog Triggered",
-                        priority=2
+                        priority=2,
+                        wait=True
                     )
                     os._exit(1)  # Force exit
                 time.sleep(10)
         
         self.watchdog_thread = threading.Thread(target=watchdog_loop, daemon=True)
         self.watchdog_thread.start()
-        print("✅ Watchdog started (60-second stall detection)")
+        logger.info("✅ Watchdog started (60-second stall detection)")
+    
+    def latest_trade_price(self, symbol: str, max_age_s: float = 60.0) -> Optional[float]:
+        """
+        Most recent streamed trade price for a symbol.
+        
+        Args:
+            symbol: Stock symbol
+            max_age_s: Ignore trades executed longer ago than this (exchange time)
+            
+        Returns:
+            Price, or None if the stream has nothing recent
+        """
+        count = self.trade_count.get(symbol, 0)
+        if count == 0:
+            return None
+        last = self.trade_ring[symbol][(count - 1) % TRADE_RING_SIZE]
+        if time.time() - last['t'] > max_age_s:
+            return None
+        return float(last['px'])
+    
+    def _handle_trades(self, msgs):
+        """
+        Trade stream callback: record prints and hand exits to the exit worker.
+        
+        Runs on the stream thread, so it never takes exit_lock or waits on a
+        REST quote; only the latest print per symbol is passed on.
+        
+        Args:
+            msgs: Batch of stream messages (trades carry symbol and price)
+        """
+        symbol_prices = {}
+        for msg in msgs:
+            price = getattr(msg, 'price', None)
+            if price is None:
+                continue
+            symbol_prices[msg.symbol] = price
+            ring = self.trade_ring.get(msg.symbol)
+            if ring is not None and msg.timestamp is not None:
+                # Exchange time (ms), so delayed prints fail the freshness check;
+                # fill the slot before publishing it through the count
+                ring[self.trade_count[msg.symbol] % TRADE_RING_SIZE] = (msg.timestamp / 1000, price)
+                self.trade_count[msg.symbol] += 1
+        if not symbol_prices:
+            return
+        if not (self._open['conservative']['meta'] or self._open['aggressive']['meta']):
+            return
+        with self._stream_lock:
+            self._stream_prices.update(symbol_prices)
+        self._stream_event.set()
+    
+    def _drain_stream_exits(self):
+        """Check exits against the latest streamed prices (exit worker thread)."""
+        with self._stream_lock:
+            symbol_prices, self._stream_prices = self._stream_prices, {}
+        if symbol_prices:
+            with self.exit_lock:
+                self.check_exits(symbol_prices)
+    
+    def start_trade_stream(self):
+        """
+        Start a Polygon trade stream thread that checks exits on every print.
+        
+        Exits no longer wait for the next polling cycle; the main loop still
+        handles signals and serves as the fallback if the stream drops.
+        Exit checks run on a separate worker so slow quotes never stall the stream.
+        """
+        try:
+            from polygon import WebSocketClient
+        except ImportError:
+            logger.warning("⚠️  polygon WebSocket client not installed - exits checked on polling cycle only")
+            return
+        
+        api_key = os.getenv('POLYGON_API_KEY')
+        if not api_key:
+            logger.warning("⚠️  POLYGON_API_KEY not set - exits checked on polling cycle only")
+            return
+        
+        # Real-time by default; a delayed feed only when configured explicitly
+        feed = os.getenv('POLYGON_FEED', 'socket.polygon.io')
+        if 'delayed' in feed:
+            logger.warning("⚠️  POLYGON_FEED=%s - stream exits run on delayed (~15 min old) trades", feed)
+        
+        client = WebSocketClient(
+            api_key=api_key,
+            feed=feed,
+            market='stocks',
+            subscriptions=[f"T.{symbol}" for symbol in self.symbols]
+        )
+        
+        def stream_loop():
+            while self.running:
+                try:
+                    client.run(self._handle_trades)
+                except Exception as e:
+                    logger.warning("⚠️  Trade stream error: %s - reconnecting in 5s", e)
+                time.sleep(5)
+        
+        def exit_loop():
+            while self.running:
+                if not self._stream_event.wait(timeout=1.0):
+                    continue
+                self._stream_event.clear()
+                try:
+                    self._drain_stream_exits()
+                except Exception as e:
+                    logger.error("❌ Stream exit check failed: %s", e)
+        
+        self.exit_worker_thread = threading.Thread(target=exit_loop, daemon=True)
+        self.exit_worker_thread.start()
+        self.trade_stream_thread = threading.Thread(target=stream_loop, daemon=True)
+        self.trade_stream_thread.start()
+        logger.info("✅ Trade stream started (%s exits checked per trade)", ', '.join(self.symbols))
     
     def get_status(self) -> Dict:
         """Get current status for dashboard."""
@@ -774,6 +1190,7 @@ class AutomatedDualTrader:
         # Start reliability monitoring
         self.running = True
         self.start_heartbeat()
+        self.start_trade_stream()
         # Watchdog disabled - causes more problems than it solves (spam notifications, false kills)
         # self.start_watchdog()
         
@@ -793,7 +1210,7 @@ class AutomatedDualTrader:
             self.last_startup_notification = today
             self.save_state()
         else:
-            print(f"⚠️  Startup notification already sent today ({today}), skipping...")
+            logger.warning("⚠️  Startup notification already sent today (%s), skipping...", today)
         
         trading_session_active = False
         last_status_print = None
@@ -811,24 +1228,29 @@ class AutomatedDualTrader:
                 now = datetime.now(et)
                 if not trading_session_active:
                     if last_status_print is None or (now - last_status_print).total_seconds() >= 300:
-                        print(f"[{now.strftime('%I:%M:%S %p ET')}] {market_status}")
+                        logger.info("[%s] %s", now.strftime('%I:%M:%S %p ET'), market_status)
                         last_status_print = now
                 
                 # Should we stop trading?
                 if should_stop and trading_session_active:
-                    print(f"\n⏰ Market closed - Stopping trading session at {now.strftime('%H:%M:%S')}")
+                    logger.info("⏰ Market closed - Stopping trading session at %s", now.strftime('%H:%M:%S'))
                     
                     # Close any remaining positions
                     if len(self.positions['conservative']) > 0 or len(self.positions['aggressive']) > 0:
-                        print("🔄 Closing all remaining positions at market close...")
+                        logger.info("🔄 Closing all remaining positions at market close...")
                         # Get prices for all symbols
                         symbol_prices = {}
                         for symbol in self.symbols:
+                            streamed = self.latest_trade_price(symbol)
+                            if streamed is not None:
+                                symbol_prices[symbol] = streamed
+                                continue
                             df = self.get_recent_bars(symbol)
                             if len(df) > 0:
                                 symbol_prices[symbol] = df.iloc[-1]['close']
                         if symbol_prices:
-                            self.check_exits(symbol_prices)
+                            with self.exit_lock:
+                                self.check_exits(symbol_prices)
                     
                     self.save_state()
                     notifier.send_notification(
@@ -842,8 +1264,8 @@ class AutomatedDualTrader:
                 
                 # Should we start trading?
                 if should_trade and not trading_session_active:
-                    print(f"\n🚀 Market open - Starting trading session at {now.strftime('%H:%M:%S')}")
-                    print(f"   {market_status}")
+                    logger.info("🚀 Market open - Starting trading session at %s", now.strftime('%H:%M:%S'))
+                    logger.info("   %s", market_status)
                     
                     # Only send notification if we haven't already sent it today
                     today = now.date().isoformat()
@@ -856,7 +1278,7 @@ class AutomatedDualTrader:
                         self.last_market_open_notification = today
                         self.save_state()
                     else:
-                        print(f"   ⚠️  Market open notification already sent today, skipping...")
+                        logger.warning("   ⚠️  Market open notification already sent today, skipping...")
                     
                     trading_session_active = True
                 
@@ -872,15 +1294,19 @@ class AutomatedDualTrader:
                 symbol_data = {}
                 symbol_prices = {}
                 for symbol in self.symbols:
-                    print(f"   Fetching {symbol} bars...")
+                    logger.debug("   Fetching %s bars...", symbol)
                     df = self.get_recent_bars(symbol)
                     if len(df) > 0:
                         symbol_data[symbol] = df
                         symbol_prices[symbol] = df.iloc[-1]['close']
-                        print(f"   ✓ Got {len(df)} bars for {symbol}")
+                        logger.debug("   ✓ Got %d bars for %s", len(df), symbol)
+                        # Exit checks prefer the streamed last trade over the last bar close
+                        streamed = self.latest_trade_price(symbol)
+                        if streamed is not None:
+                            symbol_prices[symbol] = streamed
                 
                 if not symbol_data:
-                    print("No data available for any symbol, retrying...")
+                    logger.info("No data available for any symbol, retrying...")
                     time.sleep(check_interval)
                     continue
                 
@@ -888,7 +1314,8 @@ class AutomatedDualTrader:
                 
                 # Check for exits first (using prices from all symbols)
                 if symbol_prices:
-                    self.check_exits(symbol_prices)
+                    with self.exit_lock:
+                        self.check_exits(symbol_prices)
                 
                 # Check for new signals across ALL symbols
                 all_signals = []
@@ -904,27 +1331,28 @@ class AutomatedDualTrader:
                     has_open_aggressive = any(p['status'] == 'open' for p in self.positions['aggressive'])
                     
                     if has_open_conservative or has_open_aggressive:
-                        print(f"⏭️  {signal['symbol']} signal skipped - existing position(s) open (conservative: {has_open_conservative}, aggressive: {has_open_aggressive})")
+                        logger.info("⏭️  %s signal skipped - existing position(s) open (conservative: %s, aggressive: %s)", signal['symbol'], has_open_conservative, has_open_aggressive)
                         continue
                     
-                    print(f"\n🎯 SIGNAL ({signal['symbol']}): {signal['direction']} @ ${signal['price']:.2f}, target ${signal['target']:.2f}")
+                    logger.info("🎯 SIGNAL (%s): %s @ $%.2f, target $%.2f", signal['symbol'], signal['direction'], signal['price'], signal['target'])
                     
-                    # Execute both strategies
-                    self.execute_conservative(signal, balance)
-                    self.execute_aggressive(signal, balance)
+                    # Execute both strategies off one option quote
+                    option_data = self.fetch_entry_option(signal)
+                    with self.exit_lock:
+                        self.execute_conservative(signal, balance, option_data)
+                        self.execute_aggressive(signal, balance, option_data)
                     
                     self.save_state()
                     break  # Only take first signal (respects position limit)
                 
-                # Status update with all symbol prices
-                status = self.get_status()
-                price_str = " | ".join([f"{sym}: ${price:.2f}" for sym, price in symbol_prices.items()])
-                import pytz
-                et_now = datetime.now(pytz.timezone('America/New_York'))
-                print(f"[{et_now.strftime('%I:%M:%S %p ET')}] "
-                      f"{price_str} | "
-                      f"Conservative: {status['conservative']['active_positions']} open | "
-                      f"Aggressive: {status['aggressive']['active_positions']} open")
+                # Status update with all symbol prices (built only if it will be emitted)
+                if logger.isEnabledFor(logging.INFO):
+                    status = self.get_status()
+                    price_str = " | ".join([f"{sym}: ${price:.2f}" for sym, price in symbol_prices.items()])
+                    logger.info("[%s] %s | Conservative: %d open | Aggressive: %d open",
+                                now.strftime('%I:%M:%S %p ET'), price_str,
+                                status['conservative']['active_positions'],
+                                status['aggressive']['active_positions'])
                 
                 # Save state regularly so dashboard knows we're alive
                 self.save_state()
@@ -932,14 +1360,14 @@ class AutomatedDualTrader:
                 time.sleep(check_interval)
                 
             except KeyboardInterrupt:
-                print("\n\n🛑 Trader stopped by user")
+                logger.info("🛑 Trader stopped by user")
                 self.save_state()
                 break
             except Exception as e:
                 import traceback
                 error_details = traceback.format_exc()
-                print(f"❌ Error: {e}")
-                print(f"❌ Full traceback:\n{error_details}")
+                logger.error("❌ Error: %s", e)
+                logger.error("❌ Full traceback:\n%s", error_details)
                 notifier.send_notification(
                     f"Error in trading loop:\n{str(e)[:200]}",
                     title="⚠️ Trader Error",
@@ -949,5 +1377,7 @@ class AutomatedDualTrader:
 
 
 if __name__ == '__main__':
+    log_listener = start_log_listener()
+    atexit.register(log_listener.stop)
     trader = AutomatedDualTrader()
     trader.run(check_interval=60)
@@ -10,6 +10,8 @@ from typing import Optional
 import pandas as pd
 import os
 
+from engine.frame_cache import cached
+
 
 class DataProvider(ABC):
     """Abstract base class for data providers."""
@@ -29,16 +31,20 @@ class DataProvider(ABC):
 class CSVDataProvider(DataProvider):
     """CSV-based data provider for backtesting."""
     
-    def __init__(self, path: str, symbol: str = "QQQ"):
+    def __init__(self, path: str, symbol: str = "QQQ", cache_dir: Optional[str] = None):
         """
         Initialize CSV data provider.
         
         Args:
             path: Path to CSV file
             symbol: Symbol name (default: QQQ)
+            cache_dir: If set, keep the parsed bars in this on-disk cache
+                (Parquet when pyarrow is installed) and skip the CSV parse
+                until the file or the parsing code changes
         """
         self.path = path
         self.symbol = symbol
+        self.cache_dir = cache_dir
         
     def load_bars(self) -> pd.DataFrame:
         """
@@ -53,7 +59,15 @@ class CSVDataProvider(DataProvider):
         """
         if not os.path.exists(self.path):
             raise FileNotFoundError(f"Data file not found: {self.path}")
-            
+        
+        if self.cache_dir is not None:
+            # Keyed on this module's source too, so parsing changes reparse the CSV
+            return cached('bars', ('csv',), self._read_csv, self.path, self.cache_dir,
+                          code=(CSVDataProvider,))
+        return self._read_csv()
+    
+    def _read_csv(self) -> pd.DataFrame:
+        """Parse and clean the CSV (uncached)."""
         df = pd.read_csv(self.path)
         
         required_columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
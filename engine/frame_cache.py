@@ -0,0 +1,139 @@
+"""
+On-disk cache for intermediate DataFrames in backtest scripts.
+
+Resampled frames, Renko bricks, regimes and ICT structures are pure
+functions of the source CSV, a few parameters and the code that builds
+them, so reruns can load them from disk instead of recomputing. Entries
+are keyed by the source file's mtime, the step parameters and the source
+of the producing modules, and stored as Parquet when pyarrow is
+installed, otherwise as pickle.
+"""
+
+import hashlib
+import inspect
+import os
+from typing import Any, Callable, Dict, Iterable, Union
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+DEFAULT_CACHE_DIR = 'cache'
+_SERIES_COLUMN = '__series__'
+_module_digests: Dict[str, str] = {}
+
+
+def code_fingerprint(code: Iterable[Any]) -> str:
+    """
+    Fingerprint the source of the modules defining the given objects.
+
+    Args:
+        code: Functions/classes/modules whose module source shapes the result
+
+    Returns:
+        Hex digest that changes whenever any of those modules is edited
+    """
+    digests = []
+    for obj in code:
+        module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+        name = module.__name__
+        if name not in _module_digests:
+            try:
+                source = inspect.getsource(module).encode()
+            except (OSError, TypeError):
+                # No source on disk (e.g., frozen module): fall back to the file's mtime
+                source = str(os.stat(module.__file__).st_mtime_ns).encode()
+            _module_digests[name] = hashlib.blake2b(source, digest_size=8).hexdigest()
+        digests.append(f"{name}:{_module_digests[name]}")
+    return ','.join(sorted(set(digests)))
+
+
+def cache_key(source_path: str, params: Any, code: Iterable[Any] = ()) -> str:
+    """
+    Build a cache key from the source file's mtime, step parameters and code.
+
+    Args:
+        source_path: Path to the raw input file (e.g., 1-min CSV)
+        params: Any value with a stable repr (tuple/dict of step parameters)
+        code: Functions/classes/modules that produce the result (see code_fingerprint)
+
+    Returns:
+        Hex digest identifying this (input, params, code) combination
+    """
+    mtime_ns = os.stat(source_path).st_mtime_ns
+    raw = f"{os.path.abspath(source_path)}|{mtime_ns}|{params!r}|{code_fingerprint(code)}".encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def cached(
+    name: str,
+    params: Any,
+    fn: Callable[[], Union[pd.DataFrame, pd.Series]],
+    source_path: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    code: Iterable[Any] = ()
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Return fn() from the disk cache, computing and storing it on a miss.
+
+    Args:
+        name: Step name used in the cache file name (e.g., 'df_4h')
+        params: Parameters that affect the result; part of the cache key
+        fn: Zero-argument callable producing the DataFrame or Series
+        source_path: Raw input file whose mtime invalidates the cache
+        cache_dir: Directory for cache files (default: 'cache')
+        code: Functions/classes/modules that produce the result, including
+            upstream steps; editing any of their modules invalidates the entry
+
+    Returns:
+        Cached or freshly computed DataFrame/Series
+    """
+    key = cache_key(source_path, params, code)
+    ext = 'parquet' if HAS_PYARROW else 'pkl'
+    path = os.path.join(cache_dir, f"{name}_{key}.{ext}")
+
+    if os.path.exists(path):
+        try:
+            return _read(path)
+        except Exception:
+            # Corrupt or incompatible entry: fall through and rebuild it
+            pass
+
+    result = fn()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        _write(result, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Caching is best-effort (e.g., object columns Parquet can't store)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return result
+
+
+def _write(obj: Union[pd.DataFrame, pd.Series], path: str) -> None:
+    if not HAS_PYARROW:
+        obj.to_pickle(path)
+        return
+
+    if isinstance(obj, pd.Series):
+        obj = obj.to_frame(name=_SERIES_COLUMN)
+    obj.to_parquet(path, engine='pyarrow', compression='zstd')
+
+
+def _read(path: str) -> Union[pd.DataFrame, pd.Series]:
+    if path.endswith('.pkl'):
+        return pd.read_pickle(path)
+
+    df = pd.read_parquet(path, engine='pyarrow')
+    if list(df.columns) == [_SERIES_COLUMN]:
+        return df[_SERIES_COLUMN].rename(None)
+    return df
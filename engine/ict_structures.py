@@ -12,8 +12,10 @@ Implements detection for:
 import pandas as pd
 import numpy as np
 
+from engine._njit import njit, HAS_NUMBA
 
-def detect_liquidity_sweeps(df: pd.DataFrame) -> pd.DataFrame:
+
+def detect_liquidity_sweeps(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Detect liquidity sweeps of Asia or London session highs/lows.
     
@@ -27,6 +29,7 @@ def detect_liquidity_sweeps(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df: DataFrame with asia_high, asia_low, london_high, london_low columns
+        copy: Work on a copy (False adds the columns to df itself)
         
     Returns:
         pd.DataFrame: DataFrame with added columns:
@@ -34,32 +37,69 @@ def detect_liquidity_sweeps(df: pd.DataFrame) -> pd.DataFrame:
             - sweep_bearish (bool)
             - sweep_source (str: 'asia', 'london', or None)
     """
-    df = df.copy()
-    
-    df['sweep_bullish'] = False
-    df['sweep_bearish'] = False
-    df['sweep_source'] = None
-    
-    for idx in df.index:
-        row = df.loc[idx]
-        
-        if pd.notna(row['asia_low']) and row['low'] < row['asia_low'] and row['close'] > row['asia_low']:
-            df.at[idx, 'sweep_bullish'] = True
-            df.at[idx, 'sweep_source'] = 'asia'
-        elif pd.notna(row['london_low']) and row['low'] < row['london_low'] and row['close'] > row['london_low']:
-            df.at[idx, 'sweep_bullish'] = True
-            df.at[idx, 'sweep_source'] = 'london'
-        
-        if pd.notna(row['asia_high']) and row['high'] > row['asia_high'] and row['close'] < row['asia_high']:
-            df.at[idx, 'sweep_bearish'] = True
-            df.at[idx, 'sweep_source'] = 'asia'
-        elif pd.notna(row['london_high']) and row['high'] > row['london_high'] and row['close'] < row['london_high']:
-            df.at[idx, 'sweep_bearish'] = True
-            df.at[idx, 'sweep_source'] = 'london'
+    if copy:
+        df = df.copy()
+    
+    low = df['low'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    asia_low = df['asia_low'].to_numpy(dtype=np.float64)
+    london_low = df['london_low'].to_numpy(dtype=np.float64)
+    asia_high = df['asia_high'].to_numpy(dtype=np.float64)
+    london_high = df['london_high'].to_numpy(dtype=np.float64)
+    
+    # Asia takes precedence over London; NaN levels never compare true
+    bull_asia = (low < asia_low) & (close > asia_low)
+    bull_london = ~bull_asia & (low < london_low) & (close > london_low)
+    bear_asia = (high > asia_high) & (close < asia_high)
+    bear_london = ~bear_asia & (high > london_high) & (close < london_high)
+    
+    # A bearish sweep's source overrides a bullish one on the same bar
+    source = np.full(len(df), None, dtype=object)
+    source[bull_asia] = 'asia'
+    source[bull_london] = 'london'
+    source[bear_asia] = 'asia'
+    source[bear_london] = 'london'
+    
+    df['sweep_bullish'] = bull_asia | bull_london
+    df['sweep_bearish'] = bear_asia | bear_london
+    df['sweep_source'] = source
     
     return df
 
 
+@njit(cache=True)
+def _atr_loop(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """
+    True range and its simple moving average in one fused pass.
+    
+    The first bar's true range is high - low; ATR is NaN until a full
+    window is available (same as tr.rolling(period).mean()). Only the
+    last `period` true ranges are kept, in a ring buffer.
+    """
+    n = len(high)
+    atr = np.full(n, np.nan)
+    window = np.empty(period)
+    for i in range(n):
+        t = high[i] - low[i]
+        if i > 0:
+            # NaN-skipping max, like DataFrame.max(axis=1)
+            up = abs(high[i] - close[i - 1])
+            down = abs(low[i] - close[i - 1])
+            if t != t or up > t:
+                t = up
+            if t != t or down > t:
+                t = down
+        window[i % period] = t
+        if i >= period - 1:
+            # Oldest to newest, the same summation order as a rolling mean
+            total = 0.0
+            for k in range(i + 1, i + 1 + period):
+                total += window[k % period]
+            atr[i] = total / period
+    return atr
+
+
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
     Calculate Average True Range (ATR).
@@ -71,6 +111,16 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         pd.Series: ATR values
     """
+    if HAS_NUMBA:
+        # Compiled fused pass; the plain-Python loop is slower than pandas on full backtest frames
+        atr_result = _atr_loop(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            period
+        )
+        return pd.Series(atr_result, index=df.index)
+    
     high = df['high']
     low = df['low']
     close = df['close']
@@ -86,7 +136,8 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     return atr_result
 
 
-def detect_displacement(df: pd.DataFrame, atr_period: int = 14, threshold: float = 1.2) -> pd.DataFrame:
+def detect_displacement(df: pd.DataFrame, atr_period: int = 14, threshold: float = 1.2,
+                        copy: bool = True) -> pd.DataFrame:
     """
     Detect displacement candles using ATR with directional logic.
     
@@ -104,6 +155,7 @@ def detect_displacement(df: pd.DataFrame, atr_period: int = 14, threshold: float
         df: DataFrame with OHLC data
         atr_period: ATR period (default: 14)
         threshold: ATR multiplier for displacement (default: 1.2)
+        copy: Work on a copy (False adds the columns to df itself)
         
     Returns:
         pd.DataFrame: DataFrame with added columns:
@@ -111,7 +163,8 @@ def detect_displacement(df: pd.DataFrame, atr_period: int = 14, threshold: float
             - displacement_bearish (bool)
             - atr (float)
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     
     df['atr'] = calculate_atr(df, period=atr_period)
     
@@ -130,12 +183,12 @@ def detect_displacement(df: pd.DataFrame, atr_period: int = 14, threshold: float
         (df['close'] < df['prev_low'])
     )
     
-    df = df.drop(['prev_high', 'prev_low'], axis=1)
+    df.drop(columns=['prev_high', 'prev_low'], inplace=True)
     
     return df
 
 
-def detect_fvgs(df: pd.DataFrame) -> pd.DataFrame:
+def detect_fvgs(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Detect Fair Value Gaps (FVG) using 3-candle logic.
     
@@ -144,6 +197,7 @@ def detect_fvgs(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df: DataFrame with OHLC data
+        copy: Work on a copy (False resets df's index and adds the columns in place)
         
     Returns:
         pd.DataFrame: DataFrame with added columns:
@@ -152,28 +206,64 @@ def detect_fvgs(df: pd.DataFrame) -> pd.DataFrame:
             - fvg_low (float)
             - fvg_high (float)
     """
-    df = df.copy().reset_index(drop=True)
-    
-    df['fvg_bullish'] = False
-    df['fvg_bearish'] = False
-    df['fvg_low'] = np.nan
-    df['fvg_high'] = np.nan
-    
-    for i in range(2, len(df)):
-        if df.iloc[i]['low'] > df.iloc[i-2]['high']:
-            df.at[i, 'fvg_bullish'] = True
-            df.at[i, 'fvg_low'] = df.iloc[i-2]['high']
-            df.at[i, 'fvg_high'] = df.iloc[i]['low']
+    if copy:
+        df = df.copy()
+    df.reset_index(drop=True, inplace=True)
+    
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    n = len(df)
+    
+    fvg_bullish = np.zeros(n, dtype=bool)
+    fvg_bearish = np.zeros(n, dtype=bool)
+    fvg_low = np.full(n, np.nan)
+    fvg_high = np.full(n, np.nan)
+    
+    if n > 2:
+        fvg_bullish[2:] = low[2:] > high[:-2]
+        fvg_bearish[2:] = high[2:] < low[:-2]
         
-        if df.iloc[i]['high'] < df.iloc[i-2]['low']:
-            df.at[i, 'fvg_bearish'] = True
-            df.at[i, 'fvg_low'] = df.iloc[i]['high']
-            df.at[i, 'fvg_high'] = df.iloc[i-2]['low']
+        # Bearish bounds win where both fire (only possible on malformed bars)
+        bull = np.flatnonzero(fvg_bullish)
+        fvg_low[bull] = high[bull - 2]
+        fvg_high[bull] = low[bull]
+        bear = np.flatnonzero(fvg_bearish)
+        fvg_low[bear] = high[bear]
+        fvg_high[bear] = low[bear - 2]
+    
+    df['fvg_bullish'] = fvg_bullish
+    df['fvg_bearish'] = fvg_bearish
+    df['fvg_low'] = fvg_low
+    df['fvg_high'] = fvg_high
     
     return df
 
 
-def detect_mss(df: pd.DataFrame) -> pd.DataFrame:
+@njit(cache=True)
+def _mss_loop(above_swing_high: np.ndarray, below_swing_low: np.ndarray):
+    """
+    Market-structure state machine over precomputed break conditions.
+    
+    A break only counts as a shift if the previous bar did not already
+    shift the same way; a bar that shifts both ways ends bearish.
+    """
+    n = len(above_swing_high)
+    mss_bullish = np.zeros(n, dtype=np.bool_)
+    mss_bearish = np.zeros(n, dtype=np.bool_)
+    prev = 0  # -1 bearish, 0 neutral, 1 bullish
+    for i in range(n):
+        state = 0
+        if above_swing_high[i] and prev != 1:
+            mss_bullish[i] = True
+            state = 1
+        if below_swing_low[i] and prev != -1:
+            mss_bearish[i] = True
+            state = -1
+        prev = state
+    return mss_bullish, mss_bearish
+
+
+def detect_mss(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Detect Market Structure Shifts (MSS).
     
@@ -185,68 +275,49 @@ def detect_mss(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df: DataFrame with OHLC data
+        copy: Work on a copy (False resets df's index and adds the columns in place)
         
     Returns:
         pd.DataFrame: DataFrame with added columns:
             - mss_bullish (bool)
             - mss_bearish (bool)
     """
-    df = df.copy().reset_index(drop=True)
-    
-    df['swing_high'] = False
-    df['swing_low'] = False
-    df['swing_high_price'] = np.nan
-    df['swing_low_price'] = np.nan
-    
-    for i in range(2, len(df) - 2):
+    if copy:
+        df = df.copy()
+    df.reset_index(drop=True, inplace=True)
+    
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    n = len(df)
+    
+    # Swing points: strictly beyond the two bars on each side
+    swing_high_price = np.full(n, np.nan)
+    swing_low_price = np.full(n, np.nan)
+    if n > 4:
+        mid = slice(2, n - 2)
         is_swing_high = (
-            (df.iloc[i]['high'] > df.iloc[i-1]['high']) and
-            (df.iloc[i]['high'] > df.iloc[i-2]['high']) and
-            (df.iloc[i]['high'] > df.iloc[i+1]['high']) and
-            (df.iloc[i]['high'] > df.iloc[i+2]['high'])
+            (high[mid] > high[1:n - 3]) & (high[mid] > high[0:n - 4]) &
+            (high[mid] > high[3:n - 1]) & (high[mid] > high[4:n])
         )
-        
         is_swing_low = (
-            (df.iloc[i]['low'] < df.iloc[i-1]['low']) and
-            (df.iloc[i]['low'] < df.iloc[i-2]['low']) and
-            (df.iloc[i]['low'] < df.iloc[i+1]['low']) and
-            (df.iloc[i]['low'] < df.iloc[i+2]['low'])
+            (low[mid] < low[1:n - 3]) & (low[mid] < low[0:n - 4]) &
+            (low[mid] < low[3:n - 1]) & (low[mid] < low[4:n])
         )
-        
-        if is_swing_high:
-            df.at[i, 'swing_high'] = True
-            df.at[i, 'swing_high_price'] = df.loc[i, 'high']
-        
-        if is_swing_low:
-            df.at[i, 'swing_low'] = True
-            df.at[i, 'swing_low_price'] = df.loc[i, 'low']
-    
-    df['last_swing_high'] = df['swing_high_price'].ffill()
-    df['last_swing_low'] = df['swing_low_price'].ffill()
+        swing_high_price[2:n - 2] = np.where(is_swing_high, high[mid], np.nan)
+        swing_low_price[2:n - 2] = np.where(is_swing_low, low[mid], np.nan)
     
-    df['mss_bullish'] = False
-    df['mss_bearish'] = False
+    last_swing_high = pd.Series(swing_high_price).ffill().to_numpy()
+    last_swing_low = pd.Series(swing_low_price).ffill().to_numpy()
     
-    df['structure'] = 'neutral'
-    
-    for i in range(len(df)):
-        if pd.notna(df.loc[i, 'last_swing_high']) and df.loc[i, 'close'] > df.loc[i, 'last_swing_high']:
-            if df.loc[i-1 if i > 0 else i, 'structure'] in ['bearish', 'neutral']:
-                df.at[i, 'mss_bullish'] = True
-                df.at[i, 'structure'] = 'bullish'
-        
-        if pd.notna(df.loc[i, 'last_swing_low']) and df.loc[i, 'close'] < df.loc[i, 'last_swing_low']:
-            if df.loc[i-1 if i > 0 else i, 'structure'] in ['bullish', 'neutral']:
-                df.at[i, 'mss_bearish'] = True
-                df.at[i, 'structure'] = 'bearish'
-    
-    df = df.drop(['swing_high', 'swing_low', 'swing_high_price', 'swing_low_price', 
-                  'last_swing_high', 'last_swing_low', 'structure'], axis=1)
+    mss_bullish, mss_bearish = _mss_loop(close > last_swing_high, close < last_swing_low)
+    df['mss_bullish'] = mss_bullish
+    df['mss_bearish'] = mss_bearish
     
     return df
 
 
-def detect_order_blocks(df: pd.DataFrame) -> pd.DataFrame:
+def detect_order_blocks(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Detect Order Blocks (OB) - last opposite candle before displacement.
     
@@ -255,6 +326,7 @@ def detect_order_blocks(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df: DataFrame with displacement columns
+        copy: Work on a copy (False adds the columns to df itself)
         
     Returns:
         pd.DataFrame: DataFrame with added columns:
@@ -263,34 +335,44 @@ def detect_order_blocks(df: pd.DataFrame) -> pd.DataFrame:
             - ob_low (float)
             - ob_high (float)
     """
-    df = df.copy()
-    
-    df['ob_bullish'] = False
-    df['ob_bearish'] = False
-    df['ob_low'] = np.nan
-    df['ob_high'] = np.nan
-    
-    df['is_bearish_candle'] = df['close'] < df['open']
-    df['is_bullish_candle'] = df['close'] > df['open']
-    
-    for i in range(1, len(df)):
-        if df.loc[i, 'displacement_bullish']:
-            for j in range(i-1, max(-1, i-20), -1):
-                if df.loc[j, 'is_bearish_candle']:
-                    df.at[i, 'ob_bullish'] = True
-                    df.at[i, 'ob_low'] = df.loc[j, 'low']
-                    df.at[i, 'ob_high'] = df.loc[j, 'high']
-                    break
+    if copy:
+        df = df.copy()
+    
+    open_ = df['open'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    n = len(df)
+    
+    ob_bullish = np.zeros(n, dtype=bool)
+    ob_bearish = np.zeros(n, dtype=bool)
+    ob_low = np.full(n, np.nan)
+    ob_high = np.full(n, np.nan)
+    
+    if n > 1:
+        positions = np.arange(n)
+        # Nearest bearish/bullish candle at or before each bar (-1 if none yet)
+        last_bearish = np.maximum.accumulate(np.where(close < open_, positions, -1))
+        last_bullish = np.maximum.accumulate(np.where(close > open_, positions, -1))
         
-        if df.loc[i, 'displacement_bearish']:
-            for j in range(i-1, max(-1, i-20), -1):
-                if df.loc[j, 'is_bullish_candle']:
-                    df.at[i, 'ob_bearish'] = True
-                    df.at[i, 'ob_low'] = df.loc[j, 'low']
-                    df.at[i, 'ob_high'] = df.loc[j, 'high']
-                    break
-    
-    df = df.drop(['is_bearish_candle', 'is_bullish_candle'], axis=1)
+        # Candidates for bar i are the 19 bars before it
+        i = positions[1:]
+        earliest = np.maximum(0, i - 19)
+        for displaced, last_candle, flag in (
+            (df['displacement_bullish'].to_numpy(dtype=bool)[1:], last_bearish[:-1], ob_bullish),
+            (df['displacement_bearish'].to_numpy(dtype=bool)[1:], last_bullish[:-1], ob_bearish),
+        ):
+            hit = displaced & (last_candle >= earliest)
+            bars = i[hit]
+            flag[bars] = True
+            # Bearish OB bounds overwrite bullish ones on the same bar
+            ob_low[bars] = low[last_candle[hit]]
+            ob_high[bars] = high[last_candle[hit]]
+    
+    df['ob_bullish'] = ob_bullish
+    df['ob_bearish'] = ob_bearish
+    df['ob_low'] = ob_low
+    df['ob_high'] = ob_high
     
     return df
 
@@ -313,10 +395,14 @@ def detect_all_structures(df: pd.DataFrame, displacement_threshold: float = 1.0)
     Returns:
         pd.DataFrame: DataFrame with all ICT structure columns added
     """
-    df = detect_liquidity_sweeps(df)
-    df = detect_displacement(df, atr_period=14, threshold=displacement_threshold)
-    df = detect_fvgs(df)
-    df = detect_mss(df)
-    df = detect_order_blocks(df)
+    # One copy up front; each detector then adds its columns in place
+    df = df.copy()
+    df.reset_index(drop=True, inplace=True)
+    
+    df = detect_liquidity_sweeps(df, copy=False)
+    df = detect_displacement(df, atr_period=14, threshold=displacement_threshold, copy=False)
+    df = detect_fvgs(df, copy=False)
+    df = detect_mss(df, copy=False)
+    df = detect_order_blocks(df, copy=False)
     
     return df
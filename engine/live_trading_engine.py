@@ -6,7 +6,12 @@ Live Trading Engine with Dual Strategy Support
 """
 
 import os
+import sys
+sys.path.insert(0, '.')
+
+import math
 from datetime import datetime, time
+from time import monotonic
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import MarketOrderRequest, LimitOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce
@@ -16,9 +21,30 @@ from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import asyncio
 
+from engine.strategy_shared import wilder_atr_last
+
+DIRECTION_SIGN = {'long': 1, 'short': -1}  # Target side of entry, as used by the exit-check arrays
+
+
+def _pnl_batch(entry: np.ndarray, exit_price: float, is_conservative: np.ndarray,
+               hit: np.ndarray, num_contracts: np.ndarray, num_longs: np.ndarray,
+               num_spreads: np.ndarray, premium_paid: np.ndarray,
+               total_cost: np.ndarray) -> np.ndarray:
+    """
+    Simplified P&L for a batch of closing positions.
+    
+    Target hits earn the move on longs (plus max spread profit for aggressive);
+    everything else loses half the premium.
+    """
+    target_distance = np.abs(exit_price - entry)
+    conservative_pnl = target_distance * 100 * num_contracts - premium_paid
+    aggressive_pnl = (target_distance * 100 * num_longs + 5 * 100 * num_spreads) - total_cost
+    hit_pnl = np.where(is_conservative, conservative_pnl, aggressive_pnl)
+    return np.where(hit, hit_pnl, -premium_paid * 0.5)
+
 
 class DualStrategyTrader:
     """
@@ -27,7 +53,12 @@ class DualStrategyTrader:
     - Aggressive: 75% longs + 25% spreads, 4% risk
     """
     
-    def __init__(self):
+    def __init__(self, account_ttl_s: float = 30.0, clock_ttl_s: float = 60.0):
+        """
+        Args:
+            account_ttl_s: Seconds account equity is reused before refetching (default: 30)
+            clock_ttl_s: Seconds the market clock is reused before refetching (default: 60)
+        """
         # Alpaca clients
         self.api_key = os.environ.get('ALPACA_API_KEY')
         self.api_secret = os.environ.get('ALPACA_API_SECRET')
@@ -50,6 +81,19 @@ class DualStrategyTrader:
         # Position tracking
         self.conservative_positions = []
         self.aggressive_positions = []
+        self.max_hold_minutes = 60
+        self.max_hold_seconds = self.max_hold_minutes * 60
+        
+        # Open positions as parallel arrays per strategy, for vectorized exit checks
+        self._open = {
+            strategy: {
+                'entry_epoch': np.empty(0),
+                'target': np.empty(0),
+                'sign': np.empty(0, dtype=np.int8),
+                'meta': []
+            }
+            for strategy in ('conservative', 'aggressive')
+        }
         
         # Performance tracking
         self.stats = {
@@ -70,28 +114,64 @@ class DualStrategyTrader:
         # Market data buffer
         self.bars_1min = pd.DataFrame()
         
+        # REST results reused between ticks: name -> (expires_at, value)
+        self.account_ttl_s = account_ttl_s
+        self.clock_ttl_s = clock_ttl_s
+        self._cache: Dict[str, tuple] = {}
+        
+    def _cache_fresh(self, key: str) -> bool:
+        """Whether a cached Alpaca value is still within its TTL."""
+        cached = self._cache.get(key)
+        return cached is not None and monotonic() < cached[0]
+    
     def get_account_balance(self) -> float:
-        """Get current account equity."""
+        """Get current account equity (cached for account_ttl_s)."""
+        cached = self._cache.get('equity')
+        if cached is not None and monotonic() < cached[0]:
+            return cached[1]
+        
         account = self.trading_client.get_account()
-        return float(account.equity)
+        equity = float(account.equity)
+        self._cache['equity'] = (monotonic() + self.account_ttl_s, equity)
+        return equity
     
     def is_market_open(self) -> bool:
-        """Check if market is currently open."""
+        """Check if market is currently open (cached up to clock_ttl_s, never past the next open/close)."""
+        cached = self._cache.get('clock')
+        if cached is not None and monotonic() < cached[0]:
+            return cached[1]
+        
         clock = self.trading_client.get_clock()
+        ttl = self.clock_ttl_s
+        transition = clock.next_close if clock.is_open else clock.next_open
+        if transition is not None and clock.timestamp is not None:
+            ttl = min(ttl, max(0.0, (transition - clock.timestamp).total_seconds()))
+        self._cache['clock'] = (monotonic() + ttl, clock.is_open)
         return clock.is_open
     
+    async def refresh_async(self) -> Tuple[float, bool]:
+        """
+        Fetch account equity and market clock concurrently.
+        
+        Both calls are independent Alpaca round-trips; each still goes
+        through its TTL cache, so warm entries cost nothing.
+        
+        Returns:
+            (equity, market open)
+        """
+        equity, is_open = await asyncio.gather(
+            asyncio.to_thread(self.get_account_balance),
+            asyncio.to_thread(self.is_market_open)
+        )
+        return equity, is_open
+    
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        """Calculate current ATR."""
+        """Calculate current ATR (Wilder smoothing)."""
         if len(df) < period + 1:
             return 0.5  # Default
         
-        df = df.copy()
-        df['h-l'] = df['high'] - df['low']
-        df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-        df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        atr = df['tr'].rolling(window=period).mean().iloc[-1]
-        return atr if not pd.isna(atr) else 0.5
+        atr = wilder_atr_last(df, period)
+        return 0.5 if math.isnan(atr) else float(atr)
     
     def check_ict_confluence(self, df: pd.DataFrame) -> Optional[Dict]:
         """
@@ -127,6 +207,7 @@ class DualStrategyTrader:
         }
         
         self.conservative_positions.append(position)
+        self._track_open('conservative', position)
         self.stats['conservative']['active_positions'] += 1
         
         return position
@@ -164,91 +245,125 @@ class DualStrategyTrader:
         }
         
         self.aggressive_positions.append(position)
+        self._track_open('aggressive', position)
         self.stats['aggressive']['active_positions'] += 1
         
         return position
     
+    def _track_open(self, strategy: str, position: Dict):
+        """Append an open position to its strategy's exit-check arrays."""
+        book = self._open[strategy]
+        sign = DIRECTION_SIGN.get(position['direction'], 0)
+        
+        book['entry_epoch'] = np.append(book['entry_epoch'], position['entry_time'].timestamp())
+        book['target'] = np.append(book['target'], position['target_price'])
+        book['sign'] = np.append(book['sign'], np.int8(sign))
+        book['meta'].append(position)
+    
     def check_exits(self, current_price: float):
-        """Check if any positions should be closed."""
-        now = datetime.now()
+        """Check if any positions should be closed (target hit or max hold reached)."""
+        now_epoch = datetime.now().timestamp()
+        to_close, hits = [], []
         
-        # Check conservative positions
-        for pos in self.conservative_positions:
-            if pos['status'] != 'open':
+        # Conservative first, then aggressive, each in entry order
+        for strategy in ('conservative', 'aggressive'):
+            book = self._open[strategy]
+            if not book['meta']:
                 continue
             
-            # Time-based exit (60 minutes)
-            time_elapsed = (now - pos['entry_time']).total_seconds() / 60
-            
-            # Target hit check
-            hit_target = False
-            if pos['direction'] == 'long' and current_price >= pos['target_price']:
-                hit_target = True
-            elif pos['direction'] == 'short' and current_price <= pos['target_price']:
-                hit_target = True
-            
-            if hit_target or time_elapsed >= 60:
-                self.close_position(pos, current_price, hit_target)
-        
-        # Check aggressive positions
-        for pos in self.aggressive_positions:
-            if pos['status'] != 'open':
+            hit = (book['sign'] * (current_price - book['target']) >= 0) & (book['sign'] != 0)
+            expired = (now_epoch - book['entry_epoch']) >= self.max_hold_seconds
+            idx = np.flatnonzero(hit | expired)
+            if len(idx) == 0:
                 continue
             
-            time_elapsed = (now - pos['entry_time']).total_seconds() / 60
-            
-            hit_target = False
-            if pos['direction'] == 'long' and current_price >= pos['target_price']:
-                hit_target = True
-            elif pos['direction'] == 'short' and current_price <= pos['target_price']:
-                hit_target = True
+            to_close.extend(book['meta'][i] for i in idx)
+            hits.extend(hit[idx].tolist())
             
-            if hit_target or time_elapsed >= 60:
-                self.close_position(pos, current_price, hit_target)
+            # close_batch always closes, so every selected row leaves the book
+            self._untrack_open(strategy, idx)
+        
+        if to_close:
+            self.close_batch(to_close, current_price, hits)
+    
+    def _untrack_open(self, strategy: str, idx):
+        """Remove rows from a strategy's exit-check arrays."""
+        book = self._open[strategy]
+        for key in ('entry_epoch', 'target', 'sign'):
+            book[key] = np.delete(book[key], idx)
+        closing = set(np.atleast_1d(idx).tolist())
+        book['meta'] = [p for i, p in enumerate(book['meta']) if i not in closing]
     
     def close_position(self, position: Dict, exit_price: float, hit_target: bool):
         """Close a position and calculate P&L."""
-        strategy = position['strategy']
+        # Take it out of the book so check_exits can't close it a second time
+        meta = self._open[position['strategy']]['meta']
+        for i, tracked in enumerate(meta):
+            if tracked is position:
+                self._untrack_open(position['strategy'], i)
+                break
+        self.close_batch([position], exit_price, [hit_target])
+    
+    def close_batch(self, positions: List[Dict], exit_price: float, hits: List[bool]):
+        """
+        Close positions exiting on the same tick, with P&L computed as one array pass.
         
-        # Simplified P&L calculation
-        if hit_target:
-            target_distance = abs(exit_price - position['entry_price'])
+        Args:
+            positions: Open position dicts (either strategy)
+            exit_price: Underlying price at exit
+            hits: Whether each position hit its target
+        """
+        pnl = _pnl_batch(
+            np.array([p['entry_price'] for p in positions], dtype=np.float64),
+            exit_price,
+            np.array([p['strategy'] == 'conservative' for p in positions]),
+            np.array(hits, dtype=bool),
+            np.array([p.get('num_contracts', 0) for p in positions], dtype=np.float64),
+            np.array([p.get('num_longs', 0) for p in positions], dtype=np.float64),
+            np.array([p.get('num_spreads', 0) for p in positions], dtype=np.float64),
+            np.array([p.get('premium_paid', p.get('total_cost', 0)) for p in positions], dtype=np.float64),
+            np.array([p.get('total_cost', 0) for p in positions], dtype=np.float64)
+        ).tolist()
+        
+        exit_time = datetime.now()
+        for position, hit_target, position_pnl in zip(positions, hits, pnl):
+            strategy = position['strategy']
             
-            if strategy == 'conservative':
-                exit_value = target_distance * 100 * position['num_contracts']
-                pnl = exit_value - position['premium_paid']
-            else:
-                # Aggressive includes spreads
-                long_value = target_distance * 100 * position['num_longs']
-                spread_value = 5 * 100 * position['num_spreads']  # Max profit
-                exit_value = long_value + spread_value
-                pnl = exit_value - position['total_cost']
-        else:
-            # Expired worthless or small gain
-            pnl = -position.get('premium_paid', position.get('total_cost', 0)) * 0.5
-        
-        # Update position
-        position['status'] = 'closed'
-        position['exit_price'] = exit_price
-        position['exit_time'] = datetime.now()
-        position['pnl'] = pnl
-        position['hit_target'] = hit_target
-        
-        # Update stats
-        self.stats[strategy]['trades'] += 1
-        self.stats[strategy]['total_pnl'] += pnl
-        self.stats[strategy]['active_positions'] -= 1
-        
-        if pnl > 0:
-            self.stats[strategy]['wins'] += 1
+            # Update position
+            position['status'] = 'closed'
+            position['exit_price'] = exit_price
+            position['exit_time'] = exit_time
+            position['pnl'] = position_pnl
+            position['hit_target'] = hit_target
+            
+            # Update stats
+            self.stats[strategy]['trades'] += 1
+            self.stats[strategy]['total_pnl'] += position_pnl
+            self.stats[strategy]['active_positions'] -= 1
+            
+            if position_pnl > 0:
+                self.stats[strategy]['wins'] += 1
     
     def get_status(self) -> Dict:
         """Get current trading status."""
-        balance = self.get_account_balance()
+        # Overlap the round-trips only when both caches are stale; otherwise at
+        # most one REST call is due and an event loop would only add overhead
+        both_stale = not (self._cache_fresh('equity') or self._cache_fresh('clock'))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            in_loop = False
+        else:
+            in_loop = True  # Callers inside an event loop should await refresh_async
+        
+        if both_stale and not in_loop:
+            balance, market_open = asyncio.run(self.refresh_async())
+        else:
+            balance, market_open = self.get_account_balance(), self.is_market_open()
         
         return {
             'account_balance': balance,
-            'market_open': self.is_market_open(),
+            'market_open': market_open,
             'conservative': {
                 **self.stats['conservative'],
                 'win_rate': (self.stats['conservative']['wins'] / max(1, self.stats['conservative']['trades'])) * 100,
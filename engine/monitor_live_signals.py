@@ -13,11 +13,15 @@ from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockLatestBarRequest
 from alpaca.data.timeframe import TimeFrame
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from engine.sessions_liquidity import label_sessions, add_session_highs_lows
 from engine.ict_structures import detect_all_structures
+from engine.strategy_shared import wilder_atr_array
 from dashboard.notifier import notifier
 
+ATR_RING_SIZE = 512  # Per-bar TR/ATR history kept for the rolling buffer (>= its max_bars)
+
 
 class LiveSignalMonitor:
     """Monitor live market data for ICT signals."""
@@ -32,78 +36,195 @@ class LiveSignalMonitor:
         )
         
         # Buffer for 1-minute bars
-        self.bars_buffer = []
+        self.bars_buffer = None  # rolling minute bars, extended incrementally
         self.last_signal_time = None
+        self.last_scan = None  # (bars key, signals) from the previous check
+        
+        # Wilder ATR carried bar by bar: ring buffers indexed by bars seen
+        self._tr = np.empty(ATR_RING_SIZE, dtype=np.float64)
+        self._atr = np.empty(ATR_RING_SIZE, dtype=np.float64)
+        self._atr_n = 0
+        self._atr_period = None
+        self._atr_last_ts = None
+        self._atr_last_close = np.nan
+        
+    def get_recent_bars(self, symbol='QQQ', lookback_hours=2, max_bars=200):
+        """Fetch recent bars for analysis.
+        
+        The first call pulls ``lookback_hours`` of history; later calls only
+        request bars newer than the last buffered timestamp and append them.
+        
+        Args:
+            symbol: Ticker to fetch
+            lookback_hours: History loaded on the first call
+            max_bars: Rows kept in the rolling buffer
+        
+        Returns:
+            DataFrame of the buffered bars
+        """
+        end = datetime.now()
+        if self.bars_buffer is None or len(self.bars_buffer) == 0:
+            start = end - timedelta(hours=lookback_hours)
+        else:
+            start = self.bars_buffer['timestamp'].iloc[-1] + timedelta(seconds=1)
         
-    def get_recent_bars(self, symbol='QQQ', lookback_hours=2):
-        """Fetch recent bars for analysis."""
         request = StockBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=TimeFrame.Minute,
-            start=datetime.now() - timedelta(hours=lookback_hours),
-            end=datetime.now()
+            start=start,
+            end=end
         )
         
         bars = self.data_client.get_stock_bars(request)
-        df = bars.df.reset_index()
-        df = df.rename(columns={'timestamp': 'timestamp', 'symbol': 'symbol'})
-        df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+        new = bars.df
+        if len(new) > 0:
+            new = new.reset_index()[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            if self.bars_buffer is None or len(self.bars_buffer) == 0:
+                self.bars_buffer = new
+            else:
+                self.bars_buffer = pd.concat([self.bars_buffer, new], ignore_index=True)
+            self.bars_buffer = self.bars_buffer.tail(max_bars).reset_index(drop=True)
         
-        return df
+        if self.bars_buffer is None:
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        return self.bars_buffer
+    
+    def _push_atr_bar(self, high, low, close, period):
+        """Advance the Wilder ATR by one bar (same definition as wilder_atr_array)."""
+        k = self._atr_n
+        i = k % ATR_RING_SIZE
+        if k == 0:
+            tr = np.nan  # True ranges start at the second bar
+        else:
+            prev_close = self._atr_last_close
+            tr = np.fmax(np.fmax(high - low, abs(high - prev_close)), abs(low - prev_close))
+        self._tr[i] = tr
+        
+        if k < period:
+            atr = np.nan
+        elif k == period:
+            # Seed: mean of the first `period` true ranges
+            atr = self._tr[np.arange(1, period + 1) % ATR_RING_SIZE].mean()
+        else:
+            alpha = 1.0 / period
+            atr = (1.0 - alpha) * self._atr[(k - 1) % ATR_RING_SIZE] + alpha * tr
+        self._atr[i] = atr
+        
+        self._atr_n = k + 1
+        self._atr_last_close = close
     
     def calculate_atr(self, df, period=14):
-        """Calculate ATR."""
-        df = df.copy()
-        df['h-l'] = df['high'] - df['low']
-        df['h-pc'] = abs(df['high'] - df['close'].shift(1))
-        df['l-pc'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-        df['atr'] = df['tr'].rolling(window=period).mean()
-        return df
+        """
+        Calculate Wilder ATR (returns a new frame with an 'atr' column; df is untouched).
+        
+        Bars already seen are not recomputed: only rows newer than the last
+        processed timestamp advance the ring buffers. A frame that does not
+        continue the processed bars restarts the ATR from its first row.
+        
+        Args:
+            df: Bars in time order (normally the rolling buffer)
+            period: ATR period (default: 14)
+        
+        Returns:
+            DataFrame with an 'atr' column
+        """
+        n = len(df)
+        if n == 0 or n > ATR_RING_SIZE:
+            return df.assign(atr=wilder_atr_array(df, period))
+        
+        timestamps = df['timestamp']
+        start = 0
+        if self._atr_period == period and self._atr_last_ts is not None:
+            start = int(timestamps.searchsorted(self._atr_last_ts, side='right'))
+            continues = start > 0 and start <= self._atr_n and timestamps.iloc[start - 1] == self._atr_last_ts
+            if not continues:
+                start = 0
+        if start == 0:
+            self._atr_n = 0
+            self._atr_period = period
+        
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        for j in range(start, n):
+            self._push_atr_bar(high[j], low[j], close[j], period)
+        self._atr_last_ts = timestamps.iloc[-1]
+        
+        rows = np.arange(self._atr_n - n, self._atr_n) % ATR_RING_SIZE
+        return df.assign(atr=self._atr[rows])
     
     def check_for_signals(self, df):
-        """Check for ICT confluence signals."""
-        # Add sessions and ICT structures
+        """Check for ICT confluence signals (reuses the last result when the bars are unchanged)."""
+        if len(df) == 0:
+            return []
+        
+        # Polls within the same minute return identical bars; skip the rebuild
+        first, last = df.iloc[0], df.iloc[-1]
+        scan_key = (
+            len(df), first['timestamp'], last['timestamp'],
+            last['open'], last['high'], last['low'], last['close'], last['volume']
+        )
+        if self.last_scan is not None and self.last_scan[0] == scan_key:
+            return self.last_scan[1]
+        
+        signals = self._scan_signals(df)
+        self.last_scan = (scan_key, signals)
+        return signals
+    
+    def _scan_signals(self, df):
+        """Run the full session/structure pipeline and collect signals."""
+        # Targets use the incremental Wilder ATR; detect_displacement then
+        # replaces the 'atr' column with the SMA it sizes displacement by
         df = self.calculate_atr(df)
+        wilder_atr = df['atr'].to_numpy(dtype=np.float64)
+        
+        # Add sessions and ICT structures
         df = label_sessions(df)
         df = add_session_highs_lows(df)
         df = detect_all_structures(df, displacement_threshold=1.0)
         
         signals = []
         
-        # Check last 10 bars for signals
-        for i in range(max(0, len(df) - 10), len(df) - 5):
-            # Bullish signal
-            if df.iloc[i]['sweep_bullish']:
-                window = df.iloc[i:i+6]
-                if window['displacement_bullish'].any() and window['mss_bullish'].any():
-                    atr = df.iloc[i].get('atr', 0.5)
-                    target_distance = 5.0 * atr
-                    
-                    signals.append({
-                        'timestamp': df.iloc[i]['timestamp'],
-                        'direction': 'LONG',
-                        'price': df.iloc[i]['close'],
-                        'target': df.iloc[i]['close'] + target_distance,
-                        'target_distance': target_distance,
-                        'atr': atr
-                    })
+        # Plain arrays once, instead of a row slice per lookup
+        sweep_bull = df['sweep_bullish'].to_numpy(dtype=bool)
+        sweep_bear = df['sweep_bearish'].to_numpy(dtype=bool)
+        disp_bull = df['displacement_bullish'].to_numpy(dtype=bool)
+        disp_bear = df['displacement_bearish'].to_numpy(dtype=bool)
+        mss_bull = df['mss_bullish'].to_numpy(dtype=bool)
+        mss_bear = df['mss_bearish'].to_numpy(dtype=bool)
+        close = df['close'].to_numpy()
+        # 0.5 default wherever ATR is missing or still warming up
+        atr_values = np.nan_to_num(wilder_atr, nan=0.5)
+        timestamps = df['timestamp']
+        
+        # Check last 10 bars for signals: sweep on bar i with displacement and
+        # MSS anywhere in bars i..i+5 (full windows only, as before)
+        if len(df) < 6:
+            return signals
+        start = max(0, len(df) - 10)
+        window = np.lib.stride_tricks.sliding_window_view
+        bull = sweep_bull[:-5] & window(disp_bull, 6).any(axis=1) & window(mss_bull, 6).any(axis=1)
+        bear = sweep_bear[:-5] & window(disp_bear, 6).any(axis=1) & window(mss_bear, 6).any(axis=1)
+        bull_idx = start + np.flatnonzero(bull[start:])
+        bear_idx = start + np.flatnonzero(bear[start:])
+        
+        # Bar order, bullish before bearish on the same bar
+        hits = np.concatenate([bull_idx, bear_idx])
+        signs = np.concatenate([np.ones(len(bull_idx)), -np.ones(len(bear_idx))])
+        order = np.lexsort((-signs, hits))
+        
+        for i, sign in zip(hits[order].tolist(), signs[order].tolist()):
+            atr = atr_values[i]
+            target_distance = 5.0 * atr
             
-            # Bearish signal
-            if df.iloc[i]['sweep_bearish']:
-                window = df.iloc[i:i+6]
-                if window['displacement_bearish'].any() and window['mss_bearish'].any():
-                    atr = df.iloc[i].get('atr', 0.5)
-                    target_distance = 5.0 * atr
-                    
-                    signals.append({
-                        'timestamp': df.iloc[i]['timestamp'],
-                        'direction': 'SHORT',
-                        'price': df.iloc[i]['close'],
-                        'target': df.iloc[i]['close'] - target_distance,
-                        'target_distance': target_distance,
-                        'atr': atr
-                    })
+            signals.append({
+                'timestamp': timestamps.iloc[i],
+                'direction': 'LONG' if sign > 0 else 'SHORT',
+                'price': close[i],
+                'target': close[i] + sign * target_distance,
+                'target_distance': target_distance,
+                'atr': atr
+            })
         
         return signals
     
@@ -133,8 +254,90 @@ Review signal and execute if valid.
             priority=1
         )
     
+    def append_bar(self, bar, max_bars=200):
+        """
+        Append one streamed minute bar to the rolling buffer.
+        
+        Args:
+            bar: Bar from the Alpaca data stream
+            max_bars: Rows kept in the rolling buffer
+        
+        Returns:
+            True if the bar was new and appended
+        """
+        timestamp = pd.Timestamp(bar.timestamp)
+        if self.bars_buffer is not None and len(self.bars_buffer) > 0 and \
+                timestamp <= self.bars_buffer['timestamp'].iloc[-1]:
+            return False  # Already have this bar from the history fetch
+        
+        row = pd.DataFrame({
+            'timestamp': [timestamp],
+            'open': [bar.open],
+            'high': [bar.high],
+            'low': [bar.low],
+            'close': [bar.close],
+            'volume': [bar.volume]
+        })
+        if self.bars_buffer is None or len(self.bars_buffer) == 0:
+            self.bars_buffer = row
+        else:
+            self.bars_buffer = pd.concat([self.bars_buffer, row], ignore_index=True)
+        self.bars_buffer = self.bars_buffer.tail(max_bars).reset_index(drop=True)
+        return True
+    
+    def process_bars(self, df):
+        """Scan the bars, alert on signals newer than the last alert, and print status."""
+        # Check for signals
+        signals = self.check_for_signals(df)
+        
+        # Alert on new signals
+        for signal in signals:
+            signal_time = signal['timestamp']
+            
+            # Only alert if we haven't alerted for this time period
+            if self.last_signal_time is None or signal_time > self.last_signal_time:
+                self.alert_signal(signal)
+                self.last_signal_time = signal_time
+        
+        current_price = df.iloc[-1]['close']
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] QQQ: ${current_price:.2f} | Bars: {len(df)} | Signals: {len(signals)}")
+    
+    async def _on_bar(self, bar):
+        """Stream handler: extend the buffer with the closed bar and rescan."""
+        try:
+            if self.append_bar(bar):
+                self.process_bars(self.bars_buffer)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+    
+    def run_stream(self, symbol='QQQ'):
+        """
+        Scan as each minute bar closes, pushed over Alpaca's market-data websocket.
+        
+        Args:
+            symbol: Ticker to stream
+        """
+        print("\n" + "="*60)
+        print("MaxTrader Live Signal Monitor (streaming)")
+        print("="*60)
+        print(f"Monitoring {symbol} for ICT confluence signals on each closed bar...")
+        print(f"Started at: {datetime.now()}")
+        print("="*60 + "\n")
+        
+        # Seed the buffer with history so the first streamed bar has context
+        df = self.get_recent_bars(symbol)
+        if len(df) > 0:
+            self.process_bars(df)
+        
+        stream = StockDataStream(self.api_key, self.api_secret)
+        stream.subscribe_bars(self._on_bar, symbol)
+        try:
+            stream.run()
+        except KeyboardInterrupt:
+            print("\n\nMonitoring stopped by user.")
+    
     def run(self, check_interval=60):
-        """Run monitoring loop."""
+        """Run polling loop (fallback when the stream is unavailable)."""
         print("\n" + "="*60)
         print("MaxTrader Live Signal Monitor")
         print("="*60)
@@ -151,20 +354,7 @@ Review signal and execute if valid.
                 df = self.get_recent_bars()
                 
                 if len(df) > 0:
-                    # Check for signals
-                    signals = self.check_for_signals(df)
-                    
-                    # Alert on new signals
-                    for signal in signals:
-                        signal_time = signal['timestamp']
-                        
-                        # Only alert if we haven't alerted for this time period
-                        if self.last_signal_time is None or signal_time > self.last_signal_time:
-                            self.alert_signal(signal)
-                            self.last_signal_time = signal_time
-                    
-                    current_price = df.iloc[-1]['close']
-                    print(f"[{datetime.now().strftime('%H:%M:%S')}] QQQ: ${current_price:.2f} | Bars: {len(df)} | Signals: {len(signals)}")
+                    self.process_bars(df)
                 
                 time.sleep(check_interval)
                 
@@ -178,4 +368,7 @@ Review signal and execute if valid.
 
 if __name__ == '__main__':
     monitor = LiveSignalMonitor()
-    monitor.run(check_interval=60)  # Check every minute
+    if '--poll' in sys.argv:
+        monitor.run(check_interval=60)  # Check every minute
+    else:
+        monitor.run_stream()
@@ -622,23 +622,21 @@ def simulate_option_pnl_over_path(
         target = position.target
     
     if not use_scaling_exit:
-        # Standard exit logic
+        # Standard exit logic: first bar at or beyond the stop or the target,
+        # measured on the position's side (+1 long, -1 short)
         exit_price = None
+        sign = {'long': 1.0, 'short': -1.0}.get(position.direction, 0.0)
         
-        for price in price_path:
-            # Check STOP FIRST (exits on loss)
+        if sign != 0.0 and len(price_path) > 0:
+            prices = price_path.to_numpy()
+            hit = np.zeros(len(prices), dtype=bool)
             if stop is not None and stop > 0:
-                if (position.direction == 'long' and price <= stop) or \
-                   (position.direction == 'short' and price >= stop):
-                    exit_price = price
-                    break
-            
-            # Check TARGET (exits on profit)
+                hit |= sign * (prices - stop) <= 0
             if target is not None:
-                if (position.direction == 'long' and price >= target) or \
-                   (position.direction == 'short' and price <= target):
-                    exit_price = price
-                    break
+                hit |= sign * (prices - target) >= 0
+            if hit.any():
+                # Same Python scalar the bar-by-bar loop produced
+                exit_price = prices[hit.argmax()].item()
         
         if exit_price is None:
             exit_price = price_path.iloc[-1] if len(price_path) > 0 else price_path.iloc[0]
@@ -4,6 +4,7 @@ Fetches real 1-minute bar data for stocks and forex pairs
 """
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, timedelta
 import time
@@ -24,6 +25,10 @@ class PolygonDataFetcher:
         self.api_key = api_key or os.getenv('POLYGON_API_KEY')
         if not self.api_key:
             raise ValueError("POLYGON_API_KEY not found in environment")
+        
+        # Pooled keep-alive connections: one TLS handshake, reused every tick
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
     
     def fetch_stock_bars(self, ticker, from_date, to_date, limit=50000):
         """
@@ -47,7 +52,7 @@ class PolygonDataFetcher:
         }
         
         print(f"Fetching {ticker} bars from {from_date} to {to_date}...")
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         
         if response.status_code != 200:
             raise Exception(f"Polygon API error: {response.status_code} - {response.text}")
@@ -105,7 +110,7 @@ class PolygonDataFetcher:
         }
         
         print(f"Fetching {from_currency}/{to_currency} bars from {from_date} to {to_date}...")
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         
         if response.status_code != 200:
             raise Exception(f"Polygon API error: {response.status_code} - {response.text}")
@@ -4,6 +4,7 @@ Fetches BOTH historical AND real-time options pricing for QQQ 0DTE options
 """
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, timedelta, date
 from typing import Dict, Optional, List
@@ -19,6 +20,10 @@ class PolygonOptionsFetcher:
         self.api_key = api_key or os.getenv('POLYGON_API_KEY')
         if not self.api_key:
             raise ValueError("POLYGON_API_KEY not found")
+        
+        # Pooled keep-alive connections: one TLS handshake, reused every tick
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
     
     def build_option_ticker(self, underlying, expiration_date, option_type, strike):
         """
@@ -64,7 +69,7 @@ class PolygonOptionsFetcher:
             'limit': 50000
         }
         
-        response = requests.get(url, params=params)
+        response = self.session.get(url, params=params)
         
         if response.status_code != 200:
             raise Exception(f"Polygon API error: {response.status_code} - {response.text}")
@@ -200,7 +205,7 @@ class PolygonOptionsFetcher:
                 'limit': 10
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -288,7 +293,7 @@ class PolygonOptionsFetcher:
             url = f"{self.BASE_URL}/v3/snapshot/options/{underlying}/{encoded_contract}"
             params = {'apiKey': self.api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -10,6 +10,11 @@ import numpy as np
 from typing import Optional
 
 
+# Fixed label set so regime columns can be stored as int8 category codes
+REGIME_CATEGORIES = ['bull_trend', 'bear_trend', 'sideways']
+REGIME_DTYPE = pd.CategoricalDtype(categories=REGIME_CATEGORIES)
+
+
 def detect_regime(
     df: pd.DataFrame,
     renko_direction: pd.Series,
@@ -75,42 +80,103 @@ def _calculate_price_slope(prices: pd.Series, lookback: int) -> pd.Series:
     Returns:
         Series of slopes (normalized by price level)
     """
-    slopes = []
-    
-    for idx in range(len(prices)):
-        if idx < lookback - 1:
-            slopes.append(0.0)
-            continue
-        
-        # Get window of prices
-        window = prices.iloc[idx - lookback + 1:idx + 1]
-        
-        if len(window) < 2:
-            slopes.append(0.0)
-            continue
-        
-        # Simple linear regression
-        x = np.arange(len(window))
-        y = window.values
-        
-        # Calculate slope
-        if len(x) > 0 and len(y) > 0:
-            slope = np.polyfit(x, y, 1)[0]
-            
-            # Normalize by current price to make comparable across price levels
-            current_price = prices.iloc[idx]
-            if current_price > 0:
-                normalized_slope = slope / current_price
-            else:
-                normalized_slope = 0.0
-        else:
-            normalized_slope = 0.0
+    values = prices.to_numpy(dtype=np.float64)
+    slopes = np.zeros(len(values))
+    
+    if lookback >= 2 and len(values) >= lookback:
+        # Least-squares slope of every window at once:
+        # sum((x - x_mean) * (y - y_mean)) / sum((x - x_mean)^2)
+        # (centering y makes flat windows exactly 0 rather than rounding noise)
+        x = np.arange(lookback) - (lookback - 1) / 2
+        windows = np.lib.stride_tricks.sliding_window_view(values, lookback)
+        centered = windows - windows.mean(axis=1, keepdims=True)
+        slope = centered @ x / (x @ x)
         
-        slopes.append(normalized_slope)
+        # Normalize by current price to make comparable across price levels
+        current_price = values[lookback - 1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slopes[lookback - 1:] = np.where(current_price > 0, slope / current_price, 0.0)
     
     return pd.Series(slopes, index=prices.index)
 
 
+def align_regime_to_bars(
+    df_bars: pd.DataFrame,
+    df_regime: pd.DataFrame,
+    regime_series: pd.Series,
+    default: str = 'sideways'
+) -> pd.Series:
+    """
+    Align higher-timeframe regime labels onto lower-timeframe bars.
+
+    Each bar takes the regime of the latest higher-timeframe bar whose
+    timestamp is <= the bar's timestamp. Bars before the first
+    higher-timeframe bar get the default label.
+
+    Args:
+        df_bars: Lower timeframe DataFrame with 'timestamp' column (e.g., 1-min)
+        df_regime: Higher timeframe DataFrame the regimes were computed on (e.g., 30-min)
+        regime_series: Regime labels aligned with df_regime rows
+        default: Label for bars with no prior regime (default: 'sideways')
+
+    Returns:
+        Categorical Series of regime labels indexed like df_bars
+    """
+    ts = df_bars['timestamp'].to_numpy(dtype='datetime64[ns]')
+    ts_regime = df_regime['timestamp'].to_numpy(dtype='datetime64[ns]')
+
+    categories = REGIME_CATEGORIES if default in REGIME_CATEGORIES else REGIME_CATEGORIES + [default]
+    codes = pd.Categorical(regime_series, categories=categories).codes
+    default_code = categories.index(default)
+
+    # Index of last regime bar at or before each timestamp (-1 = none yet)
+    regime_idx = np.searchsorted(ts_regime, ts, side='right') - 1
+    valid = (regime_idx >= 0) & (regime_idx < len(codes))
+
+    # Copy int8 codes rather than Python strings
+    codes_out = np.full(len(ts), default_code, dtype=codes.dtype)
+    codes_out[valid] = codes[regime_idx[valid]]
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes_out, categories=categories),
+        index=df_bars.index
+    )
+
+
+def regime_asof(
+    df_bars: pd.DataFrame,
+    timestamps: pd.Series,
+    regime_col: str = 'regime'
+) -> np.ndarray:
+    """
+    Look up the regime of the latest bar at or before each timestamp.
+
+    Vectorized replacement for per-event `df_bars[df_bars['timestamp'] <= ts]
+    .iloc[-1]` lookups, done as one backward as-of merge.
+
+    Args:
+        df_bars: Bars sorted by 'timestamp' (e.g., 1-min data)
+        timestamps: Sorted event timestamps (e.g., Renko brick times)
+        regime_col: Regime column in df_bars (default: 'regime')
+
+    Returns:
+        Object array of regime labels; None where no bar precedes the
+        timestamp, 'unknown' if df_bars has no regime column
+    """
+    if regime_col not in df_bars.columns:
+        return np.full(len(timestamps), 'unknown', dtype=object)
+
+    merged = pd.merge_asof(
+        pd.DataFrame({'timestamp': timestamps.to_numpy()}),
+        df_bars[['timestamp', regime_col]].assign(_matched=True),
+        on='timestamp',
+        direction='backward'
+    )
+    labels = merged[regime_col].astype(object).to_numpy()
+    labels[merged['_matched'].isna().to_numpy()] = None
+    return labels
+
+
 def get_regime_stats(df: pd.DataFrame, regime_col: str = 'regime') -> dict:
     """
     Calculate statistics about regime distribution.
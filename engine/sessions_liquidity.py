@@ -30,25 +30,14 @@ def label_sessions(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     
-    df['hour'] = df['timestamp'].dt.hour
-    df['minute'] = df['timestamp'].dt.minute
-    df['time_decimal'] = df['hour'] + df['minute'] / 60.0
+    timestamps = df['timestamp']
+    t = (timestamps.dt.hour + timestamps.dt.minute / 60.0).to_numpy()
     
-    def classify_session(row):
-        t = row['time_decimal']
-        
-        if (t >= 9.5) and (t < 16.0):
-            return 'ny'
-        elif (t >= 3.0) and (t < 9.5):
-            return 'london'
-        elif (t >= 18.0) or (t < 3.0):
-            return 'asia'
-        else:
-            return 'other'
-    
-    df['session'] = df.apply(classify_session, axis=1)
-    
-    df = df.drop(['hour', 'minute', 'time_decimal'], axis=1)
+    session = np.full(len(df), 'other', dtype=object)
+    session[(t >= 18.0) | (t < 3.0)] = 'asia'
+    session[(t >= 3.0) & (t < 9.5)] = 'london'
+    session[(t >= 9.5) & (t < 16.0)] = 'ny'
+    df['session'] = session
     
     return df
 
@@ -78,41 +67,23 @@ def add_session_highs_lows(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
     
-    df['trading_day'] = df['timestamp'].apply(
-        lambda ts: (ts + pd.Timedelta(hours=6)).date()
-    )
-    
-    df['asia_high'] = np.nan
-    df['asia_low'] = np.nan
-    df['london_high'] = np.nan
-    df['london_low'] = np.nan
-    
-    for trading_day in df['trading_day'].unique():
-        day_mask = df['trading_day'] == trading_day
-        
-        asia_mask = day_mask & (df['session'] == 'asia')
-        if asia_mask.any():
-            asia_data = df.loc[asia_mask]
-            asia_high = asia_data['high'].max()
-            asia_low = asia_data['low'].min()
-            
-            df.loc[day_mask, 'asia_high'] = asia_high
-            df.loc[day_mask, 'asia_low'] = asia_low
-        
-        london_mask = day_mask & (df['session'] == 'london')
-        if london_mask.any():
-            london_data = df.loc[london_mask]
-            london_high = london_data['high'].max()
-            london_low = london_data['low'].min()
-            
-            df.loc[day_mask, 'london_high'] = london_high
-            df.loc[day_mask, 'london_low'] = london_low
-    
-    df['asia_high'] = df.groupby('trading_day')['asia_high'].ffill()
-    df['asia_low'] = df.groupby('trading_day')['asia_low'].ffill()
-    df['london_high'] = df.groupby('trading_day')['london_high'].ffill()
-    df['london_low'] = df.groupby('trading_day')['london_low'].ffill()
+    # Trading day = date after shifting 6h forward, as integer group codes
+    trading_day = (df['timestamp'] + pd.Timedelta(hours=6)).dt.normalize()
+    day_codes, days = pd.factorize(trading_day)
+    n_days = len(days)
+    session = df['session'].to_numpy()
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
     
-    df = df.drop('trading_day', axis=1)
+    for name in ('asia', 'london'):
+        in_session = session == name
+        codes = day_codes[in_session]
+        # Session extreme per day (NaN-skipping), broadcast to every bar of that day
+        day_high = np.full(n_days, np.nan)
+        day_low = np.full(n_days, np.nan)
+        np.fmax.at(day_high, codes, high[in_session])
+        np.fmin.at(day_low, codes, low[in_session])
+        df[f'{name}_high'] = day_high[day_codes]
+        df[f'{name}_low'] = day_low[day_codes]
     
     return df
@@ -15,6 +15,8 @@ from typing import List, Optional
 import pandas as pd
 import numpy as np
 
+from engine.regimes import regime_asof
+
 
 @dataclass
 class RenkoSignal:
@@ -217,6 +219,9 @@ def generate_renko_signals(
     """
     signals = []
     
+    # Regime at each brick time, looked up once via as-of merge
+    brick_regimes = regime_asof(df_1min, renko_df['timestamp'])
+    
     for idx in range(len(renko_df)):
         brick = renko_df.iloc[idx]
         timestamp = brick['timestamp']
@@ -240,13 +245,10 @@ def generate_renko_signals(
             continue
         
         # Get regime at this timestamp
-        regime_mask = df_1min['timestamp'] <= timestamp
-        if not regime_mask.any():
+        regime = brick_regimes[idx]
+        if regime is None:
             continue
         
-        regime_row = df_1min[regime_mask].iloc[-1]
-        regime = regime_row.get('regime', 'unknown')
-        
         # Long signal: bullish impulse + (bull_trend or sideways regime)
         if bullish_impulse and regime in ['bull_trend', 'sideways']:
             direction = 'long'
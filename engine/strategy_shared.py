@@ -21,11 +21,17 @@ from engine.ict_structures import (
     detect_displacement,
     detect_fvgs,
     detect_mss,
-    detect_order_blocks
+    detect_order_blocks,
+    _atr_loop
 )
-from engine.regimes import detect_regime
+from engine.regimes import detect_regime, align_regime_to_bars
 from engine.timeframes import resample_to_timeframe
 
+try:
+    import talib
+except ImportError:  # pandas ewm fallback
+    talib = None
+
 
 @dataclass
 class StrategySignal:
@@ -227,14 +233,7 @@ def preprocess_market_data(
     regime_30min = detect_regime(df_30min, renko_direction_30min, lookback=regime_lookback)
     
     # Align regime to 1-min
-    df_1min['regime'] = 'sideways'
-    for idx in range(len(df_1min)):
-        ts = df_1min['timestamp'].iloc[idx]
-        mask = df_30min['timestamp'] <= ts
-        if mask.any():
-            regime_idx = mask.sum() - 1
-            if regime_idx < len(regime_30min):
-                df_1min.loc[df_1min.index[idx], 'regime'] = regime_30min.iloc[regime_idx]
+    df_1min['regime'] = align_regime_to_bars(df_1min, df_30min, regime_30min)
     
     # Calculate ATR % of price
     if len(df_1min) > 14:
@@ -276,6 +275,96 @@ def preprocess_market_data(
     return context
 
 
+def atr_array(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """
+    Average True Range for every bar as a NumPy array.
+    
+    Same values as tr.rolling(period).mean() on the true range: NaN until
+    a full window is available, first bar's true range is high - low.
+    
+    Args:
+        df: DataFrame with OHLC data
+        period: ATR period (default: 14)
+        
+    Returns:
+        float64 array aligned with df
+    """
+    return _atr_loop(
+        df['high'].to_numpy(dtype=np.float64),
+        df['low'].to_numpy(dtype=np.float64),
+        df['close'].to_numpy(dtype=np.float64),
+        period
+    )
+
+
+def wilder_atr_array(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """
+    Wilder-smoothed Average True Range for every bar as a NumPy array.
+    
+    Same definition as talib.ATR (used when installed): true ranges start
+    at the second bar, the first ATR is their simple mean over `period`
+    bars, then ATR = (prev * (period - 1) + TR) / period. NaN before that.
+    
+    Args:
+        df: DataFrame with OHLC data
+        period: ATR period (default: 14)
+        
+    Returns:
+        float64 array aligned with df
+    """
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    
+    if talib is not None:
+        return talib.ATR(high, low, close, timeperiod=period)
+    
+    atr = np.full(len(high), np.nan)
+    if len(high) <= period:
+        return atr
+    
+    prev_close = close[:-1]
+    tr = np.fmax(np.fmax(high[1:] - low[1:], np.abs(high[1:] - prev_close)), np.abs(low[1:] - prev_close))
+    
+    # Seed with the SMA of the first window, then Wilder's recursion as an RMA
+    seeded = np.concatenate(([tr[:period].mean()], tr[period:]))
+    atr[period:] = pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    return atr
+
+
+def wilder_atr_last(df: pd.DataFrame, period: int = 14) -> float:
+    """
+    Latest value of wilder_atr_array, without building the per-bar series.
+    
+    Wilder's recursion unrolls to a geometric weighting of the seed and the
+    later true ranges, so the last ATR is one dot product over NumPy arrays.
+    
+    Args:
+        df: DataFrame with OHLC data
+        period: ATR period (default: 14)
+        
+    Returns:
+        Latest ATR, NaN if there are not more than `period` bars
+    """
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    
+    if talib is not None:
+        return float(talib.ATR(high, low, close, timeperiod=period)[-1])
+    
+    if len(high) <= period:
+        return np.nan
+    
+    prev_close = close[:-1]
+    tr = np.fmax(np.fmax(high[1:] - low[1:], np.abs(high[1:] - prev_close)), np.abs(low[1:] - prev_close))
+    
+    decay = 1.0 - 1.0 / period
+    later = tr[period:]
+    weights = decay ** np.arange(len(later) - 1, -1, -1)
+    return float(tr[:period].mean() * decay ** len(later) + (later @ weights) / period)
+
+
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> float:
     """
     Calculate Average True Range.
@@ -289,19 +378,11 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> float:
     """
     if len(df) < period:
         return 0.0
-        
-    high = df['high']
-    low = df['low']
-    close = df['close'].shift(1)
-    
-    tr1 = high - low
-    tr2 = abs(high - close)
-    tr3 = abs(low - close)
     
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean().iloc[-1]
+    # Only the last window matters; one extra bar supplies its previous close
+    atr = atr_array(df.iloc[-(period + 1):], period)[-1]
     
-    return atr if not pd.isna(atr) else 0.0
+    return float(atr) if not np.isnan(atr) else 0.0
 
 
 def calculate_vwap(df: pd.DataFrame, session_start: Optional[pd.Timestamp] = None) -> float:
@@ -91,18 +91,31 @@ class UltraLowVolStrategyV2(BaseStrategy):
         last_signal_idx = -100
         cooldown_bars = 10  # Minimal cooldown, let PA drive frequency
         
-        # Scan entire dataframe for PA-confirmed setups
-        # FIX (architect): Calculate VWAP bands ROLLING per bar, not once globally
-        for idx in range(self.rolling_window, len(df)):
+        # Session VWAP bands for every bar in one vectorized pass
+        bands = self._calculate_session_vwap_bands_all(df)
+        close = df['close'].to_numpy(dtype=float)
+        lower = bands['lower_band']
+        upper = bands['upper_band']
+        
+        # Candidate bars: previous close beyond a band, current close back inside
+        # (same test as _check_band_cross_reclaim, evaluated for all bars at once)
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+        crossed = (bands['threshold'] > 0) & (
+            ((prev_close < lower) & (close > lower)) |
+            ((prev_close > upper) & (close < upper))
+        )
+        crossed[:self.rolling_window] = False
+        
+        # Scan only the candidates; cooldown depends on accepted signals
+        for idx in np.flatnonzero(crossed):
+            idx = int(idx)
             # Cooldown check
             if idx - last_signal_idx < cooldown_bars:
                 continue
             
-            # Calculate VWAP bands from SESSION START (stable anchor)
-            vwap_data = self._calculate_session_vwap_bands(df, idx, context)
-            
-            if vwap_data['threshold'] == 0:
-                continue
+            vwap_data = {key: float(values[idx]) for key, values in bands.items()}
             
             # SIMPLIFIED PA: Band cross → Reclaim → Entry
             # User: "Price action is what we follow - touch and re-entering"
@@ -112,7 +125,6 @@ class UltraLowVolStrategyV2(BaseStrategy):
             if signal:
                 signals.append(signal)
                 last_signal_idx = idx
-                continue
         
         # Deduplicate by timestamp (keep first)
         seen_timestamps = set()
@@ -196,6 +208,110 @@ class UltraLowVolStrategyV2(BaseStrategy):
             'atr': atr
         }
     
+    def _calculate_session_vwap_bands_all(self, df: pd.DataFrame) -> dict:
+        """
+        Vectorized _calculate_session_vwap_bands for every bar.
+        
+        Same windows as the per-bar version: bars of the current session
+        before idx, or the previous 50 bars when fewer than 10 session bars
+        exist. Session sums come from per-day prefix sums (centered on the
+        session's first typical price for precision); the few fallback
+        windows at each session open are computed directly.
+        
+        Args:
+            df: Full dataframe (sorted by timestamp)
+            
+        Returns:
+            dict of arrays: vwap, threshold, upper_band, lower_band, std, atr
+        """
+        n = len(df)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        typical = (high + low + close) / 3
+        
+        # True range as calculate_atr computes it (first row: high - low)
+        hl = high - low
+        prev_close = np.empty(n)
+        prev_close[:1] = np.nan
+        prev_close[1:] = close[:-1]
+        tr = np.fmax(hl, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        
+        # Session start position for each bar
+        day = df['timestamp'].dt.date.to_numpy()
+        new_day = np.ones(n, dtype=bool)
+        new_day[1:] = day[1:] != day[:-1]
+        day_start = np.maximum.accumulate(np.where(new_day, np.arange(n), 0))
+        
+        # Prefix sums (P[k] = sum of rows < k), centered per session
+        x = typical - typical[day_start]
+        
+        def prefix(values):
+            out = np.zeros(n + 1)
+            np.cumsum(values, out=out[1:])
+            return out
+        
+        p_v, p_xv, p_x, p_xx, p_tr = (
+            prefix(volume), prefix(x * volume), prefix(x), prefix(x * x), prefix(tr)
+        )
+        
+        idx = np.arange(n)
+        count = idx - day_start
+        
+        vwap = np.zeros(n)
+        std = np.zeros(n)
+        atr = np.zeros(n)
+        
+        # Session windows [day_start, idx)
+        sess = count >= 10
+        i, ds, m = idx[sess], day_start[sess], count[sess]
+        vol_sum = p_v[i] - p_v[ds]
+        x_sum = p_x[i] - p_x[ds]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_vwap = np.where(vol_sum > 0, (p_xv[i] - p_xv[ds]) / vol_sum, x_sum / m)
+            var = (p_xx[i] - p_xx[ds] - x_sum * x_sum / m) / (m - 1)
+        vwap[sess] = typical[ds] + x_vwap
+        std[sess] = np.sqrt(np.maximum(var, 0.0))
+        
+        # ATR over the last min(14, m) bars; the window's first bar uses high - low
+        a = np.maximum(ds, i - 14)
+        tr_sum = p_tr[i] - p_tr[a] + np.where(a == ds, hl[ds] - tr[ds], 0.0)
+        atr[sess] = tr_sum / (i - a)
+        
+        # Fallback windows (early in session): previous 50 bars, computed directly
+        for j in np.flatnonzero(~sess):
+            ws = max(0, j - 50)
+            if j - ws < 10:
+                continue
+            tp = typical[ws:j]
+            vol = volume[ws:j]
+            vwap[j] = (tp * vol).sum() / vol.sum() if vol.sum() > 0 else tp.mean()
+            std[j] = (tp - vwap[j]).std(ddof=1)
+            a = max(ws, j - 14)
+            window_tr = tr[a:j].copy()
+            if a == ws:
+                window_tr[0] = hl[ws]
+            atr[j] = window_tr.mean()
+        
+        valid = np.zeros(n, dtype=bool)
+        valid[sess] = True
+        valid[~sess] = np.minimum(idx[~sess], 50) >= 10
+        
+        # Adaptive threshold
+        threshold = np.maximum(0.02, np.minimum(self.atr_mult * atr, self.sigma_mult * std))
+        threshold[~valid] = 0.0
+        vwap[~valid] = 0.0
+        
+        return {
+            'vwap': vwap,
+            'threshold': threshold,
+            'upper_band': np.where(valid, vwap + threshold, 0.0),
+            'lower_band': np.where(valid, vwap - threshold, 0.0),
+            'std': std,
+            'atr': atr
+        }
+    
     def _check_false_break_reclaim(
         self,
         df: pd.DataFrame,
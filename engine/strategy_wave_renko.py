@@ -14,6 +14,7 @@ import pandas as pd
 import numpy as np
 
 from engine.wave_analysis import find_valid_wave_entry, Wave, Retracement
+from engine.regimes import regime_asof
 from engine.confluence import calculate_confluence, check_confluence_alignment, ConfluenceSignal
 from engine.ict_confluence import (
     calculate_ict_confluence, 
@@ -93,7 +94,10 @@ def generate_wave_signals(
         session_start: (hour, minute) for session start (default: 9:45 AM)
         session_end: (hour, minute) for session end (default: 3:45 PM)
         use_ict_boost: Enable ICT confluence boost (default: True)
-        target_mode: 'wave' for wave-based targets or 'fixed_pct' for % targets (default: 'wave')
+        target_mode: 'wave' for wave-based targets or 'fixed_pct' for % targets (default: 'wave').
+                     Raw wave and fixed % targets are also recorded in each signal's meta
+                     (wave_tp1/wave_tp2, fixed_tp1/fixed_tp2/fixed_stop), so comparing
+                     target modes needs only one call
         require_sweep: Only trade when liquidity sweep present (default: False)
         use_volume_filter: Require above-average volume on wave (default: False)
         avoid_lunch_chop: Skip 12:00-13:30 ET lunch period (default: False)
@@ -110,6 +114,9 @@ def generate_wave_signals(
     if use_volume_filter and 'volume' in df_1min.columns:
         volume_ma = df_1min['volume'].rolling(window=20).mean()
     
+    # Regime at each brick time, looked up once via as-of merge
+    brick_regimes = regime_asof(df_1min, renko_df['timestamp'])
+    
     for idx in range(min_bricks, len(renko_df)):
         brick = renko_df.iloc[idx]
         timestamp = brick['timestamp']
@@ -202,6 +209,17 @@ def generate_wave_signals(
         if not is_aligned:
             continue
         
+        # Fixed % targets (v3 proven approach): TP1 +1%, TP2 +2%, Stop -0.7%
+        # Always computed so a single pass carries both fixed % and wave targets
+        if signal_direction == 'long':
+            fixed_tp1 = current_price * 1.01  # +1%
+            fixed_tp2 = current_price * 1.02  # +2%
+            fixed_stop = current_price * 0.993  # -0.7%
+        else:  # short
+            fixed_tp1 = current_price * 0.99  # -1%
+            fixed_tp2 = current_price * 0.98  # -2%
+            fixed_stop = current_price * 1.007  # +0.7%
+        
         # TARGET CALCULATION: Swing-based, dynamic ATR, fixed %, or wave-based
         if target_mode == 'swing_75':
             # Swing-based targeting: 75% of recent swing range, min 2:1 RR
@@ -257,16 +275,7 @@ def generate_wave_signals(
                 tp2 = current_price * 0.995   # -0.5%
                 stop = current_price * 1.0025  # +0.25%
         elif target_mode == 'fixed_pct':
-            # Fixed % targets (v3 proven approach)
-            # TP1: +1%, TP2: +2%, Stop: -0.7%
-            if signal_direction == 'long':
-                tp1 = current_price * 1.01  # +1%
-                tp2 = current_price * 1.02  # +2%
-                stop = current_price * 0.993  # -0.7%
-            else:  # short
-                tp1 = current_price * 0.99  # -1%
-                tp2 = current_price * 0.98  # -2%
-                stop = current_price * 1.007  # +0.7%
+            tp1, tp2, stop = fixed_tp1, fixed_tp2, fixed_stop
         else:
             # Wave-based targets (v4 approach)
             tp1, tp2 = wave_tp1, wave_tp2
@@ -304,13 +313,10 @@ def generate_wave_signals(
                 )
         
         # REGIME FILTER: Get regime at this timestamp
-        regime_mask = df_1min['timestamp'] <= timestamp
-        if not regime_mask.any():
+        regime = brick_regimes[idx]
+        if regime is None:
             continue
         
-        regime_row = df_1min[regime_mask].iloc[-1]
-        regime = regime_row.get('regime', 'unknown')
-        
         # Regime alignment (allow sideways for both directions)
         if signal_direction == 'long' and regime not in ['bull_trend', 'sideways']:
             continue
@@ -375,6 +381,9 @@ def generate_wave_signals(
                 'vp_position': confluence.vp_position,
                 'wave_tp1': wave_tp1,
                 'wave_tp2': wave_tp2,
+                'fixed_tp1': fixed_tp1,
+                'fixed_tp2': fixed_tp2,
+                'fixed_stop': fixed_stop,
                 'target_mode': target_mode
             }
         )
@@ -25,27 +25,27 @@ def calculate_session_vwap(df: pd.DataFrame, session_start: time = time(9, 30),
     Returns:
         pd.Series: VWAP values for each bar
     """
-    df = df.copy()
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['date'] = df['timestamp'].dt.date
-    df['time'] = df['timestamp'].dt.time
-    
-    in_session = (df['time'] >= session_start) & (df['time'] <= session_end)
-    
-    df['typical_price'] = (df['high'] + df['low'] + df['close']) / 3
-    df['pv'] = df['typical_price'] * df['volume']
-    
-    df['vwap'] = np.nan
-    
-    for date, group_df in df[in_session].groupby('date'):
-        group_indices = group_df.index
-        cum_pv = group_df['pv'].cumsum().values
-        cum_vol = group_df['volume'].cumsum().values
-        
-        vwap_vals = np.divide(cum_pv, cum_vol, where=cum_vol > 0, out=np.full_like(cum_pv, np.nan))
-        df.loc[group_indices, 'vwap'] = vwap_vals
-    
-    return df['vwap']
+    timestamps = pd.to_datetime(df['timestamp'])
+    times = timestamps.dt.time
+    in_session = ((times >= session_start) & (times <= session_end)).to_numpy()
+    
+    # One pass over the arrays: typical price * volume, then per-day running sums
+    typical_price = (df['high'].to_numpy() + df['low'].to_numpy() + df['close'].to_numpy()) / 3
+    pv = (typical_price * df['volume'].to_numpy())[in_session]
+    volume = df['volume'].to_numpy()[in_session]
+    dates = timestamps.dt.date.to_numpy()[in_session]
+    
+    session_vwap = np.full(len(pv), np.nan)
+    day_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])  # Bars are in time order
+    for start, end in zip(day_starts, np.r_[day_starts[1:], len(dates)]):
+        cum_pv = np.cumsum(pv[start:end])
+        cum_vol = np.cumsum(volume[start:end])
+        np.divide(cum_pv, cum_vol, where=cum_vol > 0, out=session_vwap[start:end])
+    
+    vwap = np.full(len(df), np.nan)
+    vwap[in_session] = session_vwap
+    
+    return pd.Series(vwap, index=df.index, name='vwap')
 
 
 def calculate_daily_atr(df: pd.DataFrame, period: int = 20) -> pd.Series:
@@ -61,35 +61,34 @@ def calculate_daily_atr(df: pd.DataFrame, period: int = 20) -> pd.Series:
     Returns:
         pd.Series: Daily ATR values forward-filled to each intraday bar
     """
-    df = df.copy()
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['date'] = df['timestamp'].dt.date
-    
-    daily_data = []
-    for date, group in df.groupby('date'):
-        daily_data.append({
-            'date': date,
-            'high': group['high'].max(),
-            'low': group['low'].min(),
-            'close': group['close'].iloc[-1]
-        })
-    
-    daily = pd.DataFrame(daily_data)
-    daily['date'] = pd.to_datetime(daily['date'])
-    daily = daily.sort_values('date').reset_index(drop=True)
-    
-    daily['h-l'] = daily['high'] - daily['low']
-    daily['h-pc'] = abs(daily['high'] - daily['close'].shift(1))
-    daily['l-pc'] = abs(daily['low'] - daily['close'].shift(1))
-    daily['tr'] = daily[['h-l', 'h-pc', 'l-pc']].max(axis=1)
-    
-    daily['atr'] = daily['tr'].rolling(window=period, min_periods=1).mean()
-    
-    daily_dict = dict(zip(daily['date'].dt.date, daily['atr'].values))
-    
-    df['daily_atr'] = df['date'].map(daily_dict)
-    
-    return df['daily_atr']
+    timestamps = pd.to_datetime(df['timestamp'])
+    day_codes, days = pd.factorize(timestamps.dt.normalize(), sort=True)
+    n_days = len(days)
+    valid = day_codes >= 0
+    codes = day_codes[valid]
+    
+    # Daily high/low/last close straight from the 1-minute arrays
+    high = df['high'].to_numpy(dtype=float)[valid]
+    low = df['low'].to_numpy(dtype=float)[valid]
+    close = df['close'].to_numpy(dtype=float)[valid]
+    
+    day_high = np.full(n_days, np.nan)
+    day_low = np.full(n_days, np.nan)
+    last_bar = np.full(n_days, -1)
+    np.fmax.at(day_high, codes, high)
+    np.fmin.at(day_low, codes, low)
+    np.maximum.at(last_bar, codes, np.arange(len(codes)))
+    day_close = close[last_bar]
+    
+    # True range (NaN-skipping max, first day is high - low)
+    prev_close = np.concatenate(([np.nan], day_close[:-1]))
+    tr = np.fmax(day_high - day_low, np.fmax(np.abs(day_high - prev_close), np.abs(day_low - prev_close)))
+    atr = pd.Series(tr).rolling(window=period, min_periods=1).mean().to_numpy()
+    
+    daily_atr = np.full(len(df), np.nan)
+    daily_atr[valid] = atr[codes]
+    
+    return pd.Series(daily_atr, index=df.index, name='daily_atr')
 
 
 def calculate_session_range(df: pd.DataFrame, current_idx: int) -> tuple:
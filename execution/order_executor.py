@@ -9,11 +9,14 @@ Provides a unified interface for:
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
-import random
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+_RNG_BATCH = 1024  # Uniform draws generated per refill of the fill simulator
+
 
 @dataclass
 class OrderFill:
@@ -42,6 +45,10 @@ class OrderExecutor:
         """
         self.mode = mode
         self.config = kwargs
+        # Per-executor generator; config 'seed' makes simulated fills reproducible
+        self._rng = np.random.default_rng(kwargs.get('seed'))
+        self._rng_buf = self._rng.random(_RNG_BATCH)
+        self._rng_i = 0
         logger.info(f"OrderExecutor initialized in {mode} mode")
     
     def execute_spread_exit(
@@ -68,6 +75,15 @@ class OrderExecutor:
         else:
             raise ValueError(f"Unknown executor mode: {self.mode}")
     
+    def _uniform(self, low: float, high: float) -> float:
+        """Draw from U[low, high) using a pre-generated batch of samples."""
+        if self._rng_i == _RNG_BATCH:
+            self._rng_buf = self._rng.random(_RNG_BATCH)
+            self._rng_i = 0
+        u = self._rng_buf[self._rng_i]
+        self._rng_i += 1
+        return low + (high - low) * float(u)
+    
     def _simulate_spread_fill(
         self,
         spread: 'VerticalSpread',
@@ -105,7 +121,7 @@ class OrderExecutor:
         min_slippage_pct = slippage_config.get('min_pct', 0.001)  # 0.1%
         max_slippage_pct = slippage_config.get('max_pct', 0.020)  # 2.0%
         
-        slippage_pct = random.uniform(min_slippage_pct, max_slippage_pct)
+        slippage_pct = self._uniform(min_slippage_pct, max_slippage_pct)
         slippage_amount = natural_price * slippage_pct
         
         # Apply slippage (we receive less when closing)
@@ -126,7 +142,7 @@ class OrderExecutor:
             return None  # Fill rejected
         
         # Simulate latency (10-150ms)
-        latency_ms = random.uniform(10, 150)
+        latency_ms = self._uniform(10, 150)
         
         # CRITICAL: Apply latency to fill timestamp for realistic timing
         from datetime import timedelta
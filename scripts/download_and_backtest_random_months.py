@@ -23,7 +23,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from engine.data_provider import CSVDataProvider
 from engine.sessions_liquidity import label_sessions, add_session_highs_lows
 from engine.renko import build_renko, get_renko_direction_series
-from engine.regimes import detect_regime
+from engine.regimes import detect_regime, align_regime_to_bars
 from engine.strategy_wave_renko import generate_wave_signals
 from engine.strategy import Signal
 from engine.backtest import Backtest
@@ -179,14 +179,7 @@ def run_backtest_on_month(data_path: Path) -> dict:
     regime_30min = detect_regime(df_30min, renko_direction_30min, lookback=20)
     
     # Align regime to 1-min data
-    df_1min['regime'] = 'sideways'
-    for idx in range(len(df_1min)):
-        ts = df_1min['timestamp'].iloc[idx]
-        mask = df_30min['timestamp'] <= ts
-        if mask.any():
-            regime_idx = mask.sum() - 1
-            if regime_idx < len(regime_30min):
-                df_1min.loc[df_1min.index[idx], 'regime'] = regime_30min.iloc[regime_idx]
+    df_1min['regime'] = align_regime_to_bars(df_1min, df_30min, regime_30min)
     
     # Generate signals
     wave_signals = generate_wave_signals(
@@ -6,10 +6,25 @@ Uses Polygon API to fetch intraday bars for backtesting.
 
 import os
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
+from dateutil.tz import tzlocal
+import numpy as np
 import pandas as pd
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
 # Get Polygon API key
 API_KEY = os.environ.get('POLYGON_API_KEY')
 
@@ -35,93 +50,123 @@ print(f"ATR %: {atr_pct:.2f}%")
 print(f"VIX Proxy: ~{realized_vol * 0.7:.1f}")
 print()
 
-# Polygon rate limits: 5 requests/min for free tier
-# We'll need to fetch data in chunks
-
-all_bars = []
-current_date = start_date
+# Polygon rate limits: 5 requests/min for free tier (12s spacing).
+# Paid plans can lower the spacing, e.g. POLYGON_REQUEST_INTERVAL=0.2
+REQUEST_INTERVAL = float(os.environ.get('POLYGON_REQUEST_INTERVAL', 12))
+
+# Per-page column arrays, concatenated once at the end
+COLUMNS = {'t': 'timestamp', 'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'}
+chunks = {key: [] for key in COLUMNS}
+total_bars = 0
+
+# One keep-alive connection for every page; transient 5xx errors are retried
+# with backoff (429s are handled below with the longer rate-limit wait)
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+))
+
+# A single range request; Polygon pages it (up to 50,000 bars each) via next_url
+url = (
+    "https://api.polygon.io/v2/aggs/ticker/QQQ/range/1/minute/"
+    f"{start_date.strftime('%Y-%m-%d')}/{end_date.strftime('%Y-%m-%d')}"
+)
+params = {
+    'adjusted': 'true',
+    'sort': 'asc',
+    'limit': 50000,
+    'apiKey': API_KEY
+}
+page = 1
+failed = False  # Set when paging stops before next_url runs out
 
 print("Fetching data (this may take a few minutes due to rate limits)...")
 print()
 
-while current_date <= end_date:
-    # Fetch one day at a time
-    date_str = current_date.strftime('%Y-%m-%d')
-    
-    url = f"https://api.polygon.io/v2/aggs/ticker/QQQ/range/1/minute/{date_str}/{date_str}"
-    params = {
-        'adjusted': 'true',
-        'sort': 'asc',
-        'limit': 50000,
-        'apiKey': API_KEY
-    }
-    
-    print(f"Fetching {date_str}...", end=' ')
+while url:
+    print(f"Fetching page {page}...", end=' ')
     
     try:
-        response = requests.get(url, params=params)
+        response = session.get(url, params=params, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content) if orjson else response.json()
             
             if 'results' in data and len(data['results']) > 0:
-                for bar in data['results']:
-                    all_bars.append({
-                        'timestamp': datetime.fromtimestamp(bar['t'] / 1000),
-                        'open': bar['o'],
-                        'high': bar['h'],
-                        'low': bar['l'],
-                        'close': bar['c'],
-                        'volume': bar['v']
-                    })
-                print(f"✓ {len(data['results'])} bars")
+                results = data['results']
+                count = len(results)
+                for key in COLUMNS:
+                    dtype = np.int64 if key == 't' else np.float64
+                    chunks[key].append(np.fromiter((bar[key] for bar in results), dtype=dtype, count=count))
+                total_bars += count
+                print(f"✓ {count} bars")
             else:
-                print("⚠️  No data (likely weekend/holiday)")
+                print("⚠️  No data")
+            
+            # The cursor URL carries the query; only the key must be re-sent
+            url = data.get('next_url')
+            params = {'apiKey': API_KEY}
+            page += 1
         
         elif response.status_code == 429:
             print("⚠️  Rate limited, waiting 60s...")
             time.sleep(60)
-            continue  # Retry same date
+            continue  # Retry same page
         
         else:
             print(f"❌ Error {response.status_code}")
+            failed = True
+            break
     
     except Exception as e:
         print(f"❌ Exception: {e}")
+        failed = True
+        break
     
-    # Move to next day
-    current_date += timedelta(days=1)
-    
-    # Rate limit protection (free tier: 5 req/min)
-    time.sleep(12)  # Wait 12 seconds between requests
+    # Rate limit protection between pages only
+    if url:
+        time.sleep(REQUEST_INTERVAL)
 
 print()
-print(f"✓ Downloaded {len(all_bars)} 1-minute bars")
+print(f"✓ Downloaded {total_bars} 1-minute bars")
 print()
 
-if len(all_bars) == 0:
+if failed:
+    # One cursor covers the whole range, so a failed page loses everything after it
+    print(f"❌ PARTIAL download: stopped at page {page} - not writing a truncated dataset")
+    exit(1)
+
+if total_bars == 0:
     print("❌ No data downloaded")
     exit(1)
 
-# Convert to DataFrame and save
-df = pd.DataFrame(all_bars)
+# Convert to DataFrame and save (timestamps as naive local time, as before)
+columns = {COLUMNS[key]: np.concatenate(arrays) for key, arrays in chunks.items()}
+columns['timestamp'] = (
+    pd.to_datetime(columns['timestamp'], unit='ms', utc=True)
+    .tz_convert(tzlocal())
+    .tz_localize(None)
+)
+df = pd.DataFrame(columns)
 df = df.sort_values('timestamp').reset_index(drop=True)
 
 # Filter to market hours only (9:30-16:00 ET)
-df['hour'] = df['timestamp'].dt.hour
-df['minute'] = df['timestamp'].dt.minute
-df = df[
-    ((df['hour'] > 9) | ((df['hour'] == 9) & (df['minute'] >= 30))) &
-    (df['hour'] < 16)
-].copy()
-df = df.drop(columns=['hour', 'minute'])
+# Naive wall-clock timestamps: minute of day straight from the int64 nanoseconds
+minute_of_day = (df['timestamp'].to_numpy().view('i8') // 60_000_000_000) % 1440
+df = df[(minute_of_day >= 570) & (minute_of_day < 960)].copy()  # 9:30 <= t < 16:00
 
 print(f"✓ Filtered to market hours: {len(df)} bars")
 print()
 
 # Save to CSV
 output_file = 'data/QQQ_1m_ultralowvol_2017.csv'
-df.to_csv(output_file, index=False)
+if pa is not None:
+    # Arrow's C++ writer; same columns, no index
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output_file)
+else:
+    df.to_csv(output_file, index=False)
 
 print("="*70)
 print("DOWNLOAD COMPLETE")
@@ -5,10 +5,17 @@ Uses weekly chunks to minimize API calls.
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 import pandas as pd
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 API_KEY = os.environ.get('POLYGON_API_KEY')
 
 # Load best window
@@ -21,6 +28,12 @@ print(f"Downloading QQQ 1m: {start_date.date()} to {end_date.date()}")
 print("Using weekly chunks to reduce API calls...")
 print()
 
+# Reuse one connection across chunks; retry transient 5xx errors with backoff
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504])
+))
+
 all_bars = []
 current = start_date
 
@@ -34,10 +47,10 @@ while current <= end_date:
     print(f"{current.date()} to {chunk_end.date()}...", end=' ')
     
     try:
-        resp = requests.get(url, params=params, timeout=30)
+        resp = session.get(url, params=params, timeout=30)
         
         if resp.status_code == 200:
-            data = resp.json()
+            data = orjson.loads(resp.content) if orjson else resp.json()
             if 'results' in data:
                 count = len(data['results'])
                 for bar in data['results']:
@@ -67,10 +80,9 @@ print(f"\n✓ Total: {len(all_bars)} bars")
 df = pd.DataFrame(all_bars).sort_values('timestamp').reset_index(drop=True)
 
 # Market hours only
-df['hour'] = df['timestamp'].dt.hour
-df['minute'] = df['timestamp'].dt.minute
-df = df[((df['hour'] > 9) | ((df['hour'] == 9) & (df['minute'] >= 30))) & (df['hour'] < 16)].copy()
-df = df.drop(columns=['hour', 'minute'])
+# Naive wall-clock timestamps: minute of day straight from the int64 nanoseconds
+minute_of_day = (df['timestamp'].to_numpy().view('i8') // 60_000_000_000) % 1440
+df = df[(minute_of_day >= 570) & (minute_of_day < 960)].copy()  # 9:30 <= t < 16:00
 
 df.to_csv('data/QQQ_1m_ultralowvol_2017.csv', index=False)
 print(f"\n✅ Saved {len(df)} bars to data/QQQ_1m_ultralowvol_2017.csv")
@@ -10,7 +10,7 @@ Detects Japanese candlestick reversal patterns:
 """
 
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import List, Literal
 import pandas as pd
 import numpy as np
 
@@ -49,277 +49,116 @@ class HommaPatternDetector:
         df['range'] = df['high'] - df['low']
         df['avg_body'] = df['body'].rolling(20, min_periods=1).mean()
         
-        for i in range(max(start_idx, 2), len(df) - 1):
-            hammer = self._detect_hammer(df, i)
-            if hammer:
-                patterns.append(hammer)
-                continue
-            
-            shooting_star = self._detect_shooting_star(df, i)
-            if shooting_star:
-                patterns.append(shooting_star)
-                continue
-            
-            if i >= 1:
-                engulf_bull = self._detect_bullish_engulfing(df, i)
-                if engulf_bull:
-                    patterns.append(engulf_bull)
-                    continue
-                
-                engulf_bear = self._detect_bearish_engulfing(df, i)
-                if engulf_bear:
-                    patterns.append(engulf_bear)
-                    continue
-                
-                harami_bull = self._detect_bullish_harami(df, i)
-                if harami_bull:
-                    patterns.append(harami_bull)
-                    continue
-                
-                harami_bear = self._detect_bearish_harami(df, i)
-                if harami_bear:
-                    patterns.append(harami_bear)
-                    continue
-            
-            doji_bull = self._detect_doji_bullish(df, i)
-            if doji_bull:
-                patterns.append(doji_bull)
-                continue
-            
-            doji_bear = self._detect_doji_bearish(df, i)
-            if doji_bear:
-                patterns.append(doji_bear)
+        # Patterns in priority order; the first match on a bar wins
+        detections = self._pattern_masks(df)
+        any_match = np.logical_or.reduce([mask for _, _, mask, _ in detections])
+        any_match[:max(start_idx, 2)] = False
+        any_match[len(df) - 1:] = False
+        
+        close = df['close'].to_numpy()
+        timestamps = df['timestamp']
+        
+        for i in np.flatnonzero(any_match):
+            for pattern_type, direction, mask, strength in detections:
+                if mask[i]:
+                    patterns.append(HommaPattern(
+                        index=int(i),
+                        pattern_type=pattern_type,
+                        direction=direction,
+                        timestamp=timestamps.iloc[i],
+                        price=close[i],
+                        strength=strength[i]
+                    ))
+                    break
         
         return patterns
     
-    def _detect_hammer(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        row = df.iloc[i]
-        
-        if row['range'] == 0:
-            return None
-        
-        body_position = (min(row['open'], row['close']) - row['low']) / row['range']
-        
-        if body_position < 0.7:
-            return None
-        
-        if row['lower_wick'] < self.hammer_wick_ratio * row['body']:
-            return None
-        
-        if row['upper_wick'] > row['body'] * 0.3:
-            return None
-        
-        next_row = df.iloc[i + 1]
-        if next_row['close'] <= row['close']:
-            return None
-        
-        strength = row['lower_wick'] / row['body'] if row['body'] > 0 else 0
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='hammer',
-            direction='bullish',
-            timestamp=row['timestamp'],
-            price=row['close'],
-            strength=strength
-        )
-    
-    def _detect_shooting_star(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        row = df.iloc[i]
-        
-        if row['range'] == 0:
-            return None
-        
-        body_position = (row['high'] - max(row['open'], row['close'])) / row['range']
-        
-        if body_position < 0.7:
-            return None
-        
-        if row['upper_wick'] < self.hammer_wick_ratio * row['body']:
-            return None
-        
-        if row['lower_wick'] > row['body'] * 0.3:
-            return None
-        
-        next_row = df.iloc[i + 1]
-        if next_row['close'] >= row['close']:
-            return None
-        
-        strength = row['upper_wick'] / row['body'] if row['body'] > 0 else 0
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='shooting_star',
-            direction='bearish',
-            timestamp=row['timestamp'],
-            price=row['close'],
-            strength=strength
-        )
-    
-    def _detect_bullish_engulfing(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        prev = df.iloc[i - 1]
-        curr = df.iloc[i]
-        
-        if prev['close'] >= prev['open']:
-            return None
-        
-        if curr['close'] <= curr['open']:
-            return None
-        
-        if curr['open'] >= prev['close']:
-            return None
-        
-        if curr['close'] <= prev['open']:
-            return None
-        
-        ratio = curr['body'] / prev['body'] if prev['body'] > 0 else 0
-        
-        if ratio < self.engulfing_min_ratio:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='bullish_engulfing',
-            direction='bullish',
-            timestamp=curr['timestamp'],
-            price=curr['close'],
-            strength=ratio
-        )
-    
-    def _detect_bearish_engulfing(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        prev = df.iloc[i - 1]
-        curr = df.iloc[i]
+    def _pattern_masks(self, df: pd.DataFrame):
+        """
+        Evaluate every pattern on all bars at once.
         
-        if prev['close'] <= prev['open']:
-            return None
+        Each condition is written as a negated rejection so NaN bars are
+        handled the same way as the original per-bar checks.
         
-        if curr['close'] >= curr['open']:
-            return None
-        
-        if curr['open'] <= prev['close']:
-            return None
-        
-        if curr['close'] >= prev['open']:
-            return None
-        
-        ratio = curr['body'] / prev['body'] if prev['body'] > 0 else 0
-        
-        if ratio < self.engulfing_min_ratio:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='bearish_engulfing',
-            direction='bearish',
-            timestamp=curr['timestamp'],
-            price=curr['close'],
-            strength=ratio
+        Args:
+            df: Bars with body/upper_wick/lower_wick/range/avg_body columns
+            
+        Returns:
+            List of (pattern_type, direction, mask, strength) in priority order
+        """
+        def prev(x):
+            return np.concatenate(([np.nan], x[:-1]))
+        
+        def nxt(x):
+            return np.append(x[1:], np.nan)
+        
+        o = df['open'].to_numpy(dtype=float)
+        h = df['high'].to_numpy(dtype=float)
+        l = df['low'].to_numpy(dtype=float)
+        c = df['close'].to_numpy(dtype=float)
+        body = df['body'].to_numpy(dtype=float)
+        upper_wick = df['upper_wick'].to_numpy(dtype=float)
+        lower_wick = df['lower_wick'].to_numpy(dtype=float)
+        bar_range = df['range'].to_numpy(dtype=float)
+        avg_body = df['avg_body'].to_numpy(dtype=float)
+        
+        prev_o, prev_h, prev_l, prev_c, prev_body = prev(o), prev(h), prev(l), prev(c), prev(body)
+        next_o, next_c, next_body = nxt(o), nxt(c), nxt(body)
+        has_range = bar_range != 0
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lower_position = lower_wick / bar_range
+            upper_position = upper_wick / bar_range
+            body_ratio = body / bar_range
+            hammer_strength = np.where(body > 0, lower_wick / body, 0)
+            star_strength = np.where(body > 0, upper_wick / body, 0)
+            engulf_ratio = np.where(prev_body > 0, body / prev_body, 0)
+            follow_strength = next_body / avg_body
+        
+        hammer = (
+            has_range
+            & ~(lower_position < 0.7)
+            & ~(lower_wick < self.hammer_wick_ratio * body)
+            & ~(upper_wick > body * 0.3)
+            & ~(next_c <= c)
         )
-    
-    def _detect_bullish_harami(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        if i < 1 or i >= len(df) - 1:
-            return None
-        
-        mother = df.iloc[i - 1]
-        inside = df.iloc[i]
-        breakout = df.iloc[i + 1]
-        
-        if mother['close'] >= mother['open']:
-            return None
-        
-        if inside['high'] > mother['high'] or inside['low'] < mother['low']:
-            return None
-        
-        if breakout['close'] <= mother['high']:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='bullish_harami',
-            direction='bullish',
-            timestamp=inside['timestamp'],
-            price=inside['close'],
-            strength=1.0
+        shooting_star = (
+            has_range
+            & ~(upper_position < 0.7)
+            & ~(upper_wick < self.hammer_wick_ratio * body)
+            & ~(lower_wick > body * 0.3)
+            & ~(next_c >= c)
         )
-    
-    def _detect_bearish_harami(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        if i < 1 or i >= len(df) - 1:
-            return None
-        
-        mother = df.iloc[i - 1]
-        inside = df.iloc[i]
-        breakout = df.iloc[i + 1]
-        
-        if mother['close'] <= mother['open']:
-            return None
-        
-        if inside['high'] > mother['high'] or inside['low'] < mother['low']:
-            return None
-        
-        if breakout['close'] >= mother['low']:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='bearish_harami',
-            direction='bearish',
-            timestamp=inside['timestamp'],
-            price=inside['close'],
-            strength=1.0
-        )
-    
-    def _detect_doji_bullish(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        if i >= len(df) - 1:
-            return None
-        
-        doji = df.iloc[i]
-        follow = df.iloc[i + 1]
-        
-        if doji['range'] == 0:
-            return None
-        
-        if doji['body'] / doji['range'] > self.doji_body_ratio:
-            return None
-        
-        if follow['close'] <= follow['open']:
-            return None
-        
-        if follow['body'] < self.follow_through_min_body * doji['avg_body']:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='doji_bullish',
-            direction='bullish',
-            timestamp=doji['timestamp'],
-            price=doji['close'],
-            strength=follow['body'] / doji['avg_body']
+        bullish_engulfing = (
+            ~(prev_c >= prev_o)
+            & ~(c <= o)
+            & ~(o >= prev_c)
+            & ~(c <= prev_o)
+            & ~(engulf_ratio < self.engulfing_min_ratio)
         )
-    
-    def _detect_doji_bearish(self, df: pd.DataFrame, i: int) -> Optional[HommaPattern]:
-        if i >= len(df) - 1:
-            return None
-        
-        doji = df.iloc[i]
-        follow = df.iloc[i + 1]
-        
-        if doji['range'] == 0:
-            return None
-        
-        if doji['body'] / doji['range'] > self.doji_body_ratio:
-            return None
-        
-        if follow['close'] >= follow['open']:
-            return None
-        
-        if follow['body'] < self.follow_through_min_body * doji['avg_body']:
-            return None
-        
-        return HommaPattern(
-            index=i,
-            pattern_type='doji_bearish',
-            direction='bearish',
-            timestamp=doji['timestamp'],
-            price=doji['close'],
-            strength=follow['body'] / doji['avg_body']
+        bearish_engulfing = (
+            ~(prev_c <= prev_o)
+            & ~(c >= o)
+            & ~(o <= prev_c)
+            & ~(c >= prev_o)
+            & ~(engulf_ratio < self.engulfing_min_ratio)
         )
+        inside_bar = ~((h > prev_h) | (l < prev_l))
+        bullish_harami = ~(prev_c >= prev_o) & inside_bar & ~(next_c <= prev_h)
+        bearish_harami = ~(prev_c <= prev_o) & inside_bar & ~(next_c >= prev_l)
+        doji = has_range & ~(body_ratio > self.doji_body_ratio)
+        strong_follow = ~(next_body < self.follow_through_min_body * avg_body)
+        doji_bullish = doji & ~(next_c <= next_o) & strong_follow
+        doji_bearish = doji & ~(next_c >= next_o) & strong_follow
+        
+        harami_strength = np.ones(len(df))
+        return [
+            ('hammer', 'bullish', hammer, hammer_strength),
+            ('shooting_star', 'bearish', shooting_star, star_strength),
+            ('bullish_engulfing', 'bullish', bullish_engulfing, engulf_ratio),
+            ('bearish_engulfing', 'bearish', bearish_engulfing, engulf_ratio),
+            ('bullish_harami', 'bullish', bullish_harami, harami_strength),
+            ('bearish_harami', 'bearish', bearish_harami, harami_strength),
+            ('doji_bullish', 'bullish', doji_bullish, follow_strength),
+            ('doji_bearish', 'bearish', doji_bearish, follow_strength),
+        ]
@@ -366,10 +366,11 @@ class SmartMoneyZoneDetector:
                 return future['low'].min()
     
     def _mark_touched_zones(self, df: pd.DataFrame, zones: List[SmartMoneyZone]):
+        # Raw arrays read once; each zone is one vectorized overlap test
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        
         for zone in zones:
-            future = df.iloc[zone.index + 15:]
-            
-            for idx, row in future.iterrows():
-                if row['low'] <= zone.zone_high and row['high'] >= zone.zone_low:
-                    zone.touched = True
-                    break
+            start = zone.index + 15
+            if np.count_nonzero((low[start:] <= zone.zone_high) & (high[start:] >= zone.zone_low)):
+                zone.touched = True
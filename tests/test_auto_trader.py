@@ -0,0 +1,228 @@
+"""
+Tests for the automated dual trader: signal targets and state recovery.
+"""
+
+import json
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+import engine.auto_trader as auto_trader
+from engine.auto_trader import AutomatedDualTrader, TRADE_DTYPE, TRADE_RING_SIZE, _dump_line
+from engine.strategy_shared import wilder_atr_array
+
+
+def _bare_trader(tmp_path):
+    """Trader with file paths and empty state, skipping the data clients."""
+    trader = AutomatedDualTrader.__new__(AutomatedDualTrader)
+    trader.state_file = str(tmp_path / 'trader_state.json')
+    trader.events_file = str(tmp_path / 'trader_state_events.ndjson')
+    trader.closed_file = str(tmp_path / 'trader_state_closed.ndjson')
+    trader.state_lock = threading.Lock()
+    trader.exit_lock = threading.Lock()
+    trader.starting_balance = 25000
+    trader.account_balance = 25000
+    trader.positions = {'conservative': [], 'aggressive': []}
+    trader.stats = {
+        'conservative': {'trades': 0, 'wins': 0, 'total_pnl': 0.0},
+        'aggressive': {'trades': 0, 'wins': 0, 'total_pnl': 0.0}
+    }
+    trader.trade_history = []
+    return trader
+
+
+def _streaming_trader(position=None):
+    """Trader with one optional open position and the trade-stream state."""
+    trader = AutomatedDualTrader.__new__(AutomatedDualTrader)
+    trader.max_hold_seconds = 3600
+    trader.positions = {'conservative': [position] if position else [], 'aggressive': []}
+    trader.trade_ring = {'QQQ': np.zeros(TRADE_RING_SIZE, dtype=TRADE_DTYPE)}
+    trader.trade_count = {'QQQ': 0}
+    trader.exit_lock = threading.Lock()
+    trader._stream_prices = {}
+    trader._stream_lock = threading.Lock()
+    trader._stream_event = threading.Event()
+    trader._exit_retry = {}
+    trader.options_fetcher = MagicMock()
+    trader._reset_open_book()
+    return trader
+
+
+def _open_position():
+    """Long QQQ position whose target a 401 print reaches."""
+    return {
+        'strategy': 'conservative', 'status': 'open', 'symbol': 'QQQ', 'direction': 'LONG',
+        'entry_time': datetime.now(), 'target_price': 400.0,
+        'option_contract': 'O:QQQ240102C00400000', 'num_contracts': 2, 'premium_paid': 300.0
+    }
+
+
+def _trade(price, symbol='QQQ', timestamp=1704207600000):
+    """Fake EquityTrade message (timestamp in Unix ms)."""
+    return SimpleNamespace(symbol=symbol, price=price, timestamp=timestamp)
+
+
+def test_trade_stream_hands_latest_print_to_exit_worker():
+    """Test the stream callback queues only the latest price per symbol for one exit check."""
+    trader = _streaming_trader(_open_position())
+    checked = []
+    trader.check_exits = checked.append
+    
+    trader._handle_trades([_trade(399.0), _trade(399.5), SimpleNamespace(status='success')])
+    trader._handle_trades([_trade(401.0)])
+    
+    assert checked == []  # The callback itself never runs exit checks
+    assert trader._stream_event.is_set()
+    assert trader.trade_count['QQQ'] == 3
+    
+    trader._drain_stream_exits()
+    trader._drain_stream_exits()
+    
+    assert checked == [{'QQQ': 401.0}]
+
+
+def test_latest_trade_price_uses_exchange_time(monkeypatch):
+    """Test streamed prices go stale by trade time, not by when they arrived."""
+    trader = _streaming_trader()
+    now = 1_704_207_600.0
+    monkeypatch.setattr(auto_trader.time, 'time', lambda: now)
+    
+    # A delayed-feed print arriving now but executed 15 minutes ago
+    trader._handle_trades([_trade(401.0, timestamp=(now - 900) * 1000)])
+    assert trader.latest_trade_price('QQQ') is None
+    
+    trader._handle_trades([_trade(402.0, timestamp=(now - 2) * 1000)])
+    assert trader.latest_trade_price('QQQ') == 402.0
+
+
+def test_failed_exit_quote_backs_off(monkeypatch):
+    """Test a failed exit quote is not retried on every print, only after the backoff."""
+    trader = _streaming_trader(_open_position())
+    trader.options_fetcher.get_exit_price.return_value = None
+    clock = [1_000_000.0]
+    monkeypatch.setattr(auto_trader.time, 'time', lambda: clock[0])
+    
+    for _ in range(5):
+        trader._handle_trades([_trade(401.0)])
+        trader._drain_stream_exits()
+        clock[0] += 1.0
+    
+    assert trader.options_fetcher.get_exit_price.call_count == 1
+    
+    clock[0] += auto_trader.EXIT_RETRY_BASE_S
+    trader._handle_trades([_trade(401.0)])
+    trader._drain_stream_exits()
+    
+    assert trader.options_fetcher.get_exit_price.call_count == 2
+    assert trader.positions['conservative'][0]['status'] == 'open'
+
+
+def test_signal_target_uses_wilder_atr(monkeypatch):
+    """Test signal ATR and target come from the Wilder ATR, not displacement's SMA."""
+    n = 60
+    rng = np.random.default_rng(7)
+    close = 400 + np.cumsum(rng.normal(0, 0.5, n))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 10:00', periods=n, freq='1min', tz='America/New_York'),
+        'open': close - 0.1,
+        'high': close + rng.uniform(0.2, 1.5, n),
+        'low': close - rng.uniform(0.2, 1.5, n),
+        'close': close,
+        'volume': 1000,
+    })
+    
+    real_detect = auto_trader.detect_all_structures
+    
+    def detect_with_setup(frame, **kwargs):
+        # Bullish sweep, displacement and MSS on consecutive bars inside the scan window
+        frame = real_detect(frame, **kwargs)
+        for column in ('sweep_bullish', 'sweep_bearish', 'displacement_bullish',
+                       'displacement_bearish', 'mss_bullish', 'mss_bearish'):
+            frame[column] = False
+        frame.loc[n - 8, 'sweep_bullish'] = True
+        frame.loc[n - 7, 'displacement_bullish'] = True
+        frame.loc[n - 6, 'mss_bullish'] = True
+        return frame
+    
+    monkeypatch.setattr(auto_trader, 'detect_all_structures', detect_with_setup)
+    
+    trader = AutomatedDualTrader.__new__(AutomatedDualTrader)
+    trader.atr_multiple = 5.0
+    trader.last_signal_ns = {'QQQ': None}
+    trader.last_scan_key = {}
+    
+    signals = trader.detect_signals('QQQ', df)
+    
+    assert len(signals) == 1
+    expected_atr = wilder_atr_array(df)[n - 8]
+    assert signals[0]['atr'] == pytest.approx(expected_atr)
+    assert signals[0]['target'] == pytest.approx(close[n - 8] + 5.0 * expected_atr)
+
+
+def test_restart_does_not_duplicate_trade_closed_after_snapshot(tmp_path):
+    """Test a position opened and closed after the snapshot is restored once."""
+    trader = _bare_trader(tmp_path)
+    
+    snapshot = {
+        'account_balance': 25000,
+        'positions': {'conservative': [], 'aggressive': []},
+        'stats': trader.stats,
+        'trade_history': [],
+        'closed_file': trader.closed_file,
+        'last_updated': '2024-01-02T10:00:00'
+    }
+    with open(trader.state_file, 'w') as f:
+        json.dump(snapshot, f)
+    
+    opened = {
+        'strategy': 'conservative', 'status': 'open', 'direction': 'LONG',
+        'entry_time': '2024-01-02T10:05:00', 'option_contract': 'O:QQQ240102C00400000'
+    }
+    closed = dict(opened, status='closed', pnl=120.0)
+    trade = {'strategy': 'conservative', 'pnl': 120.0, 'exit_time': '2024-01-02T10:20:00'}
+    stats = {'trades': 1, 'wins': 1, 'total_pnl': 120.0}
+    
+    with open(trader.events_file, 'w') as f:
+        f.write(_dump_line({'t': '2024-01-02T10:05:00', 'kind': 'open', 'strategy': 'conservative',
+                            'position': opened, 'account_balance': 25000}) + '\n')
+        f.write(_dump_line({'t': '2024-01-02T10:20:00', 'kind': 'close', 'strategy': 'conservative',
+                            'position': closed, 'account_balance': 25120, 'stats': stats,
+                            'trade': trade}) + '\n')
+    with open(trader.closed_file, 'w') as f:
+        f.write(_dump_line({'strategy': 'conservative', 'position': closed, 'trade': trade}) + '\n')
+    
+    trader._closed_fh = open(trader.closed_file, 'a', buffering=1)
+    try:
+        trader.load_state()
+    finally:
+        trader._closed_fh.close()
+    
+    assert trader.trade_history == [trade]
+    assert [p['status'] for p in trader.positions['conservative']] == ['closed']
+    assert trader.account_balance == 25120
+    with open(trader.closed_file) as f:
+        assert len(f.readlines()) == 1
+
+
+def test_save_state_waits_for_exit_in_progress(tmp_path):
+    """Test a snapshot is not taken while the exit worker holds exit_lock."""
+    trader = _bare_trader(tmp_path)
+    trader.last_startup_notification = None
+    trader.last_market_open_notification = None
+    trader.heartbeat_timestamp = datetime.now()
+    trader.main_loop_timestamp = datetime.now()
+    
+    with trader.exit_lock:
+        saver = threading.Thread(target=trader.save_state)
+        saver.start()
+        saver.join(timeout=0.2)
+        assert saver.is_alive()
+    saver.join(timeout=5)
+    
+    assert not saver.is_alive()
+    with open(trader.state_file) as f:
+        assert json.load(f)['account_balance'] == 25000
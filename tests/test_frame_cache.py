@@ -0,0 +1,105 @@
+"""
+Tests for the on-disk intermediate frame cache.
+"""
+
+import importlib
+import os
+
+import pandas as pd
+import pytest
+import engine.frame_cache as frame_cache
+from engine.data_provider import CSVDataProvider
+from engine.frame_cache import cached
+
+
+def test_cached_hit_and_invalidation(tmp_path):
+    """Test cache hits skip recomputation and source mtime invalidates."""
+    source = tmp_path / 'bars.csv'
+    source.write_text('timestamp,close\n')
+    cache_dir = str(tmp_path / 'cache')
+    calls = []
+
+    def build():
+        calls.append(1)
+        return pd.DataFrame({'close': [1.0, 2.0, 3.0]})
+
+    first = cached('frame', ('a', 1), build, str(source), cache_dir)
+    second = cached('frame', ('a', 1), build, str(source), cache_dir)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # Different params miss
+    cached('frame', ('a', 2), build, str(source), cache_dir)
+    assert len(calls) == 2
+
+    # Touching the source invalidates
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cached('frame', ('a', 1), build, str(source), cache_dir)
+    assert len(calls) == 3
+
+
+def test_cached_code_change_invalidates(tmp_path, monkeypatch):
+    """Test editing a producing module's source misses the cache."""
+    source = tmp_path / 'bars.csv'
+    source.write_text('timestamp,close\n')
+    step = tmp_path / 'cached_step.py'
+    step.write_text('def build():\n    return 1\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('cached_step')
+    cache_dir = str(tmp_path / 'cache')
+    calls = []
+
+    def build():
+        calls.append(1)
+        return pd.DataFrame({'close': [1.0]})
+
+    cached('frame', (), build, str(source), cache_dir, code=(module.build,))
+    cached('frame', (), build, str(source), cache_dir, code=(module.build,))
+    assert len(calls) == 1
+
+    # Fingerprints are memoized per process; a new run sees the edited source
+    step.write_text('def build():\n    return 1000\n')
+    monkeypatch.setattr(frame_cache, '_module_digests', {})
+    cached('frame', (), build, str(source), cache_dir, code=(module.build,))
+    assert len(calls) == 2
+
+
+def test_cached_series_roundtrip(tmp_path):
+    """Test Series results come back as Series."""
+    source = tmp_path / 'bars.csv'
+    source.write_text('timestamp,close\n')
+    series = pd.Series(['bull_trend', 'sideways'])
+
+    cached('regime', (), lambda: series, str(source), str(tmp_path))
+    result = cached('regime', (), lambda: None, str(source), str(tmp_path))
+
+    pd.testing.assert_series_equal(result, series)
+
+
+def test_csv_provider_cache(tmp_path, monkeypatch):
+    """Test CSVDataProvider serves cached bars without reparsing the CSV."""
+    source = tmp_path / 'bars.csv'
+    source.write_text(
+        'timestamp,open,high,low,close,volume\n'
+        '2024-01-02T15:31:00Z,1,2,0.5,1.5,100\n'
+        '2024-01-02T15:30:00Z,1,2,0.5,1.2,200\n'
+    )
+    provider = CSVDataProvider(str(source), cache_dir=str(tmp_path / 'cache'))
+
+    first = provider.load_bars()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('CSV reparsed')
+
+    monkeypatch.setattr(pd, 'read_csv', fail)
+    second = provider.load_bars()
+
+    pd.testing.assert_frame_equal(first, second)
+    assert str(second['timestamp'].dt.tz) == 'America/New_York'
+    assert second['close'].tolist() == [1.2, 1.5]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
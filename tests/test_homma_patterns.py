@@ -0,0 +1,54 @@
+"""
+Tests for Homma candlestick pattern detection.
+"""
+
+import pandas as pd
+import pytest
+from strategies.homma_patterns import HommaPatternDetector
+
+
+def _bars(rows):
+    df = pd.DataFrame(rows, columns=['open', 'high', 'low', 'close'])
+    df.insert(0, 'timestamp', pd.date_range('2024-01-02 09:30', periods=len(df), freq='1min'))
+    return df
+
+
+def test_hammer_detected_with_strength():
+    """Test a long lower wick followed by a higher close is a hammer."""
+    df = _bars([
+        (100.0, 100.5, 99.5, 100.2),
+        (100.2, 100.6, 99.8, 100.1),
+        (100.0, 100.55, 98.0, 100.5),  # body 0.5, lower wick 2.0, upper wick 0.05
+        (100.5, 101.2, 100.4, 101.0),
+    ])
+
+    patterns = HommaPatternDetector().detect_patterns(df)
+
+    assert len(patterns) == 1
+    assert patterns[0].pattern_type == 'hammer'
+    assert patterns[0].index == 2
+    assert patterns[0].timestamp == df['timestamp'].iloc[2]
+    assert patterns[0].strength == pytest.approx(4.0)
+
+
+def test_engulfing_and_start_idx():
+    """Test bullish engulfing detection and that start_idx skips earlier bars."""
+    df = _bars([
+        (100.0, 100.5, 99.5, 100.2),
+        (100.2, 100.6, 99.8, 100.1),
+        (101.0, 101.1, 99.9, 100.0),  # bearish, body 1.0
+        (99.8, 101.6, 99.7, 101.5),   # bullish, engulfs with body 1.7
+        (101.5, 101.8, 101.3, 101.6),
+    ])
+    detector = HommaPatternDetector()
+
+    patterns = detector.detect_patterns(df)
+    engulfing = [p for p in patterns if p.pattern_type == 'bullish_engulfing']
+
+    assert [p.index for p in engulfing] == [3]
+    assert engulfing[0].strength == pytest.approx(1.7)
+    assert all(p.index >= 4 for p in detector.detect_patterns(df, start_idx=4))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -9,6 +9,7 @@ from engine.ict_structures import (
     detect_fvgs,
     calculate_atr
 )
+from engine.strategy_shared import wilder_atr_array, wilder_atr_last
 
 
 def test_calculate_atr():
@@ -25,6 +26,28 @@ def test_calculate_atr():
     assert atr.notna().sum() > 0
 
 
+def test_wilder_atr_array():
+    """Test Wilder ATR seeds with the mean true range, then follows the RMA recursion."""
+    df = pd.DataFrame({
+        'high': [102.0, 103.0, 107.0, 105.0, 104.0],
+        'low': [98.0, 99.0, 100.0, 101.0, 100.0],
+        'close': [100.0, 101.0, 106.0, 103.0, 101.0],
+    })
+    
+    atr = wilder_atr_array(df, period=3)
+    
+    # True range from the second bar: 4, 7, 5, 4 (bar 3: |101 - 106|)
+    assert np.isnan(atr[:3]).all()
+    assert atr[3] == pytest.approx((4 + 7 + 5) / 3)
+    assert atr[4] == pytest.approx((atr[3] * 2 + 4) / 3)
+    assert wilder_atr_last(df, period=3) == pytest.approx(atr[4])
+    assert np.isnan(wilder_atr_last(df.head(3), period=3))
+    
+    # NaN close on one bar: fmax keeps the true range from the other terms
+    df.loc[2, 'close'] = np.nan
+    assert wilder_atr_last(df, period=3) == pytest.approx(wilder_atr_array(df, period=3)[-1])
+
+
 def test_detect_fvgs():
     """Test Fair Value Gap detection."""
     df = pd.DataFrame({
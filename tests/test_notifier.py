@@ -0,0 +1,45 @@
+"""
+Tests for Pushover alert coalescing.
+"""
+
+import pytest
+from dashboard.notifier import MAX_MESSAGE_LEN, _coalesce
+
+
+def test_coalesce_merges_until_size_limit():
+    """Test normal alerts merge into one push and split at the size limit."""
+    small = [(f"body {i}", f"Title {i}", 0, None) for i in range(3)]
+    merged = _coalesce(small)
+    
+    assert len(merged) == 1
+    message, title, priority, sound = merged[0]
+    assert title == "3 MaxTrader alerts"
+    assert message == "\n---\n".join(f"Title {i}\nbody {i}" for i in range(3))
+    assert (priority, sound) == (0, None)
+    
+    big = [("x" * (MAX_MESSAGE_LEN // 2), f"Big {i}", -1, None) for i in range(3)]
+    merged = _coalesce(big)
+    
+    assert len(merged) == 3  # Two halves plus headers overflow one push
+    assert all(len(item[0]) <= MAX_MESSAGE_LEN for item in merged)
+    assert merged[0] == big[0]
+
+
+def test_coalesce_sends_high_priority_alone():
+    """Test priority >= 1 alerts keep their own title and sound, in queue order."""
+    breaker = ("Drawdown reached 5.2% from peak", "⚠️ CIRCUIT BREAKER", 1, "siren")
+    batch = [
+        ("a", "Entry", 0, None),
+        ("b", "Exit", 0, None),
+        breaker,
+        ("c", "Exit", 0, None),
+    ]
+    
+    merged = _coalesce(batch)
+    
+    assert [item[1] for item in merged] == ["2 MaxTrader alerts", "⚠️ CIRCUIT BREAKER", "Exit"]
+    assert merged[1] == breaker
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -7,7 +7,8 @@ from engine.options_engine import (
     estimate_option_premium,
     build_long_option,
     build_debit_spread,
-    calculate_payoff_at_price
+    calculate_payoff_at_price,
+    simulate_option_pnl_over_path
 )
 
 
@@ -55,6 +56,26 @@ def test_calculate_payoff():
     assert payoff_at_410 > payoff_at_400
 
 
+def test_simulate_exit_first_touch():
+    """Test the standard exit takes the first bar at the stop or target, per side."""
+    strikes = generate_strikes(400, num_strikes=10)
+    entry_time = pd.Timestamp('2024-01-03 10:00', tz='America/New_York')
+    path = pd.Series([400.0, 401.0, 402.5, 399.0, 404.0])
+    
+    long_pos = build_long_option('long', 400.0, strikes, entry_time)
+    short_pos = build_long_option('short', 400.0, strikes, entry_time)
+    
+    # Long: target 402 reached on bar 2 before the stop at 399
+    assert simulate_option_pnl_over_path(long_pos, path, target=402.0, stop=399.0) == \
+        calculate_payoff_at_price(long_pos, 402.5)
+    # Short: stop 402 hit on bar 2 (price at or above)
+    assert simulate_option_pnl_over_path(short_pos, path, target=398.0, stop=402.0) == \
+        calculate_payoff_at_price(short_pos, 402.5)
+    # Nothing touched: exit on the last bar
+    assert simulate_option_pnl_over_path(long_pos, path, target=410.0) == \
+        calculate_payoff_at_price(long_pos, 404.0)
+
+
 def test_60min_option_pricing_realistic():
     """
     Regression test for Trade #6 (67R bug).
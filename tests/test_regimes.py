@@ -3,7 +3,7 @@
 import pandas as pd
 import pytest
 import numpy as np
-from engine.regimes import detect_regime, get_regime_stats, filter_by_regime
+from engine.regimes import detect_regime, get_regime_stats, filter_by_regime, align_regime_to_bars
 
 
 def test_detect_regime_uptrend():
@@ -133,5 +133,25 @@ def test_filter_no_sideways():
     assert mask.iloc[1] == False
 
 
+def test_align_regime_to_bars():
+    """Test alignment of 30-min regimes onto 1-min bars."""
+    ts_1min = pd.date_range('2024-01-02 09:25', periods=70, freq='1min', tz='America/New_York')
+    ts_30min = pd.date_range('2024-01-02 09:30', periods=3, freq='30min', tz='America/New_York')
+    
+    df_1min = pd.DataFrame({'timestamp': ts_1min})
+    df_30min = pd.DataFrame({'timestamp': ts_30min})
+    regime_30min = pd.Series(['bull_trend', 'bear_trend', 'sideways'])
+    
+    regimes = align_regime_to_bars(df_1min, df_30min, regime_30min)
+    
+    assert len(regimes) == len(df_1min)
+    assert isinstance(regimes.dtype, pd.CategoricalDtype)
+    assert (regimes.iloc[:5] == 'sideways').all()  # before first 30-min bar
+    assert regimes.iloc[5] == 'bull_trend'  # 09:30
+    assert regimes.iloc[34] == 'bull_trend'  # 09:59
+    assert regimes.iloc[35] == 'bear_trend'  # 10:00
+    assert regimes.iloc[65] == 'sideways'  # 10:30
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
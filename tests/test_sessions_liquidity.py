@@ -57,5 +57,34 @@ def test_add_session_highs_lows():
     assert 'london_low' in df.columns
 
 
+def test_session_levels_per_trading_day():
+    """Test Asia/London extremes are broadcast across their trading day only."""
+    timestamps = pd.to_datetime([
+        '2024-01-02 19:00:00',  # Asia, trading day Jan 3
+        '2024-01-02 23:00:00',  # Asia, trading day Jan 3
+        '2024-01-03 04:00:00',  # London
+        '2024-01-03 10:00:00',  # NY
+        '2024-01-03 19:00:00',  # Asia, trading day Jan 4
+    ]).tz_localize('America/New_York')
+
+    df = pd.DataFrame({
+        'timestamp': timestamps,
+        'open': [100, 100, 100, 100, 100],
+        'high': [101, 104, 103, 110, 120],
+        'low': [99, 97, 98, 90, 95],
+        'close': [100, 100, 100, 100, 100],
+        'volume': [1000] * 5
+    })
+
+    df = add_session_highs_lows(label_sessions(df))
+
+    assert df['session'].tolist() == ['asia', 'asia', 'london', 'ny', 'asia']
+    assert df['asia_high'].tolist()[:4] == [104.0] * 4
+    assert df['asia_low'].tolist()[:4] == [97.0] * 4
+    assert df['london_high'].tolist()[:4] == [103.0] * 4
+    assert df.loc[4, 'asia_high'] == 120.0
+    assert pd.isna(df.loc[4, 'london_high'])
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
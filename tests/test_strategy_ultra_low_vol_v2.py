@@ -0,0 +1,49 @@
+"""
+Tests for Ultra-Low Vol v2 session VWAP bands.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from engine.strategy_shared import MarketContext
+from engine.strategy_ultra_low_vol_v2 import UltraLowVolStrategyV2
+
+
+def _make_bars(days: int = 2) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    timestamps = []
+    for day in range(days):
+        start = pd.Timestamp(f'2024-01-0{day + 2} 09:30', tz='America/New_York')
+        timestamps.extend(pd.date_range(start, periods=120, freq='1min'))
+
+    close = 400 + np.cumsum(rng.normal(0, 0.05, len(timestamps)))
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close,
+        'high': close + rng.uniform(0, 0.1, len(close)),
+        'low': close - rng.uniform(0, 0.1, len(close)),
+        'close': close,
+        'volume': rng.integers(100, 1000, len(close))
+    })
+
+
+def test_vectorized_bands_match_per_bar():
+    """Test vectorized session bands equal the per-bar calculation."""
+    df = _make_bars()
+    context = MarketContext(
+        df_1min=df, df_4h=None, df_daily=None, renko_df=None,
+        regime='sideways', vix=12.0, atr_pct=0.2
+    )
+    strategy = UltraLowVolStrategyV2()
+
+    bands = strategy._calculate_session_vwap_bands_all(df)
+
+    # Covers both session windows and the 50-bar fallback after the open
+    for idx in [10, 50, 60, 119, 120, 125, 129, 130, 200, 239]:
+        expected = strategy._calculate_session_vwap_bands(df, idx, context)
+        for key in ('vwap', 'threshold', 'upper_band', 'lower_band', 'std', 'atr'):
+            assert bands[key][idx] == pytest.approx(expected[key], abs=1e-9)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])